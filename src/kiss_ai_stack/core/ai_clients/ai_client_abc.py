@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 import numpy as np
 
@@ -58,6 +58,28 @@ class AIClientAbc(ABC):
         """
         pass
 
+    @abstractmethod
+    def generate_answer_stream(self, query: str, chunks: List[str] | List[List[str]] = None,
+                               temperature: Optional[float] = 0.7) -> AsyncIterator[str]:
+        """
+        Generate an answer for the given query, yielding it piece by piece as it is generated.
+
+        Takes the same inputs as `generate_answer`, implemented as an async generator.
+
+        :param query: The input query or prompt to process.
+        :type query: str
+        :param chunks: Contextual chunks to guide the response, if applicable (default is None).
+        :type chunks: List[str] | List[List[str]], optional
+        :param temperature: The randomness of the response, controlling creativity (default is 0.7).
+        :type temperature: float, optional
+
+        :return: An async iterator of generated text pieces.
+        :rtype: AsyncIterator[str]
+
+        :raises Exception: If there is an error generating the answer.
+        """
+        pass
+
     @abstractmethod
     async def embed_text(self, text: str) -> np.ndarray:
         """
@@ -67,6 +89,16 @@ class AIClientAbc(ABC):
         """
         pass
 
+    @abstractmethod
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Get the embeddings of multiple texts with as few calls to the AI model as possible.
+
+        :param texts: (List[str]) Queries/texts
+        :return: A 2-D float32 matrix, one row per text.
+        """
+        pass
+
     @abstractmethod
     async def destroy(self):
         """
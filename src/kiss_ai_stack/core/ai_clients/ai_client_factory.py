@@ -1,4 +1,7 @@
+from typing import Dict, Optional
+
 from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
+from kiss_ai_stack.core.ai_clients.shared_client_pool import SharedClientPool
 from kiss_ai_stack.core.ai_clients.vendors.openai_client import OpenAIClient
 from kiss_ai_stack.core.models.config.ai_client_props import AIClientProperties
 from kiss_ai_stack.core.models.enums.ai_client_vendor import AIClientVendor
@@ -12,10 +15,16 @@ class AIClientFactory:
     This class provides a static method to create instances of AI clients based on
     the provided configuration properties and tool kind. It simplifies the process
     of selecting the correct AI client implementation for the given provider.
+
+    Vendor clients, along with their connection pools, are shared process-wide by provider, API key and
+    connection settings, and reference counted so they are closed only when the last AI client is destroyed.
     """
 
+    __client_pool = SharedClientPool()
+
     @staticmethod
-    def get_ai_client(properties: AIClientProperties, tool_kind: ToolKind) -> AIClientAbc | None:
+    def get_ai_client(properties: AIClientProperties, tool_kind: ToolKind,
+                      embedding_model: Optional[str] = None) -> AIClientAbc | None:
         """
         Retrieve an AI client instance based on the provider specified in properties.
 
@@ -25,6 +34,7 @@ class AIClientFactory:
 
         :param properties: The configuration properties for the AI client, which include the provider type (e.g., OpenAI) and the API key.
         :param tool_kind: The type of tool to be used with the AI client, such as PROMPT (prompt-based generation) or RAG (retrieval-augmented generation).
+        :param embedding_model: The embedding model used to embed texts, the provider's default if None.
 
         :returns: An instance of the appropriate AI client implementation (e.g., OpenAIClient) if the provider is recognized, or None if the provider is not supported.
 
@@ -36,5 +46,19 @@ class AIClientFactory:
         """
         match properties.provider:
             case AIClientVendor.OPENAI:
-                return OpenAIClient(properties, tool_kind)
+                return OpenAIClient(
+                    properties,
+                    tool_kind,
+                    client_pool=AIClientFactory.__client_pool,
+                    embedding_model=embedding_model
+                )
         return None
+
+    @staticmethod
+    def client_pool_stats() -> Dict[str, int]:
+        """
+        Get the number of shared vendor clients and the references held on them.
+
+        :returns: Shared client pool stats.
+        """
+        return AIClientFactory.__client_pool.stats()
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from kiss_ai_stack.core.ai_clients.request_scheduler import RequestScheduler
+from kiss_ai_stack.core.models.enums.request_priority import RequestPriority
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class EmbeddingMicroBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into batched embedding calls.
+
+    Requests are collected for a short window, or until a batch is full, and embedded in one call, each caller
+    receiving its own row of the resulting matrix. A failed call fails every request of its batch.
+    The window only applies while a batch is being embedded: with no batch in flight, or a window of 0, the
+    requests made in the same event loop iteration are embedded right away. Each request keeps the scheduling
+    priority of its caller, and a batch is embedded with the highest priority among its requests, so an
+    interactive query does not wait behind bulk traffic because a bulk request opened the batch.
+    """
+
+    def __init__(self, embed_texts: Callable[[List[str]], Awaitable[np.ndarray]], max_batch_size: int = 64,
+                 window_ms: float = 5.0):
+        """
+        Initialize the micro-batcher.
+
+        :param embed_texts: Batched embedding function, returning one row per text.
+        :param max_batch_size: Maximum number of texts per embedding call. Defaults to 64.
+        :param window_ms: How long to collect requests before embedding them, in milliseconds. Defaults to 5.
+        """
+        self.__embed_texts = embed_texts
+        self.__max_batch_size = max_batch_size
+        self.__window_seconds = window_ms / 1000
+        self.__pending: List[Tuple[str, asyncio.Future, RequestPriority]] = []
+        self.__timer: Optional[asyncio.Handle] = None
+        self.__tasks: Set[asyncio.Task] = set()
+        self.__requests = 0
+        self.__batches = 0
+
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a text as part of the next batch.
+
+        :param text: The text to embed.
+        :returns: The embedding of the text.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__pending.append((text, future, RequestScheduler.current_priority()))
+        self.__requests += 1
+        if len(self.__pending) >= self.__max_batch_size:
+            self.__flush()
+        elif self.__timer is None:
+            if self.__tasks and self.__window_seconds > 0:
+                self.__timer = loop.call_later(self.__window_seconds, self.__flush)
+            else:
+                self.__timer = loop.call_soon(self.__flush)
+        return await future
+
+    def __flush(self):
+        if self.__timer:
+            self.__timer.cancel()
+            self.__timer = None
+        batch, self.__pending = self.__pending, []
+        if batch:
+            priority = RequestPriority.INTERACTIVE \
+                if any(priority == RequestPriority.INTERACTIVE for _, _, priority in batch) else RequestPriority.BULK
+            with RequestScheduler.priority(priority):
+                task = asyncio.ensure_future(self.__run(batch))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+    async def __run(self, batch: List[Tuple[str, asyncio.Future, RequestPriority]]):
+        texts = list(dict.fromkeys(text for text, _, _ in batch))
+        self.__batches += 1
+        LOG.debug(f'EmbeddingMicroBatcher :: Embedding {len(texts)} texts of {len(batch)} requests')
+        try:
+            embeddings = await self.__embed_texts(texts)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        rows: Dict[str, np.ndarray] = dict(zip(texts, embeddings))
+        for text, future, _ in batch:
+            if not future.done():
+                future.set_result(rows[text])
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of embedding requests received and the batched calls they were served with.
+        """
+        return {
+            'requests': self.__requests,
+            'batches': self.__batches
+        }
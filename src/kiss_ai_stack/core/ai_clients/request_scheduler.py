@@ -0,0 +1,217 @@
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, TypeVar
+
+from kiss_ai_stack.core.models.config.rate_limit_props import RateLimitProperties
+from kiss_ai_stack.core.models.enums.request_priority import RequestPriority
+from kiss_ai_stack.core.utilities.logger import LOG
+
+T = TypeVar('T')
+
+
+class RequestScheduler:
+    """
+    Process-wide scheduler of the API calls made with one API key and model.
+
+    Calls are admitted through token buckets refilled continuously up to the requests and tokens per minute
+    limits, and failed calls that can succeed later (rate limited, timed out, server errors) are retried with
+    jittered exponential backoff, or after the delay the API asks for with `Retry-After`. A rate limited call
+    pauses every call of the scheduler for that delay. Bulk calls are only admitted while no interactive call
+    is waiting, so ingestion traffic yields to live queries sharing the same key.
+
+    The priority of calls is taken from the context, see `priority`.
+    """
+
+    __current_priority: ContextVar[RequestPriority] = ContextVar('request_priority',
+                                                                 default=RequestPriority.INTERACTIVE)
+    __shared: Dict[Hashable, 'RequestScheduler'] = {}
+    __shared_lock = threading.Lock()
+    __BULK_POLL_SECONDS = 0.01
+    __RETRYABLE_STATUS_CODES = {408, 409, 429}
+    __RETRYABLE_ERRORS = {'APIConnectionError', 'APITimeoutError', 'TimeoutError'}
+
+    def __init__(self, properties: RateLimitProperties):
+        """
+        Initialize a scheduler with full buckets.
+
+        :param properties: Rate limit configurations object loaded from Yaml file.
+        """
+        self.__properties = properties
+        self.__requests = float(properties.requests_per_minute or 0)
+        self.__tokens = float(properties.tokens_per_minute or 0)
+        self.__refilled_at = time.monotonic()
+        self.__paused_until = 0.0
+        self.__waiting = {priority: 0 for priority in RequestPriority}
+        self.__stats = {'calls': 0, 'retries': 0, 'rate_limited': 0, 'throttled_seconds': 0.0}
+
+    @classmethod
+    def shared(cls, key: Hashable, properties: RateLimitProperties) -> 'RequestScheduler':
+        """
+        Get the scheduler shared by every client of the key, creating it on first use.
+
+        :param key: The sharing key, e.g. provider, API key and model.
+        :param properties: Rate limit configurations, used if the scheduler is created.
+        :returns: The shared scheduler.
+        """
+        with cls.__shared_lock:
+            if key not in cls.__shared:
+                cls.__shared[key] = cls(properties)
+            return cls.__shared[key]
+
+    @staticmethod
+    @contextlib.contextmanager
+    def priority(priority: RequestPriority) -> Iterator[None]:
+        """
+        Schedule the calls made within the context, and the tasks it creates, with the given priority.
+
+        :param priority: The priority of the calls.
+        """
+        token = RequestScheduler.__current_priority.set(priority)
+        try:
+            yield
+        finally:
+            RequestScheduler.__current_priority.reset(token)
+
+    @staticmethod
+    def current_priority() -> RequestPriority:
+        """
+        Get the priority calls made in the current context are scheduled with.
+        """
+        return RequestScheduler.__current_priority.get()
+
+    @staticmethod
+    def estimate_tokens(*texts: str, completion_tokens: int = 0) -> int:
+        """
+        Estimate the tokens of a call for rate limiting, at about four characters per prompt token.
+
+        :param texts: The prompt texts of the call.
+        :param completion_tokens: The tokens expected in the completion, which count towards the limit too.
+        """
+        return sum(len(text) for text in texts) // 4 + 1 + (completion_tokens or 0)
+
+    def __refill(self, now: float):
+        elapsed = now - self.__refilled_at
+        self.__refilled_at = now
+        if self.__properties.requests_per_minute:
+            self.__requests = min(float(self.__properties.requests_per_minute),
+                                  self.__requests + elapsed * self.__properties.requests_per_minute / 60)
+        if self.__properties.tokens_per_minute:
+            self.__tokens = min(float(self.__properties.tokens_per_minute),
+                                self.__tokens + elapsed * self.__properties.tokens_per_minute / 60)
+
+    def __admission_delay(self, tokens: int) -> float:
+        """
+        Seconds until the buckets hold a request and the tokens, 0 if they already do.
+        """
+        delay = 0.0
+        if self.__properties.requests_per_minute and self.__requests < 1:
+            delay = (1 - self.__requests) * 60 / self.__properties.requests_per_minute
+        if self.__properties.tokens_per_minute and self.__tokens < tokens:
+            delay = max(delay, (tokens - self.__tokens) * 60 / self.__properties.tokens_per_minute)
+        return delay
+
+    async def __acquire(self, tokens: int, priority: RequestPriority):
+        if self.__properties.tokens_per_minute:
+            tokens = min(tokens, self.__properties.tokens_per_minute)
+        self.__waiting[priority] += 1
+        started_at = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                self.__refill(now)
+                delay = self.__paused_until - now
+                if delay <= 0:
+                    if priority == RequestPriority.BULK and self.__waiting[RequestPriority.INTERACTIVE]:
+                        delay = RequestScheduler.__BULK_POLL_SECONDS
+                    else:
+                        delay = self.__admission_delay(tokens)
+                        if delay <= 0:
+                            if self.__properties.requests_per_minute:
+                                self.__requests -= 1
+                            if self.__properties.tokens_per_minute:
+                                self.__tokens -= tokens
+                            return
+                    if priority == RequestPriority.BULK:
+                        delay = max(delay, RequestScheduler.__BULK_POLL_SECONDS)
+                await asyncio.sleep(delay)
+        finally:
+            self.__waiting[priority] -= 1
+            self.__stats['throttled_seconds'] += time.monotonic() - started_at
+
+    @staticmethod
+    def __retry_after(error: Exception) -> Optional[float]:
+        """
+        The delay asked for by the API in the `Retry-After` headers of the error's response, if any.
+        """
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        if not headers:
+            return None
+        if retry_after_ms := headers.get('retry-after-ms'):
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+        if retry_after := headers.get('retry-after'):
+            try:
+                return float(retry_after)
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    return None
+        return None
+
+    @staticmethod
+    def __is_retryable(error: Exception) -> bool:
+        status_code = getattr(error, 'status_code', None)
+        if status_code is not None:
+            return status_code in RequestScheduler.__RETRYABLE_STATUS_CODES or status_code >= 500
+        return type(error).__name__ in RequestScheduler.__RETRYABLE_ERRORS
+
+    async def run(self, call: Callable[[], Awaitable[T]], tokens: int = 1) -> T:
+        """
+        Run an API call once admitted by the rate limits, retrying it while it fails with a retryable error.
+
+        :param call: Factory of the API call's awaitable, called once per attempt.
+        :param tokens: The estimated tokens of the call.
+        :returns: The result of the call.
+        :raises Exception: The call's error, if not retryable or still failing after `max_retries` retries.
+        """
+        priority = RequestScheduler.__current_priority.get()
+        attempt = 0
+        while True:
+            await self.__acquire(tokens, priority)
+            self.__stats['calls'] += 1
+            try:
+                return await call()
+            except Exception as e:
+                if attempt >= self.__properties.max_retries or not RequestScheduler.__is_retryable(e):
+                    raise
+                retry_after = RequestScheduler.__retry_after(e)
+                if getattr(e, 'status_code', None) == 429:
+                    self.__stats['rate_limited'] += 1
+                if retry_after is not None:
+                    delay = min(retry_after, self.__properties.max_delay)
+                    self.__paused_until = max(self.__paused_until, time.monotonic() + delay)
+                else:
+                    delay = random.uniform(0, min(self.__properties.max_delay,
+                                                  self.__properties.base_delay * 2 ** attempt))
+                attempt += 1
+                self.__stats['retries'] += 1
+                LOG.warning(f'RequestScheduler :: {type(e).__name__}, retry {attempt} of '
+                            f'{self.__properties.max_retries} in {delay:.2f}s')
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Calls made, retries, rate limited responses, seconds spent waiting for admission, and waiting calls.
+        """
+        return {
+            **self.__stats,
+            'waiting': {str(priority): count for priority, count in self.__waiting.items()}
+        }
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, List
+
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class SharedClientPool:
+    """
+    Process-wide pool of reference-counted vendor clients.
+
+    Clients are shared by a key built from the provider, API key and connection settings, so every AI client
+    with the same settings reuses one underlying client and its connection pool. A shared client is only
+    closed when its last user releases it. Async clients and their connection pools are bound to the event
+    loop they are used in, so clients are shared per event loop.
+    """
+
+    def __init__(self):
+        self.__loop_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.__unbound_pool: Dict[str, Dict] = {'clients': {}, 'references': {}}
+        self.__lock = threading.Lock()
+
+    def __pool(self) -> Dict[str, Dict]:
+        """
+        Get the clients and references of the running event loop, or of no loop when called outside of one.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self.__unbound_pool
+        pool = self.__loop_pools.get(loop)
+        if pool is None:
+            pool = {'clients': {}, 'references': {}}
+            self.__loop_pools[loop] = pool
+        return pool
+
+    def __pools(self) -> List[Dict[str, Dict]]:
+        return [self.__unbound_pool, *self.__loop_pools.values()]
+
+    def acquire(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """
+        Get the shared client for the key in the running event loop, creating it on first use.
+
+        :param key: The sharing key, e.g. provider, API key and connection settings.
+        :param create: Factory creating a new vendor client.
+        :returns: The shared vendor client.
+        """
+        with self.__lock:
+            pool = self.__pool()
+            clients, references = pool['clients'], pool['references']
+            if key not in clients:
+                clients[key] = create()
+                references[key] = 0
+                LOG.debug('SharedClientPool :: Created a new shared client')
+            references[key] += 1
+            return clients[key]
+
+    async def release(self, key: Hashable):
+        """
+        Release a reference to the shared client of the running event loop, closing it when the last user
+        releases it.
+
+        :param key: The sharing key the client was acquired with.
+        """
+        with self.__lock:
+            pool = self.__pool()
+            clients, references = pool['clients'], pool['references']
+            if key not in references:
+                return
+            references[key] -= 1
+            if references[key] > 0:
+                return
+            client = clients.pop(key)
+            del references[key]
+
+        if hasattr(client, 'close'):
+            await client.close()
+            LOG.debug('SharedClientPool :: Closed a shared client')
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of live shared clients and the total references held on them, across event loops.
+        """
+        with self.__lock:
+            pools = self.__pools()
+            return {
+                'clients': sum(len(pool['clients']) for pool in pools),
+                'references': sum(sum(pool['references'].values()) for pool in pools)
+            }
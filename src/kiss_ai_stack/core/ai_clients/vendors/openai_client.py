@@ -1,7 +1,11 @@
-from typing import List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
 import numpy as np
 from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
+from kiss_ai_stack.core.ai_clients.embedding_micro_batcher import EmbeddingMicroBatcher
+from kiss_ai_stack.core.ai_clients.request_scheduler import RequestScheduler
+from kiss_ai_stack.core.ai_clients.shared_client_pool import SharedClientPool
 from kiss_ai_stack.core.config import AI_CLIENT
 from kiss_ai_stack.core.models.config.ai_client_props import AIClientProperties
 from kiss_ai_stack.core.models.enums.ai_client_vendor import AIClientVendor
@@ -15,18 +19,44 @@ class OpenAIClient(AIClientAbc):
     Implementation of AIClientAbc for OpenAI.
 
     This class integrates with OpenAI to provide functionalities such as embeddings and
-    prompt-based responses asynchronously.
+    prompt-based responses asynchronously. With `rate_limit` configured, calls go through the `RequestScheduler`
+    shared by every client of the same API key and model, which replaces the OpenAI SDK's own retries.
     """
 
-    def __init__(self, properties: AIClientProperties, tool_kind: ToolKind = ToolKind.PROMPT):
+    __default_embedding_model = 'text-embedding-ada-002'
+    __max_embedding_inputs = 2048
+    __unknown_tool_kind = 'Unknown tool kind!'
+
+    def __init__(self, properties: AIClientProperties, tool_kind: ToolKind = ToolKind.PROMPT,
+                 client_pool: Optional[SharedClientPool] = None, embedding_model: Optional[str] = None):
         """
         Initialize the OpenAI client.
 
         :param properties: Configuration properties for OpenAI.
         :param tool_kind: The type of tool (e.g., PROMPT or RAG). Defaults to ToolKind.PROMPT.
+        :param client_pool: Optional pool to share the underlying AsyncOpenAI client from. Defaults to None.
+        :param embedding_model: The embedding model. Defaults to text-embedding-ada-002.
         """
         self.__tool_kind = tool_kind
         self.__properties = properties
+        self.__client_pool = client_pool
+        self.__pool_key = (
+            AIClientVendor.OPENAI,
+            properties.api_key,
+            properties.max_connections,
+            properties.max_keepalive_connections,
+            properties.keepalive_expiry,
+            bool(properties.rate_limit and properties.rate_limit.enabled)
+        )
+        self.__embedding_model = embedding_model or self.__default_embedding_model
+        self.__chat_scheduler: Optional[RequestScheduler] = None
+        self.__embedding_scheduler: Optional[RequestScheduler] = None
+        if properties.rate_limit and properties.rate_limit.enabled:
+            self.__chat_scheduler = RequestScheduler.shared(
+                (AIClientVendor.OPENAI, properties.api_key, properties.model), properties.rate_limit)
+            self.__embedding_scheduler = RequestScheduler.shared(
+                (AIClientVendor.OPENAI, properties.api_key, self.__embedding_model), properties.rate_limit)
+        self.__embedding_batcher: Optional[EmbeddingMicroBatcher] = None
         self.__client: Optional['AsyncOpenAI'] = None
         LOG.info(f'OpenAIClient :: initialized with tool kind: {tool_kind}')
 
@@ -40,19 +70,38 @@ class OpenAIClient(AIClientAbc):
 
     def initialize(self):
         """
-        Initialize the OpenAI client by setting up the API key.
+        Initialize the OpenAI client by setting up the API key and connection limits.
 
-        This method dynamically imports AsyncOpenAI if it is not already installed.
+        This method dynamically imports AsyncOpenAI if it is not already installed. When a client pool is given,
+        the underlying AsyncOpenAI client is shared with every other client of the same API key and settings.
         """
         try:
-            from openai import AsyncOpenAI
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
         except ImportError:
             package_name = AI_CLIENT[AIClientVendor.OPENAI]
             LOG.warning(f'OpenAI is not installed. Attempting to auto-install {package_name}.')
             install_package(package_name)
-            from openai import AsyncOpenAI
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        import httpx
+
+        def create_client():
+            retries = {'max_retries': 0} if self.__chat_scheduler else {}
+            return AsyncOpenAI(
+                api_key=self.__properties.api_key,
+                **retries,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.__properties.max_connections,
+                        max_keepalive_connections=self.__properties.max_keepalive_connections,
+                        keepalive_expiry=self.__properties.keepalive_expiry
+                    )
+                )
+            )
 
-        self.__client = AsyncOpenAI(api_key=self.__properties.api_key)
+        if self.__client_pool:
+            self.__client = self.__client_pool.acquire(self.__pool_key, create_client)
+        else:
+            self.__client = create_client()
         LOG.info('OpenAIClient :: client initialized successfully')
 
     async def generate_answer(self, query: str, chunks: List[str] | List[List[str]] = None, temperature: Optional[float] = 0.7) -> str:
@@ -66,15 +115,93 @@ class OpenAIClient(AIClientAbc):
         :return: The AI-generated answer as a string.
         """
         LOG.info('OpenAIClient :: generating answer for query: ****')
+        messages = self.__build_messages(query, chunks)
+        if messages is None:
+            return self.__unknown_tool_kind
+
+        response = await self.__schedule(
+            self.__chat_scheduler,
+            lambda: self.__client.chat.completions.create(
+                model=self.__properties.model,
+                messages=messages,
+                temperature=temperature
+            ),
+            self.__chat_tokens(messages)
+        )
+
+        answer = response.choices[0].message.content
+        LOG.info('OpenAIClient :: generated answer: ****')
+        return answer
+
+    async def generate_answer_stream(self, query: str, chunks: List[str] | List[List[str]] = None,
+                                     temperature: Optional[float] = 0.7) -> AsyncIterator[str]:
+        """
+        Generate an answer for the given query, streaming it as the completion is generated.
+
+        :param query: The input query to process.
+        :param chunks: Contextual chunks for RAG-style processing. Defaults to None.
+        :param temperature: Controls response randomness. Defaults to 0.7.
+
+        :return: An async iterator of the AI-generated answer's text pieces.
+        """
+        LOG.info('OpenAIClient :: streaming answer for query: ****')
+        messages = self.__build_messages(query, chunks)
+        if messages is None:
+            yield self.__unknown_tool_kind
+            return
+
+        stream = await self.__schedule(
+            self.__chat_scheduler,
+            lambda: self.__client.chat.completions.create(
+                model=self.__properties.model,
+                messages=messages,
+                temperature=temperature,
+                stream=True
+            ),
+            self.__chat_tokens(messages)
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+        LOG.info('OpenAIClient :: streamed answer: ****')
+
+    def __chat_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """
+        Estimate the tokens of a chat call, its prompt and the completion expected for it.
+        """
+        return RequestScheduler.estimate_tokens(
+            *(message['content'] for message in messages),
+            completion_tokens=self.__properties.rate_limit.completion_tokens if self.__properties.rate_limit else 0
+        )
+
+    @staticmethod
+    async def __schedule(scheduler: Optional[RequestScheduler], call: Callable[[], Awaitable[Any]],
+                         tokens: int) -> Any:
+        """
+        Run an API call through the scheduler if rate limiting is configured, directly otherwise.
+        """
+        if scheduler is None:
+            return await call()
+        return await scheduler.run(call, tokens)
+
+    def __build_messages(self, query: str, chunks: List[str] | List[List[str]] = None) -> Optional[List[Dict[str, str]]]:
+        """
+        Build the chat messages of a query, with the retrieved context for RAG tools.
+
+        :param query: The input query to process.
+        :param chunks: Contextual chunks for RAG-style processing. Defaults to None.
+        :return: The chat messages, or None if the tool kind is unknown.
+        """
         prompt = ''
         base_content = ''
 
         if self.__tool_kind == ToolKind.RAG:
             flattened_chunks = chunks or []
-            if isinstance(chunks[0], list):
-                flattened_chunks = [chunk for sublist in chunks for chunk in sublist]
-            else:
-                flattened_chunks = chunks
+            if flattened_chunks and isinstance(flattened_chunks[0], list):
+                flattened_chunks = [chunk for sublist in flattened_chunks for chunk in sublist]
             context = '\n\n'.join(flattened_chunks)
             base_content = 'You are a helpful assistant that answers questions based on the provided context.'
             prompt = f'''Given the following context, answer the question.
@@ -91,49 +218,92 @@ class OpenAIClient(AIClientAbc):
             base_content = 'You are a helpful assistant that responds to any given prompt.'
             prompt = query
         else:
-            error_message = 'Unknown tool kind!'
-            LOG.error(f'OpenAIClient :: {error_message}')
-            return error_message
+            LOG.error(f'OpenAIClient :: {self.__unknown_tool_kind}')
+            return None
 
         LOG.debug('OpenAIClient :: constructed prompt: ****')
-
-        response = await self.__client.chat.completions.create(
-            model=self.__properties.model,
-            messages=[
-                {'role': 'system', 'content': base_content},
-                {'role': 'user', 'content': prompt}
-            ],
-            temperature=temperature
-        )
-
-        answer = response.choices[0].message.content
-        LOG.info('OpenAIClient :: generated answer: ****')
-        return answer
+        return [
+            {'role': 'system', 'content': base_content},
+            {'role': 'user', 'content': prompt}
+        ]
 
     async def embed_text(self, text: str) -> np.ndarray:
         """
-        Embed a given text query using OpenAI's embedding model.
+        Embed a given text query using the configured OpenAI embedding model.
+
+        Concurrent calls are micro-batched into shared embedding requests.
 
         :param text: The text to embed.
         :return: A numpy array representing the embedding of the text.
         """
+        if self.__embedding_batcher is None:
+            self.__embedding_batcher = EmbeddingMicroBatcher(
+                embed_texts=self.embed_texts,
+                max_batch_size=self.__properties.embedding_batch_size,
+                window_ms=self.__properties.embedding_batch_window_ms
+            )
+        return await self.__embedding_batcher.embed(text)
+
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed multiple texts using the configured OpenAI embedding model, in as few requests as the API allows.
+
+        :param texts: The texts to embed.
+        :return: A 2-D float32 matrix, one row per text.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
         try:
-            LOG.info('OpenAIClient :: Embedding text')
-            response = await self.__client.embeddings.create(
-                model='text-embedding-ada-002',
-                input=text
+            LOG.info(f'OpenAIClient :: Embedding {len(texts)} texts')
+            batches = [
+                texts[start:start + self.__max_embedding_inputs]
+                for start in range(0, len(texts), self.__max_embedding_inputs)
+            ]
+            responses = await asyncio.gather(*(
+                self.__schedule(
+                    self.__embedding_scheduler,
+                    lambda batch=batch: self.__client.embeddings.create(model=self.__embedding_model, input=batch),
+                    RequestScheduler.estimate_tokens(*batch)
+                )
+                for batch in batches
+            ))
+            embeddings = np.array(
+                [item.embedding for response in responses for item in sorted(response.data, key=lambda d: d.index)],
+                dtype=np.float32
             )
-            embedding = np.array(response.data[0].embedding)
-            LOG.info('OpenAIClient :: Text embedded successfully.')
-            return embedding
+            LOG.info('OpenAIClient :: Texts embedded successfully.')
+            return embeddings
         except Exception as e:
-            LOG.error(f'OpenAIClient :: Failed to embed text: {str(e)}')
+            LOG.error(f'OpenAIClient :: Failed to embed texts: {str(e)}')
             raise e
 
+    def embedding_stats(self) -> Dict[str, int]:
+        """
+        Number of single-text embedding requests and the batched calls they were served with.
+        """
+        return self.__embedding_batcher.stats() if self.__embedding_batcher else {'requests': 0, 'batches': 0}
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Stats of the request schedulers of the chat and embedding models, empty if rate limiting is not configured.
+        """
+        if self.__chat_scheduler is None:
+            return {}
+        return {
+            'chat': self.__chat_scheduler.stats(),
+            'embeddings': self.__embedding_scheduler.stats()
+        }
+
     async def destroy(self):
         """
-        Close the OpenAI client if it has a close method.
+        Release the OpenAI client, closing it if this was its last user.
         """
-        if hasattr(self.__client, 'close'):
+        if self.__client is None:
+            return
+        if self.__client_pool:
+            await self.__client_pool.release(self.__pool_key)
+            LOG.info('OpenAIClient :: Released')
+        elif hasattr(self.__client, 'close'):
             await self.__client.close()
             LOG.info('OpenAIClient :: Closed')
+        self.__client = None
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
+from kiss_ai_stack.core.caches.embedding_cache import EmbeddingCache
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class CachedEmbeddingFunction:
+    """
+    Embeds texts with an AI client, serving embeddings from an `EmbeddingCache` when one is given.
+
+    Only the texts missing from the cache are embedded: a single text through the client's micro-batched
+    `embed_text`, several texts in one `embed_texts` call, so embeddings are rate limited and prioritized by the
+    client's request scheduler. Cache lookups are blocking, so they run in a worker thread.
+    """
+
+    def __init__(self, ai_client: AIClientAbc, cache: Optional[EmbeddingCache], model: str):
+        """
+        Wrap an AI client's embeddings with a cache.
+
+        :param ai_client: The initialized AI client embedding the texts.
+        :param cache: The embedding cache, None to always embed.
+        :param model: The embedding model, part of the cache key.
+        """
+        self.__ai_client = ai_client
+        self.__cache = cache
+        self.__model = model
+
+    async def __call__(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        :param texts: The texts to embed.
+        :returns: A 2-D float32 matrix, one row per text.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        vectors = await asyncio.to_thread(self.__cache.get_many, self.__model, texts) if self.__cache \
+            else [None] * len(texts)
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            LOG.debug(f'CachedEmbeddingFunction :: Embedding {len(missing)} of {len(texts)} texts')
+            missing_texts = list(dict.fromkeys(texts[index] for index in missing))
+            if len(missing_texts) == 1:
+                embeddings = np.asarray([await self.__ai_client.embed_text(missing_texts[0])], dtype=np.float32)
+            else:
+                embeddings = np.asarray(await self.__ai_client.embed_texts(missing_texts), dtype=np.float32)
+            if self.__cache:
+                await asyncio.to_thread(self.__cache.put_many, self.__model, missing_texts, embeddings)
+            embedded = dict(zip(missing_texts, embeddings))
+            for index in missing:
+                vectors[index] = embedded[texts[index]]
+        return np.vstack(vectors).astype(np.float32, copy=False)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the hit and miss counters of the underlying embedding cache, empty without a cache.
+        """
+        return self.__cache.stats() if self.__cache else {}
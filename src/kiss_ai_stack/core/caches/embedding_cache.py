@@ -0,0 +1,151 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kiss_ai_stack.core.models.config.embedding_cache_props import EmbeddingCacheProperties
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class EmbeddingCache:
+    """
+    Persistent cache of text embeddings, keyed by embedding model and text hash.
+
+    Vectors are stored as float32 blobs in SQLite, behind a size-bounded in-memory LRU, so the same text is
+    embedded once per model across collections, stacks and process restarts.
+    """
+
+    __shared: Dict[str, 'EmbeddingCache'] = {}
+    __shared_lock = threading.Lock()
+
+    def __init__(self, path: str, max_size: int = 10000):
+        """
+        Open or create the embedding cache.
+
+        :param path: The path of the SQLite database file.
+        :param max_size: Maximum number of vectors kept in the in-memory LRU.
+        """
+        self.__max_size = max_size
+        self.__entries: OrderedDict[Tuple[str, str], np.ndarray] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__memory_hits = 0
+        self.__disk_hits = 0
+        self.__misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS embeddings ('
+            'model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, PRIMARY KEY (model, text_hash))'
+        )
+        self.__connection.commit()
+        LOG.debug(f'EmbeddingCache :: initialized at {path}')
+
+    @classmethod
+    def from_properties(cls, properties: EmbeddingCacheProperties) -> 'EmbeddingCache':
+        """
+        Get the process-wide embedding cache of the configured location.
+
+        :param properties: Embedding cache configurations object loaded from Yaml file.
+        :returns: The shared embedding cache.
+        """
+        path = properties.path or os.path.join(os.getcwd(), '.kiss_ai_stack', 'embedding_cache.db')
+        with cls.__shared_lock:
+            if path not in cls.__shared:
+                cls.__shared[path] = cls(path=path, max_size=properties.max_size)
+            return cls.__shared[path]
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """
+        Hash a text to its cache key.
+
+        :param text: The embedded text.
+        :returns: The sha256 hex digest of the text.
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def __remember(self, key: Tuple[str, str], vector: np.ndarray):
+        self.__entries[key] = vector
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up the cached embeddings of texts.
+
+        :param model: The embedding model.
+        :param texts: The texts to look up.
+        :returns: The float32 vector of each text, None for texts not cached.
+        """
+        keys = [(model, self.hash_text(text)) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [None] * len(keys)
+        with self.__lock:
+            missing: Dict[str, List[int]] = {}
+            for index, key in enumerate(keys):
+                if key in self.__entries:
+                    self.__entries.move_to_end(key)
+                    vectors[index] = self.__entries[key]
+                    self.__memory_hits += 1
+                else:
+                    missing.setdefault(key[1], []).append(index)
+
+            hashes = list(missing.keys())
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = self.__connection.execute(
+                    f'SELECT text_hash, vector FROM embeddings WHERE model = ? '
+                    f'AND text_hash IN ({", ".join("?" * len(chunk))})', (model, *chunk)
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self.__remember((model, text_hash), vector)
+                    for index in missing.pop(text_hash):
+                        vectors[index] = vector
+                        self.__disk_hits += 1
+
+            self.__misses += sum(len(indexes) for indexes in missing.values())
+        return vectors
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """
+        Cache the embeddings of texts.
+
+        :param model: The embedding model.
+        :param texts: The embedded texts.
+        :param vectors: The embedding of each text.
+        """
+        rows = []
+        with self.__lock:
+            for text, vector in zip(texts, vectors):
+                vector = np.asarray(vector, dtype=np.float32)
+                text_hash = self.hash_text(text)
+                self.__remember((model, text_hash), vector)
+                rows.append((model, text_hash, vector.tobytes()))
+            self.__connection.executemany(
+                'INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)', rows
+            )
+            self.__connection.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the cache's hit and miss counters, its hit rate and sizes.
+        """
+        with self.__lock:
+            hits = self.__memory_hits + self.__disk_hits
+            lookups = hits + self.__misses
+            size = self.__connection.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+            return {
+                'memory_hits': self.__memory_hits,
+                'disk_hits': self.__disk_hits,
+                'misses': self.__misses,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'memory_size': len(self.__entries),
+                'size': size
+            }
@@ -0,0 +1,74 @@
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from kiss_ai_stack.core.models.core.rag_response import ToolResponse
+
+
+class ResponseCacheAbc(ABC):
+    """
+    Abstract base class for tool response cache implementations.
+
+    Responses are stored under a key derived from the normalized query, the tool, the model, the temperature
+    and the collection version, and grouped by a namespace so stale entries of a tool/collection can be evicted together.
+    """
+
+    @staticmethod
+    def build_key(query: str, tool_name: str, model: str, temperature: Optional[float], version: int = 0,
+                  namespace: Optional[str] = None) -> str:
+        """
+        Build a cache key for a tool response.
+
+        :param query: The query string, normalized for case and whitespace differences.
+        :param tool_name: The name of the tool answering the query.
+        :param model: The AI model generating the answer.
+        :param temperature: The temperature used to generate the answer.
+        :param version: The version of the tool's vector DB collection, 0 for prompt tools.
+        :param namespace: The tool/collection namespace, telling apart same named tools of different stacks.
+
+        :return: A hex digest to be used as the cache key.
+        """
+        if not isinstance(query, str):
+            query = json.dumps(query, sort_keys=True, default=str)
+        normalized_query = ' '.join(query.lower().split())
+        return hashlib.sha256(
+            json.dumps([normalized_query, tool_name, model, temperature, version, namespace]).encode('utf-8')
+        ).hexdigest()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[ToolResponse]:
+        """
+        Get a cached tool response.
+
+        :param key: The cache key.
+        :return: The cached response flagged as served from cache, or None on a miss.
+        """
+        pass
+
+    @abstractmethod
+    async def put(self, key: str, namespace: str, response: ToolResponse):
+        """
+        Cache a tool response.
+
+        :param key: The cache key.
+        :param namespace: The tool/collection namespace the response belongs to.
+        :param response: The response to cache.
+        """
+        pass
+
+    @abstractmethod
+    async def evict(self, namespace: str):
+        """
+        Evict every cached response of a namespace, e.g. when documents are added to its collection.
+
+        :param namespace: The tool/collection namespace to evict.
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """
+        Get the cache's hit and miss counters.
+        """
+        pass
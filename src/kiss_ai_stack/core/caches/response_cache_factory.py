@@ -0,0 +1,50 @@
+import os
+import threading
+from typing import Dict, Tuple
+
+from kiss_ai_stack.core.caches.response_cache_abc import ResponseCacheAbc
+from kiss_ai_stack.core.caches.vendors.memory_response_cache import MemoryResponseCache
+from kiss_ai_stack.core.caches.vendors.sqlite_response_cache import SQLiteResponseCache
+from kiss_ai_stack.core.models.config.response_cache_props import ResponseCacheProperties
+from kiss_ai_stack.core.models.enums.cache_backend import ResponseCacheBackend
+
+
+class ResponseCacheFactory:
+    """
+    Factory class to get response cache instances.
+
+    Caches are shared process-wide per backend and location, so tools of different stack sessions
+    answering identical questions benefit from each other's responses.
+    """
+
+    __caches: Dict[Tuple[ResponseCacheBackend, str], ResponseCacheAbc] = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def get_response_cache(cls, properties: ResponseCacheProperties) -> ResponseCacheAbc | None:
+        """
+        Retrieve the shared response cache for the configured backend.
+
+        :param properties: Response cache configurations object loaded from Yaml file.
+        :returns: The response cache implementation, or None if the backend is not supported.
+        """
+        path = properties.path or os.path.join(os.getcwd(), '.kiss_ai_stack', 'response_cache.db')
+        cache_key = (properties.backend, path if properties.backend == ResponseCacheBackend.SQLITE else '')
+
+        with cls.__lock:
+            if cache_key not in cls.__caches:
+                match properties.backend:
+                    case ResponseCacheBackend.MEMORY:
+                        cls.__caches[cache_key] = MemoryResponseCache(
+                            max_size=properties.max_size,
+                            ttl_seconds=properties.ttl_seconds
+                        )
+                    case ResponseCacheBackend.SQLITE:
+                        cls.__caches[cache_key] = SQLiteResponseCache(
+                            path=path,
+                            max_size=properties.max_size,
+                            ttl_seconds=properties.ttl_seconds
+                        )
+                    case _:
+                        return None
+            return cls.__caches[cache_key]
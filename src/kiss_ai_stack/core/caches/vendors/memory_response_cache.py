@@ -0,0 +1,60 @@
+import copy
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from kiss_ai_stack.core.caches.response_cache_abc import ResponseCacheAbc
+from kiss_ai_stack.core.models.core.rag_response import ToolResponse
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class MemoryResponseCache(ResponseCacheAbc):
+    """
+    In-memory LRU implementation of the ResponseCacheAbc interface.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = None):
+        """
+        Initialize an empty in-memory response cache.
+
+        :param max_size: Maximum number of cached responses.
+        :param ttl_seconds: Optional time to live of each response in seconds.
+        """
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__entries: OrderedDict[str, Tuple[str, float, ToolResponse]] = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        LOG.debug(f'MemoryResponseCache :: initialized with max size: {max_size}')
+
+    async def get(self, key: str) -> Optional[ToolResponse]:
+        entry = self.__entries.get(key)
+        if entry and (self.__ttl_seconds is None or time.monotonic() - entry[1] < self.__ttl_seconds):
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            response = copy.deepcopy(entry[2])
+            response.cached = True
+            return response
+        if entry:
+            del self.__entries[key]
+        self.__misses += 1
+        return None
+
+    async def put(self, key: str, namespace: str, response: ToolResponse):
+        self.__entries[key] = (namespace, time.monotonic(), copy.deepcopy(response))
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    async def evict(self, namespace: str):
+        stale_keys = [key for key, (entry_namespace, _, _) in self.__entries.items() if entry_namespace == namespace]
+        for key in stale_keys:
+            del self.__entries[key]
+        LOG.debug(f'MemoryResponseCache :: Evicted {len(stale_keys)} responses of \'{namespace}\'')
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.__hits,
+            'misses': self.__misses,
+            'size': len(self.__entries)
+        }
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from kiss_ai_stack.core.caches.response_cache_abc import ResponseCacheAbc
+from kiss_ai_stack.core.models.core.rag_response import ToolResponse
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class SQLiteResponseCache(ResponseCacheAbc):
+    """
+    On-disk SQLite implementation of the ResponseCacheAbc interface, with LRU eviction by last access time.
+    """
+
+    def __init__(self, path: str, max_size: int = 1024, ttl_seconds: Optional[float] = None):
+        """
+        Open or create the SQLite response cache.
+
+        :param path: The path of the SQLite database file.
+        :param max_size: Maximum number of cached responses.
+        :param ttl_seconds: Optional time to live of each response in seconds.
+        """
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, namespace TEXT NOT NULL, payload TEXT NOT NULL, '
+            'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self.__connection.execute('CREATE INDEX IF NOT EXISTS responses_namespace ON responses (namespace)')
+        self.__connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        self.__connection.commit()
+        LOG.debug(f'SQLiteResponseCache :: initialized at {path}')
+
+    def __get(self, key: str) -> Optional[ToolResponse]:
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT payload, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row and self.__ttl_seconds is not None and time.time() - row[1] >= self.__ttl_seconds:
+                self.__connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.__connection.commit()
+                row = None
+            if not row:
+                self.__misses += 1
+                return None
+
+            self.__connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self.__connection.commit()
+            self.__hits += 1
+
+        payload = json.loads(row[0])
+        return ToolResponse(
+            answer=payload['answer'],
+            docs=payload['docs'],
+            metadata=payload['metadata'],
+            distances=payload['distances'],
+            cached=True
+        )
+
+    def __put(self, key: str, namespace: str, response: ToolResponse):
+        payload = json.dumps({
+            'answer': response.answer,
+            'docs': response.supporting_documents,
+            'metadata': response.metadata,
+            'distances': response.distances
+        }, default=str)
+        now = time.time()
+        with self.__lock:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO responses (key, namespace, payload, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)', (key, namespace, payload, now, now)
+            )
+            self.__connection.execute(
+                'DELETE FROM responses WHERE key IN ('
+                'SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)', (self.__max_size,)
+            )
+            self.__connection.commit()
+
+    def __evict(self, namespace: str):
+        with self.__lock:
+            cursor = self.__connection.execute('DELETE FROM responses WHERE namespace = ?', (namespace,))
+            self.__connection.commit()
+        LOG.debug(f'SQLiteResponseCache :: Evicted {cursor.rowcount} responses of \'{namespace}\'')
+
+    async def get(self, key: str) -> Optional[ToolResponse]:
+        return await asyncio.to_thread(self.__get, key)
+
+    async def put(self, key: str, namespace: str, response: ToolResponse):
+        await asyncio.to_thread(self.__put, key, namespace, response)
+
+    async def evict(self, namespace: str):
+        await asyncio.to_thread(self.__evict, namespace)
+
+    def stats(self) -> dict:
+        with self.__lock:
+            size = self.__connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        return {
+            'hits': self.__hits,
+            'misses': self.__misses,
+            'size': size
+        }
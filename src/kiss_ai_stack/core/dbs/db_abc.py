@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from kiss_ai_stack.core.models.config.ai_client_props import AIClientProperties
 from kiss_ai_stack.core.models.enums.ai_client_vendor import AIClientVendor
 
 
@@ -14,7 +15,7 @@ class VectorDBAbc(ABC):
 
     @abstractmethod
     async def initialize(self, embedding_api_key: str, embedding_model: str, ai_vendor: AIClientVendor,
-                         tenant: Optional[str] = None):
+                         tenant: Optional[str] = None, ai_client_properties: Optional[AIClientProperties] = None):
         """
         Initializes the vector database.
 
@@ -26,6 +27,7 @@ class VectorDBAbc(ABC):
         :param embedding_model: The embedding model to be used for generating embeddings.
         :param ai_vendor: The AI vendor for the embedding service (e.g., OpenAI).
         :param tenant: Preferably user's unique Id
+        :param ai_client_properties: The AI client configuration of the tool, so embeddings share its rate limits.
 
         :return: None
         :raises Exception: If any error occurs during the initialization of the database.
@@ -50,17 +52,49 @@ class VectorDBAbc(ABC):
         pass
 
     @abstractmethod
-    async def retrieve(self, query: str, k: int = 4):
+    async def delete(self, ids: List[str]):
+        """
+        Removes documents from the vector database by their identifiers.
+
+        Identifiers that do not exist in the database are ignored.
+
+        :param ids: The identifiers of the documents to remove.
+
+        :return: None
+        :raises Exception: If any error occurs while removing the documents.
+        """
+        pass
+
+    @abstractmethod
+    def version(self) -> int:
+        """
+        Returns the version of the collection, bumped every time documents are pushed or deleted.
+
+        The version is used to tell apart cached answers generated against older collection contents. It is stored
+        along with the collection, so answers cached by an earlier instance of the same collection, e.g. in an
+        on-disk response cache, are served as long as the collection is unchanged.
+
+        :return: The current collection version.
+        """
+        pass
+
+    @abstractmethod
+    async def retrieve(self, query: str, k: int = 4, where: Optional[Dict[str, Any]] = None,
+                       include: Optional[List[str]] = None):
         """
         Retrieves the top-k documents relevant to the query.
 
         Searches the database for documents most relevant to the provided query and
-        returns the top-k results.
+        returns the top-k results. The metadata filter and the projection are applied by the
+        database itself, so only the requested results are transferred.
 
         :param query: The query text to search for in the vector database.
         :param k: The number of top results to retrieve. Defaults to 4.
+        :param where: Optional ChromaDB style metadata filter, e.g. `{'file_name': 'report.pdf'}`.
+        :param include: The fields to return among 'documents', 'metadatas' and 'distances', all if None.
 
-        :return: A dictionary containing the retrieved documents and their associated metadata.
+        :return: A dictionary containing the retrieved Ids, and the included documents, metadata and distances,
+                 nested per query. Fields that are not included are None.
         :raises Exception: If any error occurs during the retrieval of documents.
         """
         pass
@@ -76,3 +110,19 @@ class VectorDBAbc(ABC):
         :raises Exception: If any error occurs during the removal of the collection.
         """
         pass
+
+    async def close(self):
+        """
+        Releases the connections and clients held by the vector database, keeping the collection and its documents.
+
+        :return: None
+        """
+        pass
+
+    def embedding_cache_stats(self) -> Dict[str, float]:
+        """
+        Returns the hit and miss counters of the cache of the collection's embeddings.
+
+        :return: Cache stats, or an empty dictionary if the cache is not enabled.
+        """
+        return {}
@@ -1,6 +1,9 @@
 from kiss_ai_stack.core.dbs.db_abc import VectorDBAbc
 from kiss_ai_stack.core.dbs.vendors.chroma_db import ChromaVectorDB
+from kiss_ai_stack.core.dbs.vendors.in_memory_vector_db import InMemoryVectorDB
+from kiss_ai_stack.core.dbs.vendors.storage_vector_db import StorageVectorDB
 from kiss_ai_stack.core.models.config.vdb_props import VectorDBProperties
+from kiss_ai_stack.core.models.enums.db_kind import VectorDBKind
 from kiss_ai_stack.core.models.enums.db_vendor import VectorDBVendor
 
 
@@ -13,6 +16,7 @@ class VectorDBFactory:
 
     Supported Vendors:
     - ChromaDB
+    - Native, in-process (in_memory and storage kinds)
     """
 
     @staticmethod
@@ -52,4 +56,16 @@ class VectorDBFactory:
                     collection_name=collection_name,
                     properties=properties
                 )
+            case VectorDBVendor.NATIVE:
+                match properties.kind:
+                    case VectorDBKind.IN_MEMORY:
+                        return InMemoryVectorDB(
+                            collection_name=collection_name,
+                            properties=properties
+                        )
+                    case VectorDBKind.STORAGE:
+                        return StorageVectorDB(
+                            collection_name=collection_name,
+                            properties=properties
+                        )
         return None
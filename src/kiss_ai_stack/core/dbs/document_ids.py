@@ -0,0 +1,31 @@
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+def document_id(document: str, metadata: Optional[Dict] = None) -> str:
+    """
+    Derive a deterministic document Id from its content and metadata.
+
+    The same chunk of the same source file with the same metadata always gets the same Id, so pushing it again
+    overwrites instead of duplicating it, and concurrent pushes never collide on Ids. A chunk whose metadata
+    changed gets a new Id, so it is stored again instead of being skipped as already stored.
+
+    :param document: The document text.
+    :param metadata: The document's metadata, such as its source file path and token span, part of the Id.
+    :returns: A hex digest to be used as the document Id.
+    """
+    return hashlib.sha256(
+        json.dumps([metadata or {}, document], sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+
+
+def document_ids(documents: List[str], metadata_list: Optional[List[Dict]] = None) -> List[str]:
+    """
+    Derive deterministic Ids for a list of documents.
+
+    :param documents: The document texts.
+    :param metadata_list: Optional metadata dictionaries corresponding to each document.
+    :returns: The document Ids, in the order of the documents.
+    """
+    metadata_list = metadata_list or [{}] * len(documents)
+    return [document_id(document, metadata) for document, metadata in zip(documents, metadata_list)]
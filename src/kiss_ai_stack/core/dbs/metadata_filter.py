@@ -0,0 +1,120 @@
+from typing import Any, Dict, Optional, Set, Tuple
+
+WHERE_OPERATORS = {
+    '$eq': lambda value, operand: value == operand,
+    '$ne': lambda value, operand: value != operand,
+    '$gt': lambda value, operand: value is not None and value > operand,
+    '$gte': lambda value, operand: value is not None and value >= operand,
+    '$lt': lambda value, operand: value is not None and value < operand,
+    '$lte': lambda value, operand: value is not None and value <= operand,
+    '$in': lambda value, operand: value in operand,
+    '$nin': lambda value, operand: value not in operand,
+}
+
+
+def matches_where(metadata: Optional[Dict[str, Any]], where: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check whether a document's metadata matches a ChromaDB style `where` filter.
+
+    Fields are compared for equality, e.g. `{'file_name': 'report.pdf'}`, or with the `$eq`, `$ne`, `$gt`, `$gte`,
+    `$lt`, `$lte`, `$in` and `$nin` operators, e.g. `{'start_token': {'$lt': 500}}`, and conditions are combined
+    with `$and` and `$or`. Several fields in one filter must all match.
+
+    :param metadata: The metadata of a document.
+    :param where: The filter, every document matches if None or empty.
+    :returns: True if the metadata matches the filter.
+    :raises ValueError: If the filter uses an unsupported operator.
+    """
+    if not where:
+        return True
+    metadata = metadata or {}
+    for key, condition in where.items():
+        if key == '$and':
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == '$or':
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for operator, operand in condition.items():
+                if operator not in WHERE_OPERATORS:
+                    raise ValueError(f'Unsupported metadata filter operator: {operator}')
+                try:
+                    if not WHERE_OPERATORS[operator](value, operand):
+                        return False
+                except TypeError:
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+def equality_conditions(where: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Extract the conditions of a `where` filter requiring a field to equal a scalar value, e.g. `{'file_name':
+    'report.pdf'}` or `{'file_name': {'$eq': 'report.pdf'}}`, whether at the top level or in an `$and`.
+
+    Every document matching the filter matches these conditions, so they can narrow the documents down before
+    the whole filter is checked.
+
+    :param where: The filter.
+    :returns: The fields mapped to the values they must equal.
+    """
+    conditions: Dict[str, Any] = {}
+    for key, condition in (where or {}).items():
+        if key == '$and':
+            for clause in condition:
+                conditions.update(equality_conditions(clause))
+        elif key == '$or':
+            continue
+        elif isinstance(condition, dict):
+            if '$eq' in condition and _is_scalar(condition['$eq']):
+                conditions[key] = condition['$eq']
+        elif _is_scalar(condition):
+            conditions[key] = condition
+    return conditions
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+class MetadataIndex:
+    """
+    Inverted index of the documents' scalar metadata values, narrowing `where` filters down to the documents
+    matching their equality conditions.
+    """
+
+    def __init__(self):
+        self.__postings: Dict[Tuple[str, Any], Set[str]] = {}
+
+    def add(self, doc_id: str, metadata: Optional[Dict[str, Any]]):
+        for key, value in (metadata or {}).items():
+            if _is_scalar(value):
+                self.__postings.setdefault((key, value), set()).add(doc_id)
+
+    def remove(self, doc_id: str, metadata: Optional[Dict[str, Any]]):
+        for key, value in (metadata or {}).items():
+            if _is_scalar(value):
+                postings = self.__postings.get((key, value))
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self.__postings[(key, value)]
+
+    def candidates(self, where: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """
+        Find the documents matching the equality conditions of a filter.
+
+        :param where: The filter.
+        :returns: The Ids of the candidate documents, still to be checked with `matches_where`, or None if the
+                  filter has no equality condition.
+        """
+        conditions = equality_conditions(where)
+        if not conditions:
+            return None
+        postings = sorted(
+            (self.__postings.get((key, value), set()) for key, value in conditions.items()), key=len
+        )
+        return postings[0].intersection(*postings[1:])
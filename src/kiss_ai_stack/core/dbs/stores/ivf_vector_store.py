@@ -0,0 +1,377 @@
+import functools
+import math
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from kiss_ai_stack.core.dbs.metadata_filter import MetadataIndex, matches_where
+from kiss_ai_stack.core.dbs.stores.vector_matrix_store import VectorMatrixStore
+from kiss_ai_stack.core.dbs.vector_store_abc import VectorStoreAbc
+from kiss_ai_stack.core.models.enums.vector_quantization import VectorQuantization
+from kiss_ai_stack.core.utilities.logger import LOG
+
+_ASSIGN_BATCH = 8192
+_SCORE_BLOCK = 1024
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    Find the nearest centroid of each vector, in batches.
+    """
+    return np.concatenate([
+        np.argmax(vectors[i:i + _ASSIGN_BATCH] @ centroids.T, axis=1)
+        for i in range(0, len(vectors), _ASSIGN_BATCH)
+    ]) if len(vectors) else np.empty(0, dtype=np.int64)
+
+
+def _score(codes: np.ndarray, scaled_query: np.ndarray) -> np.ndarray:
+    """
+    Score codes against a query scaled by the quantization factors.
+
+    int8 codes are converted block by block into a small float32 buffer, so scoring a list never copies it whole.
+    """
+    if codes.dtype == np.float32:
+        return codes @ scaled_query
+    scores = np.empty(len(codes), dtype=np.float32)
+    block = np.empty((min(len(codes), _SCORE_BLOCK), codes.shape[1]), dtype=np.float32)
+    for start in range(0, len(codes), _SCORE_BLOCK):
+        rows = codes[start:start + _SCORE_BLOCK]
+        np.copyto(block[:len(rows)], rows)
+        np.matmul(block[:len(rows)], scaled_query, out=scores[start:start + len(rows)])
+    return scores
+
+
+class IvfVectorStore(VectorStoreAbc):
+    """
+    In-memory vector store with an inverted file (IVF) index and optional int8 scalar quantization.
+
+    Vectors are kept in a flat matrix and searched exhaustively until `train_size` vectors are stored. The store
+    then clusters them into `nlist` centroids with spherical k-means and moves every vector to the inverted list
+    of its nearest centroid, after which new vectors are assigned as they are added. Without a fixed `nlist`, the
+    number of lists is the square root of the collection size, and the lists are retrained as the collection
+    grows 4-fold. Training runs in a worker thread through `prepare_index` and `install_index`, the store
+    serving reads and writes meanwhile. Queries only score the lists of the `nprobe` centroids closest to them,
+    trading recall for latency, while filtered queries score every vector matching the filter, found through an
+    inverted index of the metadata when the filter has equality conditions. With int8
+    quantization each dimension is stored as one byte scaled by a per-dimension factor, a 4x memory reduction
+    over float32, and queries are scored against the codes block by block.
+    """
+
+    __KMEANS_ITERATIONS = 10
+    __MIN_POINTS_PER_LIST = 39
+    __MAX_POINTS_PER_LIST = 64
+    __AUTO_TRAIN_SIZE = 10000
+    __RETRAIN_GROWTH = 4
+
+    class __Lists:
+        """
+        Trained inverted lists: the centroids, the quantization scales, and the codes and Ids of each list.
+        """
+
+        def __init__(self, centroids: np.ndarray, scale: np.ndarray, dtype: type, trained_count: int):
+            self.centroids = centroids
+            self.scale = scale
+            self.codes: List[np.ndarray] = [np.empty((0, centroids.shape[1]), dtype=dtype) for _ in centroids]
+            self.ids: List[List[Optional[str]]] = [[] for _ in centroids]
+            self.locations: Dict[str, Tuple[int, int]] = {}
+            self.trained_count = trained_count
+
+        def encode(self, vectors: np.ndarray) -> np.ndarray:
+            if self.codes[0].dtype == np.int8:
+                return np.clip(np.rint(vectors / self.scale), -127, 127).astype(np.int8)
+            return vectors.astype(np.float32)
+
+        def decode(self, codes: np.ndarray) -> np.ndarray:
+            return codes.astype(np.float32) * self.scale
+
+        def append(self, ids: List[str], vectors: np.ndarray, codes: np.ndarray):
+            """
+            Append codes to the lists of the centroids nearest to their vectors.
+            """
+            assignments = _assign(vectors, self.centroids)
+            for list_no in np.unique(assignments):
+                rows = np.flatnonzero(assignments == list_no)
+                list_ids = self.ids[list_no]
+                list_codes = self.codes[list_no]
+                size = len(list_ids)
+                if size + len(rows) > len(list_codes):
+                    capacity = max(size + len(rows), len(list_codes) + len(list_codes) // 4)
+                    grown = np.empty((capacity, list_codes.shape[1]), dtype=list_codes.dtype)
+                    grown[:size] = list_codes[:size]
+                    self.codes[list_no] = list_codes = grown
+                list_codes[size:size + len(rows)] = codes[rows]
+                for offset, row in enumerate(rows):
+                    list_ids.append(ids[row])
+                    self.locations[ids[row]] = (int(list_no), size + offset)
+
+        def remove(self, doc_id: str):
+            location = self.locations.pop(doc_id, None)
+            if location is not None:
+                self.__remove_at(*location)
+
+        def detach(self, doc_id: str):
+            """
+            Hide a vector from searches, leaving its code in place until `remove_detached`.
+            """
+            location = self.locations.pop(doc_id, None)
+            if location is not None:
+                list_no, position = location
+                self.ids[list_no][position] = None
+
+        def remove_detached(self):
+            for list_no, list_ids in enumerate(self.ids):
+                for position in reversed([position for position, doc_id in enumerate(list_ids) if doc_id is None]):
+                    self.__remove_at(list_no, position)
+
+        def __remove_at(self, list_no: int, position: int):
+            list_ids = self.ids[list_no]
+            last = len(list_ids) - 1
+            if position != last:
+                codes = self.codes[list_no]
+                codes[position] = codes[last]
+                list_ids[position] = list_ids[last]
+                if list_ids[position] is not None:
+                    self.locations[list_ids[position]] = (list_no, position)
+            list_ids.pop()
+
+    def __init__(self, nlist: Optional[int] = None, nprobe: int = 8,
+                 quantization: VectorQuantization = VectorQuantization.INT8, train_size: Optional[int] = None):
+        """
+        Initialize an empty store.
+
+        :param nlist: The number of inverted lists, the square root of the collection size if None.
+        :param nprobe: The number of lists scored per query. Defaults to 8.
+        :param quantization: How vectors are stored in the lists. Defaults to int8.
+        :param train_size: Vectors stored before the index is trained, 39 per list, or 10000 without a fixed
+                           `nlist`, if None.
+        """
+        self.__nlist = nlist
+        self.__nprobe = nprobe
+        self.__quantization = quantization
+        if nlist:
+            self.__train_size = max(train_size or IvfVectorStore.__MIN_POINTS_PER_LIST * nlist, nlist)
+        else:
+            self.__train_size = max(train_size or IvfVectorStore.__AUTO_TRAIN_SIZE, 1)
+        self.__flat: Optional[VectorMatrixStore] = VectorMatrixStore()
+        self.__lists: Optional[IvfVectorStore.__Lists] = None
+        self.__documents: Dict[str, Tuple[str, Dict]] = {}
+        self.__metadata_index = MetadataIndex()
+        self.__building = False
+        self.__added_while_building: Dict[str, np.ndarray] = {}
+        self.__removed_while_building: Set[str] = set()
+        self.__version = 0
+
+    def is_trained(self) -> bool:
+        """
+        Whether the inverted lists are built, the store is searched exhaustively until then.
+        """
+        return self.__lists is not None
+
+    def count(self) -> int:
+        return len(self.__documents)
+
+    def existing(self, ids: List[str]) -> Set[str]:
+        return {doc_id for doc_id in ids if doc_id in self.__documents}
+
+    def __list_count(self, size: int) -> int:
+        if self.__nlist:
+            return min(self.__nlist, size)
+        return max(1, min(int(math.sqrt(size)), size // IvfVectorStore.__MIN_POINTS_PER_LIST))
+
+    def __train(self, sample: np.ndarray, scale: np.ndarray, size: int) -> 'IvfVectorStore.__Lists':
+        """
+        Cluster a sample of the vectors into the centroids of new, empty inverted lists.
+        """
+        nlist = self.__list_count(size)
+        LOG.info(f'IvfVectorStore :: Training {nlist} lists on {len(sample)} of {size} vectors')
+        rng = np.random.default_rng(0)
+        max_points = IvfVectorStore.__MAX_POINTS_PER_LIST * nlist
+        if len(sample) > max_points:
+            sample = sample[rng.choice(len(sample), max_points, replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(IvfVectorStore.__KMEANS_ITERATIONS):
+            assignments = _assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            filled = norms[:, 0] > 0
+            centroids[filled] = sums[filled] / norms[filled]
+        dtype = np.int8 if self.__quantization == VectorQuantization.INT8 else np.float32
+        return IvfVectorStore.__Lists(centroids, scale, dtype, size)
+
+    def __build_from_vectors(self, ids: List[str], vectors: np.ndarray) -> 'IvfVectorStore.__Lists':
+        if self.__quantization == VectorQuantization.INT8:
+            scale = np.maximum(np.abs(vectors).max(axis=0), 1e-6).astype(np.float32) / 127
+        else:
+            scale = np.ones(vectors.shape[1], dtype=np.float32)
+        lists = self.__train(vectors, scale, len(ids))
+        lists.append(ids, vectors, lists.encode(vectors))
+        return lists
+
+    def __build_from_lists(self, snapshot: List[Tuple[List[str], np.ndarray]],
+                           previous: 'IvfVectorStore.__Lists') -> 'IvfVectorStore.__Lists':
+        size = sum(len(ids) for ids, _ in snapshot)
+        rng = np.random.default_rng(0)
+        sample_rate = min(1.0, IvfVectorStore.__MAX_POINTS_PER_LIST * self.__list_count(size) / size)
+        sample = np.vstack([
+            previous.decode(codes[rng.random(len(codes)) < sample_rate]) for _, codes in snapshot
+        ])
+        lists = self.__train(sample, previous.scale, size)
+        for ids, codes in snapshot:
+            for start in range(0, len(ids), _ASSIGN_BATCH):
+                block = codes[start:start + _ASSIGN_BATCH]
+                lists.append(ids[start:start + _ASSIGN_BATCH], previous.decode(block), block)
+        return lists
+
+    def prepare_index(self) -> Optional[Callable[[], Any]]:
+        """
+        Snapshot the stored vectors if the inverted lists are due to be trained.
+
+        Until the built lists are installed, vectors removed from the current lists are only hidden from
+        searches, so the snapshot is not modified while the lists are being built.
+
+        :return: The function building the new lists, None if no training is due.
+        """
+        if self.__building:
+            return None
+        if self.__flat is not None:
+            if self.__flat.count() < self.__train_size:
+                return None
+            ids, vectors = self.__flat.snapshot()
+            build = functools.partial(self.__build_from_vectors, ids, vectors.copy())
+        elif not self.__nlist and len(self.__lists.locations) >= \
+                IvfVectorStore.__RETRAIN_GROWTH * self.__lists.trained_count:
+            snapshot = [
+                (list(ids), codes[:len(ids)]) for ids, codes in zip(self.__lists.ids, self.__lists.codes) if ids
+            ]
+            build = functools.partial(self.__build_from_lists, snapshot, self.__lists)
+        else:
+            return None
+        self.__building = True
+        return build
+
+    def install_index(self, index: Optional[Any]):
+        """
+        Install lists built by the function returned by `prepare_index`, adding and removing the vectors added
+        and removed meanwhile, or drop the build if it failed.
+
+        :param index: The built lists, None if building them failed.
+        """
+        added, self.__added_while_building = self.__added_while_building, {}
+        removed, self.__removed_while_building = self.__removed_while_building, set()
+        self.__building = False
+        if index is None:
+            if self.__flat is None:
+                self.__lists.remove_detached()
+            return
+
+        # Removals go first, since a vector removed and added again is in the snapshot under the same Id.
+        for doc_id in removed:
+            index.remove(doc_id)
+        if added:
+            vectors = np.stack(list(added.values()))
+            index.append(list(added.keys()), vectors, index.encode(vectors))
+        self.__lists = index
+        self.__flat = None
+
+    def add(self, ids: List[str], vectors: np.ndarray, documents: List[str], metadata_list: List[Dict]):
+        if not ids:
+            return
+        for doc_id, document, metadata in zip(ids, documents, metadata_list):
+            self.__documents[doc_id] = (document, metadata)
+            self.__metadata_index.add(doc_id, metadata)
+        self.__version += 1
+        if self.__building:
+            for doc_id, vector in zip(ids, np.asarray(vectors, dtype=np.float32)):
+                self.__added_while_building[doc_id] = vector
+        if self.__flat is not None:
+            self.__flat.add(ids, vectors, documents, metadata_list)
+        else:
+            self.__lists.append(ids, vectors, self.__lists.encode(vectors))
+
+    def remove(self, ids: List[str]) -> int:
+        removed = 0
+        for doc_id in ids:
+            entry = self.__documents.pop(doc_id, None)
+            if entry is None:
+                continue
+            self.__metadata_index.remove(doc_id, entry[1])
+            removed += 1
+            if self.__building:
+                self.__added_while_building.pop(doc_id, None)
+                self.__removed_while_building.add(doc_id)
+            if self.__flat is not None:
+                self.__flat.remove([doc_id])
+            elif self.__building:
+                self.__lists.detach(doc_id)
+            else:
+                self.__lists.remove(doc_id)
+        if removed:
+            self.__version += 1
+        return removed
+
+    def version(self) -> int:
+        return self.__version
+
+    def __score_filtered(self, scaled_query: np.ndarray, where: Dict[str, Any]) -> Tuple[List[str], List[np.ndarray]]:
+        """
+        Score every vector whose metadata matches the filter, whichever list it is in.
+        """
+        positions: Dict[int, List[int]] = {}
+        list_ids: Dict[int, List[str]] = {}
+        candidates = self.__metadata_index.candidates(where)
+        for doc_id in self.__documents if candidates is None else candidates:
+            if matches_where(self.__documents[doc_id][1], where):
+                list_no, position = self.__lists.locations[doc_id]
+                positions.setdefault(list_no, []).append(position)
+                list_ids.setdefault(list_no, []).append(doc_id)
+        ids: List[str] = []
+        scores: List[np.ndarray] = []
+        for list_no, list_positions in positions.items():
+            scores.append(_score(self.__lists.codes[list_no][list_positions], scaled_query))
+            ids.extend(list_ids[list_no])
+        return ids, scores
+
+    def __score_probed(self, query_vector: np.ndarray,
+                       scaled_query: np.ndarray) -> Tuple[List[str], List[np.ndarray]]:
+        """
+        Score the vectors of the lists closest to the query.
+        """
+        centroid_scores = self.__lists.centroids @ query_vector
+        nprobe = min(self.__nprobe, len(centroid_scores))
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        ids: List[str] = []
+        scores: List[np.ndarray] = []
+        for list_no in probes:
+            list_ids = self.__lists.ids[list_no]
+            if list_ids:
+                scores.append(_score(self.__lists.codes[list_no][:len(list_ids)], scaled_query))
+                ids.extend(list_ids)
+        return ids, scores
+
+    def search(self, query_vector: np.ndarray, k: int,
+               where: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        if self.__flat is not None:
+            return self.__flat.search(query_vector, k, where)
+        if not self.__documents or k <= 0:
+            return []
+        scaled_query = (query_vector * self.__lists.scale).astype(np.float32)
+        if where:
+            ids, scores = self.__score_filtered(scaled_query, where)
+        else:
+            ids, scores = self.__score_probed(query_vector, scaled_query)
+        if not ids:
+            return []
+        scores = np.concatenate(scores)
+        # Vectors removed while the lists are being rebuilt are still in the lists, without an Id.
+        top_k = min(k + len(self.__removed_while_building), len(ids))
+        top_rows = np.argpartition(-scores, top_k - 1)[:top_k] if top_k < len(ids) else np.arange(len(ids))
+        top_rows = top_rows[np.argsort(-scores[top_rows])]
+        return [(ids[row], float(scores[row])) for row in top_rows if ids[row] is not None][:k]
+
+    def get(self, ids: List[str]) -> Tuple[List[str], List[Dict]]:
+        entries = [self.__documents[doc_id] for doc_id in ids]
+        return [document for document, _ in entries], [metadata for _, metadata in entries]
+
+    def close(self):
+        pass
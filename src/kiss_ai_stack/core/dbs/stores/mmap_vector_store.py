@@ -0,0 +1,234 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from kiss_ai_stack.core.dbs.metadata_filter import equality_conditions, matches_where
+from kiss_ai_stack.core.dbs.vector_store_abc import VectorStoreAbc
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class MmapVectorStore(VectorStoreAbc):
+    """
+    Persistent vector store backed by an append-only, memory-mapped float32 file.
+
+    Vectors are appended to `vectors.f32` and memory-mapped read-only for searching, while Ids, documents,
+    metadata and tombstones of removed rows live in a `store.db` SQLite sidecar. A write appends and fsyncs the
+    vectors before committing the sidecar transaction that advances the committed row count, so a crash leaves
+    at most an uncommitted tail, overwritten by the next write. Writes skip the Ids stored meanwhile by
+    concurrent writers. Opening only reads the row count and tombstones,
+    whatever the collection size, and other processes may read the store concurrently, picking up new commits
+    on their next call.
+    """
+
+    __SQL_BATCH = 500
+
+    def __init__(self, directory: str):
+        """
+        Open or create a store.
+
+        :param directory: The directory of the store's files.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__vectors_path = os.path.join(directory, 'vectors.f32')
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(
+            os.path.join(directory, 'store.db'), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute('PRAGMA synchronous=FULL')
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS properties (key TEXT PRIMARY KEY, value INTEGER NOT NULL)'
+        )
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'row INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, document TEXT NOT NULL, metadata TEXT NOT NULL)'
+        )
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS tombstones (row INTEGER PRIMARY KEY)')
+        open(self.__vectors_path, 'ab').close()
+
+        self.__generation = -1
+        self.__rows = 0
+        self.__vectors: Optional[np.memmap] = None
+        self.__tombstones = np.empty(0, dtype=np.int64)
+        with self.__lock:
+            self.__refresh()
+        LOG.debug(f'MmapVectorStore :: opened {directory} with {self.__rows} rows')
+
+    def directory(self) -> str:
+        """
+        The directory of the store's files.
+        """
+        return self.__directory
+
+    def __properties(self) -> Dict[str, int]:
+        return dict(self.__connection.execute('SELECT key, value FROM properties').fetchall())
+
+    def __set_properties(self, **properties: int):
+        self.__connection.executemany(
+            'INSERT INTO properties (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            list(properties.items())
+        )
+
+    def __refresh(self):
+        """
+        Remap the vectors if this or another process committed since the last call.
+        """
+        properties = self.__properties()
+        generation = properties.get('generation', 0)
+        if generation == self.__generation:
+            return
+        self.__rows = properties.get('rows', 0)
+        dimension = properties.get('dimension', 0)
+        self.__vectors = np.memmap(self.__vectors_path, dtype=np.float32, mode='r',
+                                   shape=(self.__rows, dimension)) if self.__rows else None
+        self.__tombstones = np.fromiter(
+            (row for row, in self.__connection.execute('SELECT row FROM tombstones')), dtype=np.int64
+        )
+        self.__generation = generation
+
+    def __select(self, query: str, keys: List) -> Iterable[Tuple]:
+        for i in range(0, len(keys), MmapVectorStore.__SQL_BATCH):
+            batch = keys[i:i + MmapVectorStore.__SQL_BATCH]
+            yield from self.__connection.execute(query.format(','.join('?' * len(batch))), batch)
+
+    def count(self) -> int:
+        with self.__lock:
+            self.__refresh()
+            return self.__rows - len(self.__tombstones)
+
+    def existing(self, ids: List[str]) -> Set[str]:
+        with self.__lock:
+            return {doc_id for doc_id, in self.__select('SELECT id FROM documents WHERE id IN ({})', ids)}
+
+    def add(self, ids: List[str], vectors: np.ndarray, documents: List[str], metadata_list: List[Dict]):
+        if not ids:
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self.__lock:
+            self.__connection.execute('BEGIN IMMEDIATE')
+            try:
+                # Concurrent pushes, from other threads or processes, may have stored some of the Ids meanwhile.
+                stored = {doc_id for doc_id, in self.__select('SELECT id FROM documents WHERE id IN ({})', ids)}
+                if stored:
+                    kept = [index for index, doc_id in enumerate(ids) if doc_id not in stored]
+                    ids = [ids[index] for index in kept]
+                    vectors = vectors[kept]
+                    documents = [documents[index] for index in kept]
+                    metadata_list = [metadata_list[index] for index in kept]
+                if not ids:
+                    self.__connection.execute('COMMIT')
+                    return
+                properties = self.__properties()
+                rows = properties.get('rows', 0)
+                dimension = properties.get('dimension') or vectors.shape[1]
+                if vectors.shape[1] != dimension:
+                    raise ValueError(f'MmapVectorStore :: Expected {dimension} dimensional vectors, '
+                                     f'got {vectors.shape[1]}')
+                with open(self.__vectors_path, 'r+b') as file:
+                    file.seek(rows * dimension * vectors.itemsize)
+                    file.write(vectors.tobytes())
+                    file.truncate()
+                    file.flush()
+                    os.fsync(file.fileno())
+                self.__connection.executemany(
+                    'INSERT INTO documents (row, id, document, metadata) VALUES (?, ?, ?, ?)',
+                    [
+                        (rows + offset, doc_id, document, json.dumps(metadata))
+                        for offset, (doc_id, document, metadata) in enumerate(zip(ids, documents, metadata_list))
+                    ]
+                )
+                self.__set_properties(rows=rows + len(ids), dimension=dimension,
+                                      generation=properties.get('generation', 0) + 1)
+                self.__connection.execute('COMMIT')
+            except BaseException:
+                self.__connection.execute('ROLLBACK')
+                raise
+            self.__refresh()
+
+    def remove(self, ids: List[str]) -> int:
+        if not ids:
+            return 0
+        with self.__lock:
+            self.__connection.execute('BEGIN IMMEDIATE')
+            try:
+                rows = [row for row, in self.__select('SELECT row FROM documents WHERE id IN ({})', ids)]
+                if rows:
+                    self.__connection.executemany('DELETE FROM documents WHERE row = ?', [(row,) for row in rows])
+                    self.__connection.executemany('INSERT INTO tombstones (row) VALUES (?)', [(row,) for row in rows])
+                    self.__set_properties(generation=self.__properties().get('generation', 0) + 1)
+                self.__connection.execute('COMMIT')
+            except BaseException:
+                self.__connection.execute('ROLLBACK')
+                raise
+            self.__refresh()
+            return len(rows)
+
+    def version(self) -> int:
+        # The generation counts the commits changing the store, and is persisted along with them.
+        return self.__generation
+
+    @staticmethod
+    def __filter_query(where: Dict[str, Any]) -> Tuple[str, List]:
+        """
+        Build the query of the documents matching the equality conditions of a filter, evaluated by SQLite
+        instead of decoding every document's metadata.
+        """
+        clauses, parameters = [], []
+        for key, value in equality_conditions(where).items():
+            if '"' not in key:
+                clauses.append('json_extract(metadata, ?) = ?')
+                parameters.extend((f'$."{key}"', value))
+        query = 'SELECT row, metadata FROM documents'
+        return (f'{query} WHERE {" AND ".join(clauses)}' if clauses else query), parameters
+
+    def search(self, query_vector: np.ndarray, k: int,
+               where: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        with self.__lock:
+            self.__refresh()
+            live = self.__rows - len(self.__tombstones)
+            if not live or k <= 0:
+                return []
+            if where:
+                query, parameters = self.__filter_query(where)
+                rows = np.fromiter(
+                    (
+                        row for row, metadata in self.__connection.execute(query, parameters)
+                        if row < self.__rows and matches_where(json.loads(metadata), where)
+                    ),
+                    dtype=np.int64
+                )
+                scores = np.asarray(self.__vectors[rows] @ query_vector, dtype=np.float32)
+                live = len(rows)
+            else:
+                rows = None
+                scores = np.asarray(self.__vectors @ query_vector, dtype=np.float32)
+                scores[self.__tombstones] = -np.inf
+            k = min(k, live)
+            if not k:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            top = top[np.argsort(-scores[top])][:k]
+            top_rows = [int(row if rows is None else rows[row]) for row in top]
+            row_ids = dict(self.__select('SELECT row, id FROM documents WHERE row IN ({})', top_rows))
+            return [(row_ids[row], float(scores[index])) for row, index in zip(top_rows, top) if row in row_ids]
+
+    def get(self, ids: List[str]) -> Tuple[List[str], List[Dict]]:
+        with self.__lock:
+            found = {
+                doc_id: (document, json.loads(metadata))
+                for doc_id, document, metadata in self.__select(
+                    'SELECT id, document, metadata FROM documents WHERE id IN ({})', ids
+                )
+            }
+        entries = [found.get(doc_id, ('', {})) for doc_id in ids]
+        return [document for document, _ in entries], [metadata for _, metadata in entries]
+
+    def close(self):
+        with self.__lock:
+            self.__vectors = None
+            self.__connection.close()
@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from kiss_ai_stack.core.dbs.metadata_filter import MetadataIndex, matches_where
+from kiss_ai_stack.core.dbs.vector_store_abc import VectorStoreAbc
+
+
+class VectorMatrixStore(VectorStoreAbc):
+    """
+    In-memory vector store backed by a contiguous float32 matrix.
+
+    Ids, documents and metadata are kept in arrays parallel to the matrix rows. Queries are scored against every
+    row with a single matrix-vector product and the top-k are selected with `argpartition`. Removed rows are
+    filled with the last row, so the matrix stays contiguous. An inverted index of the metadata narrows filtered
+    queries down to the rows matching their equality conditions.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize an empty store.
+
+        :param capacity: Initial number of rows, the matrix grows by doubling.
+        """
+        self.__capacity = capacity
+        self.__vectors: Optional[np.ndarray] = None
+        self.__size = 0
+        self.__ids: List[str] = []
+        self.__documents: List[str] = []
+        self.__metadata_list: List[Dict] = []
+        self.__rows: Dict[str, int] = {}
+        self.__metadata_index = MetadataIndex()
+        self.__version = 0
+
+    def count(self) -> int:
+        return self.__size
+
+    def existing(self, ids: List[str]) -> Set[str]:
+        return {doc_id for doc_id in ids if doc_id in self.__rows}
+
+    def __reserve(self, size: int, dimension: int):
+        if self.__vectors is None:
+            self.__vectors = np.empty((max(self.__capacity, size), dimension), dtype=np.float32)
+        elif size > len(self.__vectors):
+            vectors = np.empty((max(size, 2 * len(self.__vectors)), dimension), dtype=np.float32)
+            vectors[:self.__size] = self.__vectors[:self.__size]
+            self.__vectors = vectors
+
+    def add(self, ids: List[str], vectors: np.ndarray, documents: List[str], metadata_list: List[Dict]):
+        if not ids:
+            return
+        self.__reserve(self.__size + len(ids), vectors.shape[1])
+        self.__vectors[self.__size:self.__size + len(ids)] = vectors
+        for offset, doc_id in enumerate(ids):
+            self.__rows[doc_id] = self.__size + offset
+        self.__size += len(ids)
+        self.__ids.extend(ids)
+        self.__documents.extend(documents)
+        self.__metadata_list.extend(metadata_list)
+        for doc_id, metadata in zip(ids, metadata_list):
+            self.__metadata_index.add(doc_id, metadata)
+        self.__version += 1
+
+    def remove(self, ids: List[str]) -> int:
+        removed = 0
+        for doc_id in ids:
+            row = self.__rows.pop(doc_id, None)
+            if row is None:
+                continue
+            self.__metadata_index.remove(doc_id, self.__metadata_list[row])
+            last = self.__size - 1
+            if row != last:
+                self.__vectors[row] = self.__vectors[last]
+                self.__ids[row] = self.__ids[last]
+                self.__documents[row] = self.__documents[last]
+                self.__metadata_list[row] = self.__metadata_list[last]
+                self.__rows[self.__ids[row]] = row
+            self.__ids.pop()
+            self.__documents.pop()
+            self.__metadata_list.pop()
+            self.__size = last
+            removed += 1
+        if removed:
+            self.__version += 1
+        return removed
+
+    def version(self) -> int:
+        return self.__version
+
+    def search(self, query_vector: np.ndarray, k: int,
+               where: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        if not self.__size or k <= 0:
+            return []
+        if where:
+            candidates = self.__metadata_index.candidates(where)
+            candidate_rows = range(self.__size) if candidates is None \
+                else sorted(self.__rows[doc_id] for doc_id in candidates)
+            rows = np.fromiter(
+                (row for row in candidate_rows if matches_where(self.__metadata_list[row], where)),
+                dtype=np.int64
+            )
+            scores = self.__vectors[rows] @ query_vector
+        else:
+            rows = None
+            scores = self.__vectors[:self.__size] @ query_vector
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [(self.__ids[row if rows is None else rows[row]], float(scores[row])) for row in top]
+
+    def get(self, ids: List[str]) -> Tuple[List[str], List[Dict]]:
+        rows = [self.__rows[doc_id] for doc_id in ids]
+        return [self.__documents[row] for row in rows], [self.__metadata_list[row] for row in rows]
+
+    def snapshot(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Get the stored Ids and a view of their vectors, one row per Id.
+        """
+        if self.__vectors is None:
+            return [], np.empty((0, 0), dtype=np.float32)
+        return list(self.__ids), self.__vectors[:self.__size]
+
+    def close(self):
+        pass
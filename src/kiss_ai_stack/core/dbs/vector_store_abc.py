@@ -0,0 +1,107 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class VectorStoreAbc(ABC):
+    """
+    Abstract base class for the storage engines of local vector databases.
+
+    A store keeps unit-length float32 vectors along with their Ids, documents and metadata, and scores queries
+    by cosine similarity. Embedding texts is left to the vector database using the store.
+    """
+
+    @abstractmethod
+    def count(self) -> int:
+        """
+        :return: The number of stored vectors.
+        """
+        pass
+
+    @abstractmethod
+    def existing(self, ids: List[str]) -> Set[str]:
+        """
+        Find which of the given Ids are already stored.
+
+        :param ids: The Ids to look up.
+        :return: The subset of Ids already stored.
+        """
+        pass
+
+    @abstractmethod
+    def add(self, ids: List[str], vectors: np.ndarray, documents: List[str], metadata_list: List[Dict]):
+        """
+        Store new vectors along with their documents and metadata.
+
+        :param ids: The Ids of the vectors, not already stored.
+        :param vectors: A 2-D float32 matrix of unit-length vectors, one row per Id.
+        :param documents: The document of each vector.
+        :param metadata_list: The metadata of each vector.
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, ids: List[str]) -> int:
+        """
+        Remove vectors by their Ids, ignoring unknown Ids.
+
+        :param ids: The Ids to remove.
+        :return: The number of vectors removed.
+        """
+        pass
+
+    @abstractmethod
+    def version(self) -> int:
+        """
+        :return: The version of the stored contents, bumped by every add and remove that changes them, and kept
+                 as long as the contents are, e.g. on disk for persistent stores.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query_vector: np.ndarray, k: int,
+               where: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the vectors most similar to the query vector.
+
+        :param query_vector: A unit-length float32 query vector.
+        :param k: The number of results.
+        :param where: Optional metadata filter, see `matches_where`, applied before the top-k are selected.
+        :return: Up to k (id, cosine similarity) pairs, most similar first.
+        """
+        pass
+
+    def prepare_index(self) -> Optional[Callable[[], Any]]:
+        """
+        Prepare rebuilding the store's index if it is due, e.g. training its inverted lists.
+
+        :return: A function building the index, to be run in a worker thread and its result passed to
+                 `install_index`, or None if no rebuild is due.
+        """
+        return None
+
+    def install_index(self, index: Optional[Any]):
+        """
+        Install an index built by the function returned by `prepare_index`.
+
+        :param index: The built index, None if building it failed.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, ids: List[str]) -> Tuple[List[str], List[Dict]]:
+        """
+        Get the documents and metadata of stored vectors.
+
+        :param ids: The Ids of stored vectors.
+        :return: The documents and the metadata of the vectors, in the order of the Ids.
+        """
+        pass
+
+    @abstractmethod
+    def close(self):
+        """
+        Release the store's resources, keeping its persisted contents if any.
+        """
+        pass
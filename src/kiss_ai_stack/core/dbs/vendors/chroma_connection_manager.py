@@ -0,0 +1,173 @@
+import asyncio
+import weakref
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class ChromaConnectionManager:
+    """
+    Process-level manager of ChromaDB connections shared across stacks.
+
+    Clients are keyed by host, port, ssl, tenant and database, and already ensured tenants, databases and
+    collection handles are cached, so bootstrapping further stacks against the same server and tenant does not
+    repeat the client, tenant and database round trips.
+
+    Clients, collection handles and locks are bound to the event loop they were created in, so they are kept
+    per event loop. Deleting a collection bumps its generation, telling the other holders of its handle to
+    get a fresh one.
+    """
+
+    __loop_states: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Dict]]' = \
+        weakref.WeakKeyDictionary()
+    __ensured_tenants: Set[Tuple] = set()
+    __ensured_databases: Set[Tuple] = set()
+    __generations: Dict[Tuple, int] = {}
+
+    @classmethod
+    def __state(cls) -> Dict[str, Dict]:
+        """
+        The clients, collection handles and locks of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in cls.__loop_states:
+            cls.__loop_states[loop] = {
+                'server_clients': {}, 'admin_clients': {}, 'clients': {}, 'collections': {}, 'locks': {}
+            }
+        return cls.__loop_states[loop]
+
+    @classmethod
+    def __lock(cls, key: Hashable) -> asyncio.Lock:
+        locks = cls.__state()['locks']
+        if key not in locks:
+            locks[key] = asyncio.Lock()
+        return locks[key]
+
+    @classmethod
+    async def __admin_client(cls, server_key: Tuple):
+        """
+        Get the shared admin client of a server, created from a default tenant client's settings.
+
+        :param server_key: The host, port and ssl of the server.
+        """
+        from chromadb import AsyncHttpClient
+        from chromadb import AdminClient
+
+        state = cls.__state()
+        async with cls.__lock(('admin',) + server_key):
+            if server_key not in state['admin_clients']:
+                host, port, ssl = server_key
+                server_client = await AsyncHttpClient(host=host, port=port, ssl=ssl)
+                state['server_clients'][server_key] = server_client
+                state['admin_clients'][server_key] = AdminClient(settings=server_client.get_settings())
+            return state['admin_clients'][server_key]
+
+    @classmethod
+    async def __ensure_tenant(cls, server_key: Tuple, tenant: str):
+        from chromadb.errors import NotFoundError
+
+        if server_key + (tenant,) in cls.__ensured_tenants:
+            return
+        admin_client = await cls.__admin_client(server_key)
+        try:
+            await admin_client.get_tenant(tenant)
+        except NotFoundError:
+            LOG.warning(f'ChromaConnectionManager :: Tenant :: {tenant} not found, attempting to create')
+            await admin_client.create_tenant(tenant)
+            LOG.warning(f'ChromaConnectionManager :: Tenant :: {tenant} created')
+        cls.__ensured_tenants.add(server_key + (tenant,))
+
+    @classmethod
+    async def __ensure_database(cls, server_key: Tuple, tenant: str, database: str):
+        from chromadb.errors import NotFoundError
+
+        if server_key + (tenant, database) in cls.__ensured_databases:
+            return
+        admin_client = await cls.__admin_client(server_key)
+        try:
+            await admin_client.get_database(name=database, tenant=tenant)
+        except NotFoundError:
+            LOG.warning(f'ChromaConnectionManager :: Database :: {tenant} : {database} not found, attempting to create')
+            await admin_client.create_database(name=database, tenant=tenant)
+            LOG.warning(f'ChromaConnectionManager :: Database :: {tenant} : {database} created')
+        cls.__ensured_databases.add(server_key + (tenant, database))
+
+    @classmethod
+    async def get_client(cls, host: str, port: int, ssl: bool, tenant: Optional[str] = None) -> Tuple[Tuple, Any]:
+        """
+        Get the shared async client for a server, tenant and database, creating them on first use.
+
+        :param host: ChromaDB server host.
+        :param port: ChromaDB server port.
+        :param ssl: Whether to connect over SSL.
+        :param tenant: Preferably user's unique Id, the default tenant and database are used if None.
+
+        :returns: The client key along with the shared client.
+        """
+        from chromadb import AsyncHttpClient
+
+        server_key = (host, port, ssl)
+        if tenant:
+            database = f'{tenant}_docs'
+        else:
+            tenant, database = 'default_tenant', 'default_database'
+        client_key = server_key + (tenant, database)
+
+        clients = cls.__state()['clients']
+        async with cls.__lock(client_key):
+            if client_key not in clients:
+                if tenant == 'default_tenant':
+                    client = await AsyncHttpClient(host=host, port=port, ssl=ssl)
+                else:
+                    await cls.__ensure_tenant(server_key, tenant)
+                    await cls.__ensure_database(server_key, tenant, database)
+                    client = await AsyncHttpClient(host=host, port=port, ssl=ssl, tenant=tenant, database=database)
+                clients[client_key] = client
+                LOG.info(f'ChromaConnectionManager :: Connected to {host}:{port}, tenant: {tenant}')
+            return client_key, clients[client_key]
+
+    @classmethod
+    async def get_collection(cls, client_key: Tuple, name: str):
+        """
+        Get the cached collection handle, or get/create the collection on first use.
+
+        Handles are not bound to an embedding function, documents and queries being embedded by the caller.
+
+        :param client_key: The client key returned by `get_client`.
+        :param name: The collection name.
+
+        :returns: The collection handle.
+        """
+        state = cls.__state()
+        collection_key = client_key + (name,)
+        async with cls.__lock(collection_key):
+            if collection_key not in state['collections']:
+                state['collections'][collection_key] = await state['clients'][client_key].get_or_create_collection(
+                    name=name,
+                    embedding_function=None
+                )
+            return state['collections'][collection_key]
+
+    @classmethod
+    def collection_generation(cls, client_key: Tuple, name: str) -> int:
+        """
+        Get the generation of a collection, bumped every time it is deleted.
+
+        :param client_key: The client key returned by `get_client`.
+        :param name: The collection name.
+        :returns: The collection generation, a handle obtained in an older generation is stale.
+        """
+        return cls.__generations.get(client_key + (name,), 0)
+
+    @classmethod
+    def forget_collection(cls, client_key: Tuple, name: str):
+        """
+        Drop the cached handles of a deleted collection, in every event loop, and bump its generation.
+
+        :param client_key: The client key returned by `get_client`.
+        :param name: The collection name.
+        """
+        generation_key = client_key + (name,)
+        cls.__generations[generation_key] = cls.__generations.get(generation_key, 0) + 1
+        for state in list(cls.__loop_states.values()):
+            state['collections'].pop(generation_key, None)
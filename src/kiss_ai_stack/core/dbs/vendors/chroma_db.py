@@ -1,11 +1,24 @@
-from typing import List, Dict, Optional, Tuple
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, List, Dict, Optional, Tuple
 
+import numpy as np
+
+from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
+from kiss_ai_stack.core.ai_clients.ai_client_factory import AIClientFactory
+from kiss_ai_stack.core.caches.cached_embedding_function import CachedEmbeddingFunction
+from kiss_ai_stack.core.caches.embedding_cache import EmbeddingCache
 from kiss_ai_stack.core.config import VECTOR_DB
 from kiss_ai_stack.core.dbs.db_abc import VectorDBAbc
+from kiss_ai_stack.core.dbs.document_ids import document_ids
+from kiss_ai_stack.core.dbs.vendors.chroma_connection_manager import ChromaConnectionManager
+from kiss_ai_stack.core.models.config.ai_client_props import AIClientProperties
 from kiss_ai_stack.core.models.config.vdb_props import VectorDBProperties
 from kiss_ai_stack.core.models.enums.ai_client_vendor import AIClientVendor
 from kiss_ai_stack.core.models.enums.db_kind import VectorDBKind
 from kiss_ai_stack.core.models.enums.db_vendor import VectorDBVendor
+from kiss_ai_stack.core.models.enums.tool_kind import ToolKind
 from kiss_ai_stack.core.utilities import install_package
 from kiss_ai_stack.core.utilities.logger import LOG
 
@@ -15,6 +28,8 @@ class ChromaVectorDB(VectorDBAbc):
     Async-compatible ChromaDB implementation of the VectorDBAbc interface.
     """
 
+    __VERSION_KEY = 'kiss_ai_stack_version'
+
     def __init__(self, collection_name: str, properties: VectorDBProperties):
         """
         Initialize the ChromaVectorDB instance.
@@ -23,11 +38,15 @@ class ChromaVectorDB(VectorDBAbc):
         :param properties: Configuration properties for connecting to ChromaDB.
         """
         self.__collection_name = collection_name
-        self.__embedding_function = None
+        self.__ai_client: Optional[AIClientAbc] = None
+        self.__embedding_function: Optional[CachedEmbeddingFunction] = None
         self.__properties = properties
         self.__client: Optional['AsyncHttpClient'] = None
-        self.__admin_client: Optional['AdminClient'] = None
+        self.__client_key: Optional[Tuple] = None
         self.__collection = None
+        self.__collection_generation = 0
+        self.__push_report: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+            f'chroma_push_report_{id(self)}', default=None)
 
         LOG.debug(f'ChromaVectorDB :: ChromaVectorDB initialized with collection name: \'{self.__collection_name}\'')
 
@@ -36,87 +55,68 @@ class ChromaVectorDB(VectorDBAbc):
             raise ValueError(
                 f'ChromaVectorDB :: Invalid {param_name}: {value}. Must be one of: {[e.name for e in enum_type]}')
 
-    async def __ensure_database(self, tenant: Optional[str], database: Optional[str]) -> Optional[str]:
-        from chromadb.errors import NotFoundError
-
-        try:
-            await self.__admin_client.get_database(name=database, tenant=tenant)
-        except NotFoundError:
-            LOG.warning(f'ChromaVectorDB :: Database :: {tenant} : {database} not fount, attempting to create')
-            await self.__admin_client.create_database(name=database, tenant=tenant)
-            LOG.warning(f'ChromaVectorDB :: Database :: {tenant} : {database}  created')
-        finally:
-            return database
-
-    async def __ensure_tenant(self, tenant: str) -> Optional[Tuple]:
-        from chromadb.errors import NotFoundError
-
-        database = f'{tenant}_docs'
-        try:
-            await self.__admin_client.get_tenant(tenant)
-        except NotFoundError:
-            LOG.warning(f'ChromaVectorDB :: Tenant :: {tenant} not fount, attempting to create')
-            await self.__admin_client.create_tenant(tenant)
-            LOG.warning(f'ChromaVectorDB :: Tenant :: {tenant} created')
-        finally:
-            database = await self.__ensure_database(tenant=tenant, database=database)
-            return tenant, database
-
-    def __initialize_embedding_function(self, embedding_api_key: str, embedding_model: str, ai_vendor: AIClientVendor):
+    def __initialize_embedding_function(self, embedding_api_key: str, embedding_model: str, ai_vendor: AIClientVendor,
+                                        ai_client_properties: Optional[AIClientProperties] = None):
         """
-        Initialize an embedding function for the specified model.
+        Initialize the AI client embedding documents and queries with the specified model.
+
+        Embeddings are computed by the stack's async AI client rather than by ChromaDB, so they are micro-batched,
+        rate limited and prioritized like the rest of the stack's calls.
 
         :param embedding_api_key: The API key for embedding service.
         :param embedding_model: The model name to be used for embeddings.
         :param ai_vendor: The vendor providing the embedding service.
+        :param ai_client_properties: The AI client configuration of the tool, so embeddings share its rate limits.
         """
         self.__validate_enum(ai_vendor, AIClientVendor, 'ai_vendor')
-        LOG.info(f'ChromaVectorDB :: Creating embedding function for {ai_vendor}: {embedding_model}')
-
-        if ai_vendor == AIClientVendor.OPENAI:
-            from chromadb.utils.embedding_functions.openai_embedding_function import OpenAIEmbeddingFunction
-
-            self.__embedding_function = OpenAIEmbeddingFunction(
-                api_key=embedding_api_key,
-                model_name=embedding_model
-            )
-        else:
+        LOG.info(f'ChromaVectorDB :: Creating embedding client for {ai_vendor}: {embedding_model}')
+
+        self.__ai_client = AIClientFactory.get_ai_client(
+            ai_client_properties or AIClientProperties(provider=ai_vendor, model=embedding_model,
+                                                       api_key=embedding_api_key),
+            ToolKind.RAG,
+            embedding_model=embedding_model
+        )
+        if self.__ai_client is None:
             raise NotImplementedError(f'ChromaVectorDB :: Unsupported embedding function type: {ai_vendor}')
+        self.__ai_client.initialize()
+
+        cache_properties = self.__properties.embedding_cache
+        if cache_properties and cache_properties.enabled:
+            LOG.info(f'ChromaVectorDB :: Caching embeddings of {embedding_model}')
+        self.__embedding_function = CachedEmbeddingFunction(
+            ai_client=self.__ai_client,
+            cache=EmbeddingCache.from_properties(cache_properties)
+            if cache_properties and cache_properties.enabled else None,
+            model=f'{ai_vendor}:{embedding_model}'
+        )
 
     async def __initialize_client(self, tenant: Optional[str] = None):
         """
         Initialize the ChromaDB client based on the properties' configuration.
+
+        Clients, tenants and databases are shared across stacks through the `ChromaConnectionManager`.
         :param tenant: Preferably user's unique Id.
         """
         try:
-            from chromadb import AsyncHttpClient
-            from chromadb import AdminClient, Settings
+            import chromadb
         except ImportError:
             package_name = VECTOR_DB[VectorDBVendor.CHROMA]
             LOG.warning(f'ChromaVectorDB :: ChromaDB is not installed. Attempting to auto-install {package_name}.')
             install_package(package_name)
-            from chromadb import AsyncHttpClient
-            from chromadb import AdminClient, Settings
 
         if self.__properties.kind == VectorDBKind.REMOTE:
-            self.__client = await AsyncHttpClient(
+            self.__client_key, self.__client = await ChromaConnectionManager.get_client(
                 host=self.__properties.host,
                 port=self.__properties.port,
-                ssl=self.__properties.secure
+                ssl=self.__properties.secure,
+                tenant=tenant
             )
-            self.__admin_client = AdminClient(settings=self.__client.get_settings())
-
-            database = 'default_database'
-            if tenant:
-                tenant, database = await self.__ensure_tenant(tenant)
-            else:
-                tenant = 'default_tenant'
-            await self.__client.set_tenant(tenant=tenant, database=database)
         else:
             raise ValueError(f'ChromaVectorDB :: Only \'REMOTE\' kind is supported for ChromaDB.')
 
     async def initialize(self, embedding_api_key: str, embedding_model: str, ai_vendor: AIClientVendor,
-                         tenant: Optional[str] = None):
+                         tenant: Optional[str] = None, ai_client_properties: Optional[AIClientProperties] = None):
         """
         Initialize the ChromaDB client and collection asynchronously.
 
@@ -124,6 +124,7 @@ class ChromaVectorDB(VectorDBAbc):
         :param embedding_model: Embedding model to use.
         :param ai_vendor: The AI provider (e.g., OpenAI) for embeddings generation.
         :param tenant: Preferably user's unique Id.
+        :param ai_client_properties: The AI client configuration of the tool, so embeddings share its rate limits.
 
         :raises Exception: If the initialization fails for any reason.
         """
@@ -134,12 +135,10 @@ class ChromaVectorDB(VectorDBAbc):
             self.__initialize_embedding_function(
                 embedding_api_key=embedding_api_key,
                 embedding_model=embedding_model,
-                ai_vendor=ai_vendor
-            )
-            self.__collection = await self.__client.get_or_create_collection(
-                name=self.__collection_name,
-                embedding_function=self.__embedding_function,
+                ai_vendor=ai_vendor,
+                ai_client_properties=ai_client_properties
             )
+            await self.__live_collection()
 
             LOG.info(
                 f'ChromaVectorDB :: ChromaDB client initialized successfully. Collection \'{self.__collection_name}\' is ready.')
@@ -148,10 +147,57 @@ class ChromaVectorDB(VectorDBAbc):
             LOG.error(f'ChromaVectorDB :: Error initializing ChromaDB client: {e}')
             raise
 
+    async def __live_collection(self):
+        """
+        Get the collection handle, getting a fresh one if the collection was deleted since, e.g. by another stack.
+        """
+        generation = ChromaConnectionManager.collection_generation(self.__client_key, self.__collection_name)
+        if self.__collection is None or generation != self.__collection_generation:
+            self.__collection = await ChromaConnectionManager.get_collection(
+                client_key=self.__client_key,
+                name=self.__collection_name
+            )
+            self.__collection_generation = generation
+        return self.__collection
+
+    async def __embed(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embed texts with the AI client, serving cached embeddings where possible.
+        """
+        return list(await self.__embedding_function(texts))
+
+    async def __existing_ids(self, ids: List[str]) -> set:
+        """
+        Get which of the given Ids are already in the collection, with a single round trip.
+        """
+        collection = await self.__live_collection()
+        return set((await collection.get(ids=ids, include=[])).get('ids', []))
+
+    async def __push_batch(self, batch_ids: List[str], documents: List[str], metadata_list: List[Dict]) -> int:
+        """
+        Upsert a batch of documents.
+
+        :returns: The number of documents written.
+        """
+        collection = await self.__live_collection()
+        await collection.upsert(
+            ids=batch_ids,
+            documents=documents,
+            metadatas=metadata_list,
+            embeddings=await self.__embed(documents)
+        )
+        return len(batch_ids)
+
     async def push(self, documents: List[str], metadata_list: Optional[List[Dict]] = None) -> List[str]:
         """
         Add documents and optional metadata to the ChromaDB collection asynchronously.
 
+        Document Ids are derived from each document's content and metadata, and written with upsert semantics,
+        so concurrent pushes are safe. Documents already in the collection, looked up once per push, are not
+        embedded again.
+        Documents are written in batches of `batch_size`, up to `push_concurrency` batches at a time, and only
+        the failed batches are retried, up to `max_retries` times with exponential backoff.
+
         :param documents: A list of document texts to add to the collection.
         :param metadata_list: A list of metadata dictionaries corresponding to each document.
 
@@ -163,28 +209,140 @@ class ChromaVectorDB(VectorDBAbc):
         LOG.info(f'ChromaVectorDB :: Pushing {len(documents)} documents to collection \'{self.__collection_name}\'.')
 
         try:
-            id_count = await self.__collection.count()
-            ids = [str(i) for i in range(id_count, id_count + len(documents))]
-
-            await self.__collection.add(
-                ids=ids,
-                documents=documents,
-                metadatas=metadata_list or [{}] * len(documents)
-            )
-
-            LOG.debug('ChromaVectorDB :: Documents pushed successfully.')
+            metadata_list = metadata_list or [{}] * len(documents)
+            ids = document_ids(documents, metadata_list)
+
+            unique_docs = {}
+            for doc_id, document, metadata in zip(ids, documents, metadata_list):
+                unique_docs.setdefault(doc_id, (document, metadata))
+            existing = await self.__existing_ids(list(unique_docs.keys()))
+            new_ids = [doc_id for doc_id in unique_docs if doc_id not in existing]
+            batch_size = self.__properties.batch_size
+            batches = [new_ids[i:i + batch_size] for i in range(0, len(new_ids), batch_size)]
+            latencies: List[Optional[float]] = [None] * len(batches)
+            semaphore = asyncio.Semaphore(self.__properties.push_concurrency)
+
+            async def push_batch(index: int) -> int:
+                async with semaphore:
+                    batch_ids = batches[index]
+                    started_at = time.perf_counter()
+                    written = await self.__push_batch(
+                        batch_ids,
+                        [unique_docs[doc_id][0] for doc_id in batch_ids],
+                        [unique_docs[doc_id][1] for doc_id in batch_ids]
+                    )
+                    latencies[index] = time.perf_counter() - started_at
+                    LOG.debug(f'ChromaVectorDB :: Batch {index + 1}/{len(batches)} pushed in {latencies[index]:.3f}s')
+                    return written
+
+            pending = list(range(len(batches)))
+            written, retries = 0, 0
+            for attempt in range(self.__properties.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+                    retries += len(pending)
+                    LOG.warning(f'ChromaVectorDB :: Retrying {len(pending)} failed batches, attempt {attempt}')
+                results = await asyncio.gather(*(push_batch(index) for index in pending), return_exceptions=True)
+                for result in results:
+                    if isinstance(result, BaseException) and not isinstance(result, Exception):
+                        raise result
+                written += sum(result for result in results if not isinstance(result, Exception))
+                failures = [
+                    (index, result) for index, result in zip(pending, results) if isinstance(result, Exception)
+                ]
+                pending = [index for index, _ in failures]
+                if not pending:
+                    break
+
+            if written:
+                await self.__bump_version()
+            self.__push_report.set({
+                'documents': len(unique_docs),
+                'written': written,
+                'batches': len(batches),
+                'retries': retries,
+                'failed_batches': len(pending),
+                'batch_latencies': latencies
+            })
+            if pending:
+                raise failures[0][1]
+
+            LOG.debug(f'ChromaVectorDB :: Documents pushed successfully, {written} new.')
             return ids
 
         except Exception as e:
             LOG.error(f'ChromaVectorDB :: Error pushing documents: {e}')
             raise
 
-    async def retrieve(self, query: str, k: int = 10) -> dict:
+    def last_push_report(self) -> Dict[str, Any]:
+        """
+        Get the report of the latest push awaited by the calling task: documents, written documents, batches,
+        retried and failed batches, and the latency of each batch in seconds (None for batches that never
+        succeeded). Reports are kept per task, so concurrent pushes do not overwrite each other's report.
+
+        :returns: The latest push report, empty if the calling task pushed nothing yet.
+        """
+        return dict(self.__push_report.get() or {})
+
+    async def delete(self, ids: List[str]):
+        """
+        Delete documents from the ChromaDB collection by their Ids asynchronously.
+
+        :param ids: The Ids of the documents to delete.
+        """
+        if not ids:
+            return
+
+        LOG.info(f'ChromaVectorDB :: Deleting {len(ids)} documents from collection \'{self.__collection_name}\'.')
+
+        try:
+            await (await self.__live_collection()).delete(ids=ids)
+            await self.__bump_version()
+            LOG.debug('ChromaVectorDB :: Documents deleted successfully.')
+
+        except Exception as e:
+            LOG.error(f'ChromaVectorDB :: Error deleting documents: {e}')
+            raise
+
+    async def __bump_version(self):
+        """
+        Bump the collection version, kept in the collection's metadata.
+        """
+        collection = await self.__live_collection()
+        metadata = dict(collection.metadata or {})
+        metadata[ChromaVectorDB.__VERSION_KEY] = metadata.get(ChromaVectorDB.__VERSION_KEY, 0) + 1
+        await collection.modify(metadata=metadata)
+
+    def embedding_cache_stats(self) -> Dict[str, float]:
+        """
+        Get the embedding cache's hit and miss counters, its hit rate and sizes.
+
+        :returns: Cache stats, or an empty dictionary if the cache is not enabled.
+        """
+        return self.__embedding_function.stats() if self.__embedding_function else {}
+
+    def version(self) -> int:
+        """
+        Get the collection version, bumped by every push and delete that changes the collection.
+
+        The version is kept in the collection's metadata, so it survives restarts and is shared by the stacks
+        using the collection.
+
+        :returns: The current collection version.
+        """
+        if self.__collection is None:
+            return 0
+        return (self.__collection.metadata or {}).get(ChromaVectorDB.__VERSION_KEY, 0)
+
+    async def retrieve(self, query: str, k: int = 10, where: Optional[Dict[str, Any]] = None,
+                       include: Optional[List[str]] = None) -> dict:
         """
         Retrieve the top-k documents relevant to the given query asynchronously.
 
         :param query: The query text to search for in the collection.
         :param k: The number of top results to retrieve. Defaults to 10.
+        :param where: Optional metadata filter, evaluated by ChromaDB.
+        :param include: The fields to return among 'documents', 'metadatas' and 'distances', all if None.
 
         :returns: A dictionary containing the retrieved documents and their metadata.
         """
@@ -194,9 +352,11 @@ class ChromaVectorDB(VectorDBAbc):
         LOG.info(f'ChromaVectorDB :: Retrieving top {k} results from collection \'{self.__collection_name}\'.')
 
         try:
-            results = await self.__collection.query(
-                query_texts=[query],
-                n_results=k
+            results = await (await self.__live_collection()).query(
+                query_embeddings=await self.__embed([query]),
+                n_results=k,
+                where=where or None,
+                include=include if include is not None else ['documents', 'metadatas', 'distances']
             )
             LOG.debug('ChromaVectorDB :: Retrieve operation successful.')
             return results
@@ -212,17 +372,33 @@ class ChromaVectorDB(VectorDBAbc):
         if not self.__collection:
             LOG.warning(f'ChromaVectorDB :: No collection \'{self.__collection_name}\' exists to delete.')
             return
+        if ChromaConnectionManager.collection_generation(
+                self.__client_key, self.__collection_name) != self.__collection_generation:
+            LOG.warning(f'ChromaVectorDB :: Collection \'{self.__collection_name}\' was already deleted.')
+            await self.close()
+            return
 
         try:
             doc_count = await self.__collection.count()
             LOG.info(f'ChromaVectorDB :: Deleting collection \'{self.__collection_name}\' with {doc_count} documents.')
 
             await self.__client.delete_collection(name=self.__collection_name)
-            self.__collection = None
-            self.__embedding_function = None
+            ChromaConnectionManager.forget_collection(self.__client_key, self.__collection_name)
+            await self.close()
 
             LOG.info(f'ChromaVectorDB :: Collection \'{self.__collection_name}\' successfully deleted.')
 
         except Exception as e:
             LOG.error(f'ChromaVectorDB :: Failed to delete collection: {e}')
             raise
+
+    async def close(self):
+        """
+        Drop this instance's collection handle and release its embedding client, keeping the collection and the
+        shared ChromaDB client.
+        """
+        self.__collection = None
+        self.__embedding_function = None
+        if self.__ai_client:
+            await self.__ai_client.destroy()
+            self.__ai_client = None
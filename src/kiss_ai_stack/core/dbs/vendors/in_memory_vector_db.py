@@ -0,0 +1,58 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from kiss_ai_stack.core.dbs.stores.ivf_vector_store import IvfVectorStore
+from kiss_ai_stack.core.dbs.stores.vector_matrix_store import VectorMatrixStore
+from kiss_ai_stack.core.dbs.vector_store_abc import VectorStoreAbc
+from kiss_ai_stack.core.dbs.vendors.local_vector_db import LocalVectorDB
+from kiss_ai_stack.core.models.config.vdb_props import VectorDBProperties
+from kiss_ai_stack.core.models.enums.vector_index_kind import VectorIndexKind
+
+
+class InMemoryVectorDB(LocalVectorDB):
+    """
+    Native in-process vector database keeping collections in memory.
+
+    Collections live in contiguous float32 matrices, or in an IVF index when configured through `index`, and are
+    shared process-wide by tenant and name, so stacks reopening a collection see its documents until it is
+    destroyed. Nothing is persisted.
+    """
+
+    __stores: Dict[Tuple[Optional[str], str], VectorStoreAbc] = {}
+    __lock = threading.Lock()
+
+    def __init__(self, collection_name: str, properties: VectorDBProperties):
+        """
+        Initialize the in-memory vector database.
+
+        :param collection_name: The name of the collection to be created or accessed.
+        :param properties: Configuration properties of the vector database.
+        """
+        super().__init__(collection_name, properties)
+
+    def __create_store(self) -> VectorStoreAbc:
+        index = self.properties().index
+        if index and index.kind == VectorIndexKind.IVF:
+            return IvfVectorStore(
+                nlist=index.nlist,
+                nprobe=index.nprobe,
+                quantization=index.quantization,
+                train_size=index.train_size
+            )
+        return VectorMatrixStore()
+
+    async def _open_store(self) -> VectorStoreAbc:
+        key = (self.tenant(), self.collection_name())
+        with InMemoryVectorDB.__lock:
+            store = InMemoryVectorDB.__stores.get(key)
+            if store is None:
+                store = self.__create_store()
+                InMemoryVectorDB.__stores[key] = store
+            return store
+
+    async def _drop_store(self, store: VectorStoreAbc):
+        key = (self.tenant(), self.collection_name())
+        with InMemoryVectorDB.__lock:
+            if InMemoryVectorDB.__stores.get(key) is store:
+                del InMemoryVectorDB.__stores[key]
+        store.close()
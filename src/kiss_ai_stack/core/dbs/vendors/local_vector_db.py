@@ -0,0 +1,277 @@
+import asyncio
+from abc import abstractmethod
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+import numpy as np
+
+from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
+from kiss_ai_stack.core.ai_clients.ai_client_factory import AIClientFactory
+from kiss_ai_stack.core.caches.cached_embedding_function import CachedEmbeddingFunction
+from kiss_ai_stack.core.caches.embedding_cache import EmbeddingCache
+from kiss_ai_stack.core.dbs.db_abc import VectorDBAbc
+from kiss_ai_stack.core.dbs.document_ids import document_ids
+from kiss_ai_stack.core.dbs.vector_store_abc import VectorStoreAbc
+from kiss_ai_stack.core.models.config.ai_client_props import AIClientProperties
+from kiss_ai_stack.core.models.config.vdb_props import VectorDBProperties
+from kiss_ai_stack.core.models.enums.ai_client_vendor import AIClientVendor
+from kiss_ai_stack.core.models.enums.tool_kind import ToolKind
+from kiss_ai_stack.core.utilities.logger import LOG
+
+T = TypeVar('T')
+
+
+class LocalVectorDB(VectorDBAbc):
+    """
+    Base class of vector databases running in-process on a `VectorStoreAbc`.
+
+    Texts are embedded with the stack's AI client, through the embedding cache when it is configured, and
+    results are shaped like ChromaDB query results, so local and remote vector databases are interchangeable.
+    Subclasses only decide how a collection's store is opened and dropped.
+    """
+
+    def __init__(self, collection_name: str, properties: VectorDBProperties):
+        """
+        Initialize the local vector database.
+
+        :param collection_name: The name of the collection to be created or accessed.
+        :param properties: Configuration properties of the vector database.
+        """
+        self.__collection_name = collection_name
+        self.__properties = properties
+        self.__ai_client: Optional[AIClientAbc] = None
+        self.__embedding_function: Optional[CachedEmbeddingFunction] = None
+        self.__store: Optional[VectorStoreAbc] = None
+        self.__tenant: Optional[str] = None
+
+    def collection_name(self) -> str:
+        """
+        The name of the collection.
+        """
+        return self.__collection_name
+
+    def properties(self) -> VectorDBProperties:
+        """
+        The configuration properties of the vector database.
+        """
+        return self.__properties
+
+    def tenant(self) -> Optional[str]:
+        """
+        The tenant the collection belongs to, None for the default tenant.
+        """
+        return self.__tenant
+
+    @abstractmethod
+    async def _open_store(self) -> VectorStoreAbc:
+        """
+        Open the store of the collection, creating it if needed.
+        """
+        pass
+
+    @abstractmethod
+    async def _drop_store(self, store: VectorStoreAbc):
+        """
+        Delete the store of the collection along with its contents.
+        """
+        pass
+
+    async def _run_store(self, function: Callable[..., T], *args) -> T:
+        """
+        Run a call to the store. Calls run on the event loop, subclasses with blocking stores run them in a
+        worker thread instead.
+        """
+        return function(*args)
+
+    async def initialize(self, embedding_api_key: str, embedding_model: str, ai_vendor: AIClientVendor,
+                         tenant: Optional[str] = None, ai_client_properties: Optional[AIClientProperties] = None):
+        """
+        Initialize the embedding client and open the collection's store.
+
+        :param embedding_api_key: API key for embeddings generation.
+        :param embedding_model: Embedding model to use.
+        :param ai_vendor: The AI provider (e.g., OpenAI) for embeddings generation.
+        :param tenant: Preferably user's unique Id.
+        :param ai_client_properties: The AI client configuration of the tool, so embeddings share its rate limits.
+        """
+        LOG.info(f'{type(self).__name__} :: Initializing collection \'{self.__collection_name}\'')
+        self.__tenant = tenant
+        self.__ai_client = AIClientFactory.get_ai_client(
+            ai_client_properties or AIClientProperties(provider=ai_vendor, model=embedding_model,
+                                                       api_key=embedding_api_key),
+            ToolKind.RAG,
+            embedding_model=embedding_model
+        )
+        if self.__ai_client is None:
+            raise NotImplementedError(f'{type(self).__name__} :: Unsupported embedding provider: {ai_vendor}')
+        self.__ai_client.initialize()
+        cache_properties = self.__properties.embedding_cache
+        self.__embedding_function = CachedEmbeddingFunction(
+            ai_client=self.__ai_client,
+            cache=EmbeddingCache.from_properties(cache_properties)
+            if cache_properties and cache_properties.enabled else None,
+            model=f'{ai_vendor}:{embedding_model}'
+        )
+        self.__store = await self._open_store()
+        LOG.info(f'{type(self).__name__} :: Collection \'{self.__collection_name}\' is ready with '
+                 f'{await self._run_store(self.__store.count)} documents.')
+
+    @staticmethod
+    def __normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    async def __embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts as unit-length float32 vectors, serving cached embeddings where possible.
+        """
+        return self.__normalize(await self.__embedding_function(texts))
+
+    async def push(self, documents: List[str], metadata_list: Optional[List[Dict]] = None) -> List[str]:
+        """
+        Embed and add documents and optional metadata to the collection.
+
+        Document Ids are derived from each document's content and metadata, and documents already in the
+        collection are not embedded again. Documents are embedded in batches of `batch_size`, up to
+        `push_concurrency` batches at a time.
+
+        :param documents: A list of document texts to add to the collection.
+        :param metadata_list: A list of metadata dictionaries corresponding to each document.
+
+        :returns: A list of unique identifiers for the added documents.
+        """
+        if not documents:
+            raise ValueError(f'{type(self).__name__} :: No documents provided to push.')
+
+        LOG.info(f'{type(self).__name__} :: Pushing {len(documents)} documents to collection '
+                 f'\'{self.__collection_name}\'.')
+        metadata_list = metadata_list or [{}] * len(documents)
+        ids = document_ids(documents, metadata_list)
+
+        unique_docs = {}
+        for doc_id, document, metadata in zip(ids, documents, metadata_list):
+            unique_docs.setdefault(doc_id, (document, metadata))
+        for doc_id in await self._run_store(self.__store.existing, list(unique_docs.keys())):
+            del unique_docs[doc_id]
+        if not unique_docs:
+            return ids
+
+        new_ids = list(unique_docs.keys())
+        batch_size = self.__properties.batch_size
+        semaphore = asyncio.Semaphore(self.__properties.push_concurrency)
+
+        async def embed_batch(batch_ids: List[str]) -> np.ndarray:
+            async with semaphore:
+                return await self.__embed([unique_docs[doc_id][0] for doc_id in batch_ids])
+
+        batches = [new_ids[i:i + batch_size] for i in range(0, len(new_ids), batch_size)]
+        vectors = await asyncio.gather(*(embed_batch(batch_ids) for batch_ids in batches))
+        fresh = set(new_ids) - await self._run_store(self.__store.existing, new_ids)
+        rows = [index for index, doc_id in enumerate(new_ids) if doc_id in fresh]
+        if rows:
+            matrix = np.vstack(vectors)[rows]
+            await self._run_store(
+                self.__store.add,
+                [new_ids[row] for row in rows],
+                matrix,
+                [unique_docs[new_ids[row]][0] for row in rows],
+                [unique_docs[new_ids[row]][1] for row in rows]
+            )
+            await self.__rebuild_index()
+        LOG.debug(f'{type(self).__name__} :: Documents pushed successfully, {len(rows)} new.')
+        return ids
+
+    async def __rebuild_index(self):
+        """
+        Rebuild the store's index in a worker thread if it is due, the store serving queries meanwhile.
+        """
+        build = self.__store.prepare_index()
+        if not build:
+            return
+        index = None
+        try:
+            index = await asyncio.to_thread(build)
+        except Exception as e:
+            LOG.warning(f'{type(self).__name__} :: Failed to rebuild the index of collection '
+                        f'\'{self.__collection_name}\': {str(e)}')
+        finally:
+            self.__store.install_index(index)
+
+    async def delete(self, ids: List[str]):
+        """
+        Delete documents from the collection by their Ids.
+
+        :param ids: The Ids of the documents to delete.
+        """
+        if ids:
+            await self._run_store(self.__store.remove, ids)
+
+    def embedding_cache_stats(self) -> Dict[str, float]:
+        """
+        Get the embedding cache's hit and miss counters, its hit rate and sizes.
+
+        :returns: Cache stats, or an empty dictionary if the cache is not enabled.
+        """
+        return self.__embedding_function.stats() if self.__embedding_function else {}
+
+    def version(self) -> int:
+        """
+        Get the collection version, bumped by every push and delete that changes the collection.
+
+        The version is kept by the collection's store, on disk for persistent stores, so it survives restarts.
+
+        :returns: The current collection version.
+        """
+        return self.__store.version() if self.__store else 0
+
+    async def retrieve(self, query: str, k: int = 10, where: Optional[Dict[str, Any]] = None,
+                       include: Optional[List[str]] = None) -> dict:
+        """
+        Retrieve the top-k documents most similar to the given query.
+
+        :param query: The query text to search for in the collection.
+        :param k: The number of top results to retrieve. Defaults to 10.
+        :param where: Optional metadata filter, see `matches_where`, applied before the top-k are selected.
+        :param include: The fields to return among 'documents', 'metadatas' and 'distances', all if None.
+
+        :returns: A dictionary of the Ids, and the included documents, metadata and cosine distances of the
+                  results, nested per query like ChromaDB results.
+        """
+        if not query:
+            raise ValueError(f'{type(self).__name__} :: Query string is empty.')
+
+        include = include if include is not None else ['documents', 'metadatas', 'distances']
+        query_vector = (await self.__embed([query]))[0]
+        results = await self._run_store(self.__store.search, query_vector, k, where)
+        ids = [doc_id for doc_id, _ in results]
+        documents, metadata_list = await self._run_store(self.__store.get, ids) \
+            if 'documents' in include or 'metadatas' in include else (None, None)
+        LOG.debug(f'{type(self).__name__} :: Retrieved {len(ids)} results.')
+        return {
+            'ids': [ids],
+            'documents': [documents] if 'documents' in include else None,
+            'metadatas': [metadata_list] if 'metadatas' in include else None,
+            'distances': [[1.0 - score for _, score in results]] if 'distances' in include else None
+        }
+
+    async def destroy(self):
+        """
+        Delete the collection along with its contents.
+        """
+        if self.__store is None:
+            LOG.warning(f'{type(self).__name__} :: No collection \'{self.__collection_name}\' exists to delete.')
+        else:
+            LOG.info(f'{type(self).__name__} :: Deleting collection \'{self.__collection_name}\' with '
+                     f'{await self._run_store(self.__store.count)} documents.')
+            await self._drop_store(self.__store)
+            self.__store = None
+        await self.close()
+
+    async def close(self):
+        """
+        Release the embedding client, keeping the collection and its documents.
+        """
+        self.__store = None
+        self.__embedding_function = None
+        if self.__ai_client:
+            await self.__ai_client.destroy()
+            self.__ai_client = None
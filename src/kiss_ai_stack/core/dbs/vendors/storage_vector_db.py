@@ -0,0 +1,62 @@
+import asyncio
+import os
+import shutil
+import threading
+from typing import Callable, Dict, TypeVar
+
+from kiss_ai_stack.core.dbs.stores.mmap_vector_store import MmapVectorStore
+from kiss_ai_stack.core.dbs.vector_store_abc import VectorStoreAbc
+from kiss_ai_stack.core.dbs.vendors.local_vector_db import LocalVectorDB
+from kiss_ai_stack.core.models.config.vdb_props import VectorDBProperties
+
+T = TypeVar('T')
+
+
+class StorageVectorDB(LocalVectorDB):
+    """
+    Native vector database persisting collections on local storage, under the configured `path`.
+
+    Each collection is a memory-mapped vector file with a SQLite sidecar, in its own directory per tenant.
+    Stores are shared process-wide by directory, and can be read by other processes concurrently. Store calls
+    write and fsync files and scan the vectors, so they run in worker threads, off the event loop.
+    """
+
+    __stores: Dict[str, MmapVectorStore] = {}
+    __lock = threading.Lock()
+
+    def __init__(self, collection_name: str, properties: VectorDBProperties):
+        """
+        Initialize the storage vector database.
+
+        :param collection_name: The name of the collection to be created or accessed.
+        :param properties: Configuration properties of the vector database, `path` is required.
+        """
+        if not properties.path:
+            raise ValueError('StorageVectorDB :: A \'path\' is required for the \'storage\' kind.')
+        super().__init__(collection_name, properties)
+
+    def __directory(self) -> str:
+        return os.path.abspath(
+            os.path.join(self.properties().path, self.tenant() or 'default_tenant', self.collection_name())
+        )
+
+    async def _open_store(self) -> VectorStoreAbc:
+        directory = self.__directory()
+        with StorageVectorDB.__lock:
+            store = StorageVectorDB.__stores.get(directory)
+        if store is None:
+            store = await asyncio.to_thread(MmapVectorStore, directory)
+            with StorageVectorDB.__lock:
+                store = StorageVectorDB.__stores.setdefault(directory, store)
+        return store
+
+    async def _drop_store(self, store: VectorStoreAbc):
+        directory = self.__directory()
+        with StorageVectorDB.__lock:
+            if StorageVectorDB.__stores.get(directory) is store:
+                del StorageVectorDB.__stores[directory]
+        store.close()
+        await asyncio.to_thread(shutil.rmtree, directory, True)
+
+    async def _run_store(self, function: Callable[..., T], *args) -> T:
+        return await asyncio.to_thread(function, *args)
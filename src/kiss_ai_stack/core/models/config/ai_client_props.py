@@ -1,5 +1,8 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
+from kiss_ai_stack.core.models.config.rate_limit_props import RateLimitProperties
 from kiss_ai_stack.core.models.enums.ai_client_vendor import AIClientVendor
 
 
@@ -7,6 +10,12 @@ class AIClientProperties(BaseModel):
     provider: AIClientVendor
     model: str
     api_key: str
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 30.0
+    embedding_batch_size: Optional[int] = 64
+    embedding_batch_window_ms: Optional[float] = 5.0
+    rate_limit: Optional[RateLimitProperties] = None
 
     class Config:
         str_min_length = 1
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from kiss_ai_stack.core.models.enums.cache_scope import CacheScope
+
+
+class ClassificationCacheProperties(BaseModel):
+    enabled: Optional[bool] = True
+    scope: Optional[CacheScope] = CacheScope.STACK
+    max_size: Optional[int] = 1024
+    ttl_seconds: Optional[float] = 300.0
+    similarity_threshold: Optional[float] = None
+
+    class Config:
+        str_min_length = 1
+        str_strip_whitespace = True
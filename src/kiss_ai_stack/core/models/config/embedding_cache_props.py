@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class EmbeddingCacheProperties(BaseModel):
+    enabled: Optional[bool] = True
+    path: Optional[str] = None
+    max_size: Optional[int] = 10000
+
+    class Config:
+        str_min_length = 1
+        str_strip_whitespace = True
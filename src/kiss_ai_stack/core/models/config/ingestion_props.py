@@ -0,0 +1,41 @@
+from typing import Optional
+
+from pydantic import BaseModel, field_validator
+
+
+class IngestionProperties(BaseModel):
+    parse_concurrency: Optional[int] = 4
+    route_concurrency: Optional[int] = 4
+    push_concurrency: Optional[int] = 2
+    queue_size: Optional[int] = 8
+    push_batch_size: Optional[int] = 64
+    parse_processes: Optional[int] = 0
+    parse_process_max_tasks: Optional[int] = 32
+    parse_process_max_memory_mb: Optional[int] = None
+    incremental: Optional[bool] = True
+    manifest_path: Optional[str] = None
+
+    @field_validator(
+        'parse_concurrency', 'route_concurrency', 'push_concurrency', 'queue_size', 'push_batch_size',
+        'parse_process_max_tasks', mode='before'
+    )
+    @classmethod
+    def validate_positive(cls, value, info):
+        if value is None:
+            return cls.model_fields[info.field_name].default
+        if int(value) < 1:
+            raise ValueError(f'{info.field_name} must be at least 1')
+        return value
+
+    @field_validator('parse_processes', mode='before')
+    @classmethod
+    def validate_parse_processes(cls, value):
+        if value is None:
+            return 0
+        if int(value) < 0:
+            raise ValueError('parse_processes must not be negative')
+        return value
+
+    class Config:
+        str_min_length = 1
+        str_strip_whitespace = True
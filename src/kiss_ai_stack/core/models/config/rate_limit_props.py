@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RateLimitProperties(BaseModel):
+    enabled: Optional[bool] = True
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    completion_tokens: Optional[int] = 500
+    max_retries: Optional[int] = 5
+    base_delay: Optional[float] = 0.5
+    max_delay: Optional[float] = 30.0
+
+    class Config:
+        str_min_length = 1
+        str_strip_whitespace = True
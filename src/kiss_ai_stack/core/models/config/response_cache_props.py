@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from kiss_ai_stack.core.models.enums.cache_backend import ResponseCacheBackend
+
+
+class ResponseCacheProperties(BaseModel):
+    backend: Optional[ResponseCacheBackend] = ResponseCacheBackend.MEMORY
+    max_size: Optional[int] = 1024
+    ttl_seconds: Optional[float] = None
+    path: Optional[str] = None
+
+    class Config:
+        str_min_length = 1
+        str_strip_whitespace = True
@@ -0,0 +1,12 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RouterProperties(BaseModel):
+    enabled: Optional[bool] = True
+    margin_threshold: Optional[float] = 0.05
+
+    class Config:
+        str_min_length = 1
+        str_strip_whitespace = True
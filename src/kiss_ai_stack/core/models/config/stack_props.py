@@ -1,7 +1,10 @@
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
+from kiss_ai_stack.core.models.config.classification_cache_props import ClassificationCacheProperties
+from kiss_ai_stack.core.models.config.ingestion_props import IngestionProperties
+from kiss_ai_stack.core.models.config.router_props import RouterProperties
 from kiss_ai_stack.core.models.config.vdb_props import VectorDBProperties
 from kiss_ai_stack.core.models.config.tool_props import ToolProperties
 
@@ -10,6 +13,22 @@ class StackProperties(BaseModel):
     decision_maker: ToolProperties
     tools: List[ToolProperties]
     vector_db: VectorDBProperties
+    router: Optional[RouterProperties] = None
+    classification_cache: Optional[ClassificationCacheProperties] = None
+    tool_concurrency: Optional[int] = 4
+    speculative_retrieval: Optional[bool] = False
+    bulk_classification_size: Optional[int] = 20
+    bulk_classification_tokens: Optional[int] = 4000
+    ingestion: Optional[IngestionProperties] = IngestionProperties()
+
+    @field_validator('tool_concurrency', 'bulk_classification_size', 'bulk_classification_tokens', mode='before')
+    @classmethod
+    def validate_positive(cls, value, info):
+        if value is None:
+            return cls.model_fields[info.field_name].default
+        if int(value) < 1:
+            raise ValueError(f'{info.field_name} must be at least 1')
+        return value
 
     class Config:
         str_min_length = 1
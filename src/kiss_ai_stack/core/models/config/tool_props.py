@@ -3,6 +3,8 @@ from typing import Optional
 from pydantic import BaseModel
 
 from kiss_ai_stack.core.models.config.ai_client_props import AIClientProperties
+from kiss_ai_stack.core.models.config.response_cache_props import ResponseCacheProperties
+from kiss_ai_stack.core.models.config.vector_index_props import VectorIndexProperties
 from kiss_ai_stack.core.models.enums.tool_kind import ToolKind
 
 
@@ -13,6 +15,10 @@ class ToolProperties(BaseModel):
     ai_client: AIClientProperties
     embeddings: Optional[str] = None
     depth: Optional[int] = 2
+    context_token_budget: Optional[int] = None
+    temperature: Optional[float] = 0.7
+    cache: Optional[ResponseCacheProperties] = None
+    index: Optional[VectorIndexProperties] = None
 
     class Config:
         str_min_length = 1
@@ -2,6 +2,8 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from kiss_ai_stack.core.models.config.embedding_cache_props import EmbeddingCacheProperties
+from kiss_ai_stack.core.models.config.vector_index_props import VectorIndexProperties
 from kiss_ai_stack.core.models.enums.db_kind import VectorDBKind
 
 
@@ -9,9 +11,14 @@ class VectorDBProperties(BaseModel):
     provider: str
     kind: VectorDBKind
     path: Optional[str] = None
-    host: Optional[str]
-    port: Optional[int]
+    host: Optional[str] = None
+    port: Optional[int] = None
     secure: Optional[bool] = True
+    batch_size: Optional[int] = 256
+    push_concurrency: Optional[int] = 4
+    max_retries: Optional[int] = 3
+    embedding_cache: Optional[EmbeddingCacheProperties] = None
+    index: Optional[VectorIndexProperties] = None
 
     class Config:
         str_min_length = 1
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from kiss_ai_stack.core.models.enums.vector_index_kind import VectorIndexKind
+from kiss_ai_stack.core.models.enums.vector_quantization import VectorQuantization
+
+
+class VectorIndexProperties(BaseModel):
+    kind: Optional[VectorIndexKind] = VectorIndexKind.FLAT
+    nlist: Optional[int] = None
+    nprobe: Optional[int] = 8
+    quantization: Optional[VectorQuantization] = VectorQuantization.INT8
+    train_size: Optional[int] = None
+
+    class Config:
+        str_min_length = 1
+        str_strip_whitespace = True
@@ -0,0 +1,21 @@
+from typing import Optional, Union, Dict, List
+
+from kiss_ai_stack.core.models.core.rag_response import ToolResponse
+
+
+class BatchAnswer:
+    """
+    Outcome of one query of a batch: its tool response, or the error that failed it.
+    """
+
+    def __init__(
+            self,
+            query: Union[str, Dict, List],
+            tool_name: Optional[str] = None,
+            response: Optional[ToolResponse] = None,
+            error: Optional[str] = None
+    ):
+        self.query = query
+        self.tool_name = tool_name
+        self.response = response
+        self.error = error
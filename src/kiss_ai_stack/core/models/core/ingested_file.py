@@ -0,0 +1,25 @@
+from typing import List, Optional
+
+
+class IngestedFile:
+    """
+    Ingestion manifest record of a file stored in a stack's collection.
+    """
+
+    def __init__(
+            self,
+            file_path: str,
+            size: int,
+            mtime: float,
+            content_hash: Optional[str] = None,
+            metadata_hash: Optional[str] = None,
+            tool_name: Optional[str] = None,
+            document_ids: Optional[List[str]] = None
+    ):
+        self.file_path = file_path
+        self.size = size
+        self.mtime = mtime
+        self.content_hash = content_hash
+        self.metadata_hash = metadata_hash
+        self.tool_name = tool_name
+        self.document_ids = document_ids or []
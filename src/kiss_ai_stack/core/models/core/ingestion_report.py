@@ -0,0 +1,21 @@
+from typing import Dict, List, Optional
+
+
+class IngestionReport:
+    """
+    Outcome of storing a batch of files: the stored document IDs per tool, the failed files and the file counts.
+    """
+
+    def __init__(
+            self,
+            documents: Optional[Dict[str, List[str]]] = None,
+            errors: Optional[Dict[str, str]] = None,
+            skipped: int = 0,
+            added: int = 0,
+            replaced: int = 0
+    ):
+        self.documents = documents or {}
+        self.errors = errors or {}
+        self.skipped = skipped
+        self.added = added
+        self.replaced = replaced
@@ -1,7 +1,8 @@
 class ToolResponse:
 
-    def __init__(self, answer, docs=None, metadata=None, distances=None):
+    def __init__(self, answer, docs=None, metadata=None, distances=None, cached=False):
         self.answer = answer
         self.supporting_documents = docs
         self.metadata = metadata
         self.distances = distances
+        self.cached = cached
@@ -0,0 +1,21 @@
+from typing import Dict, Optional
+
+from kiss_ai_stack.core.models.enums.routing_path import RoutingPath
+
+
+class RoutingDecision:
+    """
+    Outcome of routing a query to a tool, including which path made the decision.
+    """
+
+    def __init__(
+            self,
+            tool_name: Optional[str] = None,
+            path: RoutingPath = RoutingPath.LLM,
+            margin: float = 0.0,
+            scores: Optional[Dict[str, float]] = None
+    ):
+        self.tool_name = tool_name
+        self.path = path
+        self.margin = margin
+        self.scores = scores or {}
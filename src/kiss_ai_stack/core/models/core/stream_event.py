@@ -0,0 +1,20 @@
+from typing import Optional
+
+from kiss_ai_stack.core.models.core.rag_response import ToolResponse
+from kiss_ai_stack.core.models.enums.stream_event_kind import StreamEventKind
+
+
+class StreamEvent:
+    """
+    An event of a streamed answer: a generated token, or the final event carrying the complete response.
+    """
+
+    def __init__(
+            self,
+            kind: StreamEventKind,
+            token: Optional[str] = None,
+            response: Optional[ToolResponse] = None
+    ):
+        self.kind = kind
+        self.token = token
+        self.response = response
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class ResponseCacheBackend(StrEnum):
+    MEMORY = 'memory'
+    SQLITE = 'sqlite'
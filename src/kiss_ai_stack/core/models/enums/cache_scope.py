@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class CacheScope(StrEnum):
+    STACK = 'stack'
+    PROCESS = 'process'
@@ -3,3 +3,4 @@ from enum import StrEnum
 
 class VectorDBVendor(StrEnum):
     CHROMA = 'chroma'
+    NATIVE = 'native'
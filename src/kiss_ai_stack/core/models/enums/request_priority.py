@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class RequestPriority(StrEnum):
+    INTERACTIVE = 'interactive'
+    BULK = 'bulk'
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class RoutingPath(StrEnum):
+    VECTOR = 'vector'
+    LLM = 'llm'
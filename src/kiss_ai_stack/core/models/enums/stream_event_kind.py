@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class StreamEventKind(StrEnum):
+    TOKEN = 'token'
+    FINAL = 'final'
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class VectorIndexKind(StrEnum):
+    FLAT = 'flat'
+    IVF = 'ivf'
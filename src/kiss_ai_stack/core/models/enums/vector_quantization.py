@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class VectorQuantization(StrEnum):
+    NONE = 'none'
+    INT8 = 'int8'
@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from kiss_ai_stack.core.models.config.classification_cache_props import ClassificationCacheProperties
+from kiss_ai_stack.core.models.enums.cache_scope import CacheScope
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class ClassificationCache:
+    """
+    Bounded LRU cache for query classification results with TTL based expiry.
+
+    Entries are keyed by the stack's tool set fingerprint, the classification scope and the normalized query,
+    so a changed tool set never serves stale classifications. Lookups match exactly on the normalized query,
+    and optionally by cosine similarity of query embeddings above a configured threshold.
+    """
+
+    __shared: Dict[Tuple[int, float, Optional[float]], 'ClassificationCache'] = {}
+    __shared_lock = threading.Lock()
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0, similarity_threshold: Optional[float] = None):
+        """
+        Initialize an empty classification cache.
+
+        :param max_size: Maximum number of cached classifications.
+        :param ttl_seconds: Time to live of each entry in seconds.
+        :param similarity_threshold: Minimum cosine similarity for a similarity match, disabled if None.
+        """
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__similarity_threshold = similarity_threshold
+        self.__entries: OrderedDict[Tuple[str, str, str], Tuple[Any, float, Optional[np.ndarray]]] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__similar_hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @classmethod
+    def from_properties(cls, properties: ClassificationCacheProperties) -> 'ClassificationCache':
+        """
+        Create a per-stack cache, or get the process-wide cache, based on the configured scope.
+
+        Process-wide caches are shared by the stacks configuring the same size, TTL and similarity threshold.
+
+        :param properties: Classification cache configurations object loaded from Yaml file.
+        :returns: A classification cache instance.
+        """
+        if properties.scope == CacheScope.PROCESS:
+            key = (properties.max_size, properties.ttl_seconds, properties.similarity_threshold)
+            with cls.__shared_lock:
+                if key not in cls.__shared:
+                    cls.__shared[key] = cls(
+                        max_size=properties.max_size,
+                        ttl_seconds=properties.ttl_seconds,
+                        similarity_threshold=properties.similarity_threshold
+                    )
+                return cls.__shared[key]
+        return cls(
+            max_size=properties.max_size,
+            ttl_seconds=properties.ttl_seconds,
+            similarity_threshold=properties.similarity_threshold
+        )
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Normalize a query for exact matching, ignoring case and whitespace differences.
+        """
+        return ' '.join(query.lower().split())
+
+    def similarity_enabled(self) -> bool:
+        """
+        Whether lookups by embedding similarity are enabled.
+        """
+        return self.__similarity_threshold is not None
+
+    def __evict_expired(self, now: float):
+        expired = [key for key, (_, expires_at, _) in self.__entries.items() if expires_at <= now]
+        for key in expired:
+            del self.__entries[key]
+        self.__evictions += len(expired)
+
+    def get(self, fingerprint: str, scope: str, query: str) -> Optional[Any]:
+        """
+        Look up a classification by exact match on the normalized query.
+
+        :param fingerprint: Fingerprint of the stack's tool set.
+        :param scope: Classification scope, e.g. classification type and RAG filtering.
+        :param query: The normalized query.
+        :returns: The cached classification, or None on a miss.
+        """
+        key = (fingerprint, scope, self.normalize_query(query))
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return entry[0]
+            if entry:
+                del self.__entries[key]
+                self.__evictions += 1
+            if not self.similarity_enabled():
+                self.__misses += 1
+            return None
+
+    def get_similar(self, fingerprint: str, scope: str, embedding: np.ndarray) -> Optional[Any]:
+        """
+        Look up a classification by cosine similarity of the query embedding.
+
+        :param fingerprint: Fingerprint of the stack's tool set.
+        :param scope: Classification scope, e.g. classification type and RAG filtering.
+        :param embedding: Embedding of the normalized query.
+        :returns: The most similar cached classification above the threshold, or None on a miss.
+        """
+        with self.__lock:
+            self.__evict_expired(time.monotonic())
+            keys = [
+                key for key, (_, _, cached_embedding) in self.__entries.items()
+                if key[0] == fingerprint and key[1] == scope and cached_embedding is not None
+            ]
+            if keys:
+                query_vector = np.asarray(embedding, dtype=np.float32)
+                query_vector = query_vector / (np.linalg.norm(query_vector) or 1.0)
+                similarities = np.vstack([self.__entries[key][2] for key in keys]) @ query_vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.__similarity_threshold:
+                    self.__entries.move_to_end(keys[best])
+                    self.__similar_hits += 1
+                    return self.__entries[keys[best]][0]
+            self.__misses += 1
+            return None
+
+    def put(self, fingerprint: str, scope: str, query: str, value: Any, embedding: Optional[np.ndarray] = None):
+        """
+        Cache a classification, evicting the least recently used entries beyond the size bound.
+
+        :param fingerprint: Fingerprint of the stack's tool set.
+        :param scope: Classification scope, e.g. classification type and RAG filtering.
+        :param query: The normalized query.
+        :param value: The classification to cache.
+        :param embedding: Optional embedding of the query, for similarity lookups.
+        """
+        if embedding is not None:
+            embedding = np.asarray(embedding, dtype=np.float32)
+            embedding = embedding / (np.linalg.norm(embedding) or 1.0)
+        key = (fingerprint, scope, self.normalize_query(query))
+        with self.__lock:
+            self.__entries[key] = (value, time.monotonic() + self.__ttl_seconds, embedding)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def invalidate(self, fingerprint: Optional[str] = None):
+        """
+        Drop cached classifications.
+
+        :param fingerprint: Only drop entries of this tool set fingerprint, or everything if None.
+        """
+        with self.__lock:
+            if fingerprint is None:
+                self.__entries.clear()
+            else:
+                for key in [key for key in self.__entries if key[0] == fingerprint]:
+                    del self.__entries[key]
+        LOG.debug('ClassificationCache :: Invalidated')
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache hit, miss and eviction counters along with the current size.
+        """
+        with self.__lock:
+            return {
+                'hits': self.__hits,
+                'similar_hits': self.__similar_hits,
+                'misses': self.__misses,
+                'evictions': self.__evictions,
+                'size': len(self.__entries)
+            }
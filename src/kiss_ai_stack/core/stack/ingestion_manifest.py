@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+from kiss_ai_stack.core.models.config.ingestion_props import IngestionProperties
+from kiss_ai_stack.core.models.core.ingested_file import IngestedFile
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class IngestionManifest:
+    """
+    SQLite backed manifest of the files ingested into each stack's collections.
+
+    Each file is recorded with its size, modification time, content hash and the Ids of its stored chunks, so
+    re-sending an unchanged file can be skipped before it is parsed or embedded, and a changed file can have
+    only its own chunks replaced.
+    """
+
+    __shared: Dict[str, 'IngestionManifest'] = {}
+    __shared_lock = threading.Lock()
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Open or create the manifest database.
+
+        :param path: The path of the SQLite database file, kept in memory if ':memory:'.
+        """
+        self.__lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS ingested_files ('
+            'stack_id TEXT NOT NULL, file_path TEXT NOT NULL, size INTEGER NOT NULL, mtime REAL NOT NULL, '
+            'content_hash TEXT, metadata_hash TEXT, tool_name TEXT, document_ids TEXT NOT NULL, '
+            'PRIMARY KEY (stack_id, file_path))'
+        )
+        self.__connection.commit()
+        LOG.debug(f'IngestionManifest :: initialized at {path}')
+
+    @classmethod
+    def from_properties(cls, properties: IngestionProperties, temporary: bool) -> 'IngestionManifest':
+        """
+        Create an in-memory manifest for a temporary stack, or get the shared on-disk manifest otherwise.
+
+        :param properties: Ingestion configurations object loaded from Yaml file.
+        :param temporary: Whether the stack's documents are discarded with the stack.
+        :returns: An ingestion manifest instance.
+        """
+        if temporary:
+            return cls()
+        path = properties.manifest_path or os.path.join(os.getcwd(), '.kiss_ai_stack', 'ingestion_manifest.db')
+        with cls.__shared_lock:
+            if path not in cls.__shared:
+                cls.__shared[path] = cls(path)
+            return cls.__shared[path]
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        Hash a file's content, reading it in blocks.
+
+        :param file_path: The path of the file.
+        :returns: The sha256 hex digest of the file's content.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            while block := file.read(1024 * 1024):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_metadata(metadata: Optional[Dict[str, Any]]) -> str:
+        """
+        Hash the user metadata stored along with a file's chunks.
+
+        :param metadata: The optional metadata.
+        :returns: The sha256 hex digest of the metadata.
+        """
+        return hashlib.sha256(json.dumps(metadata or {}, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def __get(self, stack_id: str, file_path: str) -> Optional[IngestedFile]:
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT size, mtime, content_hash, metadata_hash, tool_name, document_ids FROM ingested_files '
+                'WHERE stack_id = ? AND file_path = ?', (stack_id, file_path)
+            ).fetchone()
+        if not row:
+            return None
+        return IngestedFile(
+            file_path=file_path,
+            size=row[0],
+            mtime=row[1],
+            content_hash=row[2],
+            metadata_hash=row[3],
+            tool_name=row[4],
+            document_ids=json.loads(row[5])
+        )
+
+    def __put(self, stack_id: str, record: IngestedFile):
+        with self.__lock:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO ingested_files (stack_id, file_path, size, mtime, content_hash, '
+                'metadata_hash, tool_name, document_ids) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (stack_id, record.file_path, record.size, record.mtime, record.content_hash, record.metadata_hash,
+                 record.tool_name, json.dumps(record.document_ids))
+            )
+            self.__connection.commit()
+
+    def __forget(self, stack_id: str):
+        with self.__lock:
+            cursor = self.__connection.execute('DELETE FROM ingested_files WHERE stack_id = ?', (stack_id,))
+            self.__connection.commit()
+        LOG.debug(f'IngestionManifest :: Forgot {cursor.rowcount} files of stack \'{stack_id}\'')
+
+    async def get(self, stack_id: str, file_path: str) -> Optional[IngestedFile]:
+        """
+        Get the manifest record of a file.
+
+        :param stack_id: The stack the file was ingested into.
+        :param file_path: The path of the file.
+        :returns: The file's record, or None if it was never ingested.
+        """
+        return await asyncio.to_thread(self.__get, stack_id, file_path)
+
+    async def put(self, stack_id: str, record: IngestedFile):
+        """
+        Record a successfully ingested file, replacing its previous record.
+
+        :param stack_id: The stack the file was ingested into.
+        :param record: The file's record.
+        """
+        await asyncio.to_thread(self.__put, stack_id, record)
+
+    async def forget(self, stack_id: str):
+        """
+        Drop every record of a stack, e.g. when its collections are deleted.
+
+        :param stack_id: The stack to forget.
+        """
+        await asyncio.to_thread(self.__forget, stack_id)
@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional, Iterable
+
+import numpy as np
+
+from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
+from kiss_ai_stack.core.models.config.router_props import RouterProperties
+from kiss_ai_stack.core.models.core.routing_decision import RoutingDecision
+from kiss_ai_stack.core.models.enums.routing_path import RoutingPath
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class SemanticRouter:
+    """
+    Embedding based tool router.
+
+    Tool roles are embedded once and incoming queries are scored against them with cosine similarity.
+    A decision is taken on the vector path only when the margin between the best and the second-best
+    tool reaches the configured threshold, otherwise the decision is left to the LLM decision maker.
+    """
+
+    def __init__(self, properties: RouterProperties):
+        """
+        Initialize the router with empty role vectors.
+
+        :param properties: Router configurations object loaded from Yaml file.
+        """
+        self.__properties = properties
+        self.__tool_names: List[str] = []
+        self.__role_vectors: Optional[np.ndarray] = None
+        self.__decisions: Dict[str, int] = {path.value: 0 for path in RoutingPath}
+        self.__last_decision: Optional[RoutingDecision] = None
+
+    @staticmethod
+    def __normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def is_ready(self) -> bool:
+        """
+        Whether the tool roles have been embedded.
+        """
+        return self.__role_vectors is not None
+
+    async def index(self, ai_client: AIClientAbc, tool_roles: Dict[str, str]):
+        """
+        Embed each tool role once, to be reused for every routed query.
+
+        :param ai_client: The AI client used to embed tool roles.
+        :param tool_roles: Tool names mapped to their roles.
+        """
+        LOG.info(f'SemanticRouter :: Embedding {len(tool_roles)} tool roles')
+        embeddings = await ai_client.embed_texts(list(tool_roles.values()))
+        self.__tool_names = list(tool_roles.keys())
+        self.__role_vectors = self.__normalize(np.asarray(embeddings, dtype=np.float32))
+        LOG.debug('SemanticRouter :: Tool roles embedded')
+
+    def route(self, query_embedding: np.ndarray, candidates: Optional[Iterable[str]] = None) -> RoutingDecision:
+        """
+        Score the query embedding against the tool role vectors.
+
+        :param query_embedding: Embedding of the normalized query.
+        :param candidates: Optional subset of tool names to consider, e.g. RAG tools only.
+        :returns: A vector path decision when the top-1/top-2 margin is wide enough,
+                  otherwise an LLM path decision without a tool name.
+        """
+        if not self.is_ready():
+            raise RuntimeError('SemanticRouter :: Tool roles have not been indexed.')
+
+        allowed = set(candidates) if candidates is not None else set(self.__tool_names)
+        rows = [i for i, name in enumerate(self.__tool_names) if name in allowed]
+        if not rows:
+            raise ValueError('SemanticRouter :: No candidate tools to route to.')
+
+        query_vector = self.__normalize(np.asarray(query_embedding, dtype=np.float32))
+        similarities = self.__role_vectors[rows] @ query_vector
+        scores = {self.__tool_names[row]: float(score) for row, score in zip(rows, similarities)}
+
+        order = np.argsort(similarities)[::-1]
+        best = self.__tool_names[rows[order[0]]]
+        margin = float(similarities[order[0]] - similarities[order[1]]) if len(order) > 1 else float('inf')
+
+        if margin >= self.__properties.margin_threshold:
+            return RoutingDecision(tool_name=best, path=RoutingPath.VECTOR, margin=margin, scores=scores)
+        return RoutingDecision(tool_name=None, path=RoutingPath.LLM, margin=margin, scores=scores)
+
+    def record(self, decision: RoutingDecision):
+        """
+        Record a final routing decision for reporting.
+
+        :param decision: The decision that selected the tool.
+        """
+        self.__decisions[decision.path.value] += 1
+        self.__last_decision = decision
+        LOG.info(
+            f'SemanticRouter :: Routed to {decision.tool_name} via {decision.path} path, margin: {decision.margin:.4f}')
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Routing decision counters per path along with the last decision's margin, to tune the threshold.
+        """
+        return {
+            **self.__decisions,
+            'margin_threshold': self.__properties.margin_threshold,
+            'last_path': self.__last_decision.path.value if self.__last_decision else None,
+            'last_margin': self.__last_decision.margin if self.__last_decision else None
+        }
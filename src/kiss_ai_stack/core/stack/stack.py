@@ -1,16 +1,35 @@
+import asyncio
+import hashlib
+import json
 import os
-from typing import Dict, List, Union, Optional, Any
+import time
+from typing import Dict, List, Union, Optional, Any, AsyncIterator, Awaitable, Tuple
+
+import numpy as np
 
 from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
 from kiss_ai_stack.core.ai_clients.ai_client_factory import AIClientFactory
+from kiss_ai_stack.core.ai_clients.request_scheduler import RequestScheduler
 from kiss_ai_stack.core.config.stack_properties import stack_properties
+from kiss_ai_stack.core.dbs.document_ids import document_ids
 from kiss_ai_stack.core.models.config.stack_props import StackProperties
+from kiss_ai_stack.core.models.core.batch_answer import BatchAnswer
+from kiss_ai_stack.core.models.core.ingested_file import IngestedFile
+from kiss_ai_stack.core.models.core.ingestion_report import IngestionReport
 from kiss_ai_stack.core.models.core.query_classification_response import QueryClassificationResponse
 from kiss_ai_stack.core.models.core.rag_response import ToolResponse
+from kiss_ai_stack.core.models.core.routing_decision import RoutingDecision
+from kiss_ai_stack.core.models.core.stream_event import StreamEvent
+from kiss_ai_stack.core.models.enums.request_priority import RequestPriority
+from kiss_ai_stack.core.models.enums.routing_path import RoutingPath
 from kiss_ai_stack.core.models.enums.tool_kind import ToolKind
+from kiss_ai_stack.core.stack.classification_cache import ClassificationCache
+from kiss_ai_stack.core.stack.ingestion_manifest import IngestionManifest
+from kiss_ai_stack.core.stack.semantic_router import SemanticRouter
 from kiss_ai_stack.core.tools.tool import Tool
 from kiss_ai_stack.core.tools.tool_builder import ToolBuilder
-from kiss_ai_stack.core.utilities.document_utils import file_to_docs
+from kiss_ai_stack.core.utilities.document_parser import DocumentParser
+from kiss_ai_stack.core.utilities.document_utils import file_to_docs, file_to_doc_batches, get_encoding
 from kiss_ai_stack.core.utilities.logger import LOG
 from pydantic import BaseModel
 
@@ -33,6 +52,16 @@ class Stack:
         self.__decision_maker: AIClientAbc | None = None
         self.__tool_roles: Dict[str, str] = {}
         self.__tools: Dict[str, Tool] = {}
+        self.__router: SemanticRouter | None = None
+        self.__classification_cache: ClassificationCache | None = None
+        self.__tool_set_fingerprint: str | None = None
+        self.__tool_timings: Dict[str, float] = {}
+        self.__speculation_stats: Dict[str, float] = {
+            'queries': 0, 'cancelled': 0, 'saved_seconds': 0.0, 'last_saved_seconds': 0.0
+        }
+        self.__tool_concurrency: int = 4
+        self.__document_parser: DocumentParser | None = None
+        self.__ingestion_manifest: IngestionManifest | None = None
         self.__temporary_stack = temporary
         self.__initialized: bool = False
 
@@ -60,37 +89,207 @@ class Stack:
         LOG.info(f'Stack-{self.__stack_id} :: Initializing decision maker')
         if self.__stack_properties:
             self.__decision_maker = AIClientFactory.get_ai_client(
-                self.__stack_properties.decision_maker.ai_client, self.__stack_properties.decision_maker.kind)
+                self.__stack_properties.decision_maker.ai_client,
+                self.__stack_properties.decision_maker.kind,
+                embedding_model=self.__stack_properties.decision_maker.embeddings
+            )
             self.__decision_maker.initialize()
             LOG.debug(f'StackStack :: Decision maker initialized: {self.__decision_maker}')
 
     async def __initialize_tools(self):
         """
-        Initialize tools and map their roles.
+        Initialize tools concurrently, with bounded parallelism, and map their roles.
+
+        If any tool fails to build, the tools already built are destroyed before the error is raised.
         """
         LOG.info(f'Stack-{self.__stack_id} :: Initializing tools')
-        for tool_properties in self.__stack_properties.tools:
-            LOG.debug(f'Stack-{self.__stack_id} :: Initializing tool: {tool_properties.name}')
-            self.__tool_roles[tool_properties.name] = tool_properties.role
-            self.__tools[tool_properties.name] = await ToolBuilder.build_tool(
-                stack_id=self.__stack_id,
-                tool_properties=tool_properties,
-                vector_db_properties=self.__stack_properties.vector_db,
-                temporary_stack=self.__temporary_stack
+        semaphore = asyncio.Semaphore(self.__stack_properties.tool_concurrency)
+
+        async def build_tool(tool_properties):
+            async with semaphore:
+                LOG.debug(f'Stack-{self.__stack_id} :: Initializing tool: {tool_properties.name}')
+                started_at = time.perf_counter()
+                tool = await ToolBuilder.build_tool(
+                    stack_id=self.__stack_id,
+                    tool_properties=tool_properties,
+                    vector_db_properties=self.__stack_properties.vector_db,
+                    temporary_stack=self.__temporary_stack
+                )
+                self.__tool_timings[tool_properties.name] = time.perf_counter() - started_at
+                return tool
+
+        results = await asyncio.gather(
+            *(build_tool(tool_properties) for tool_properties in self.__stack_properties.tools),
+            return_exceptions=True
+        )
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if failures:
+            LOG.error(f'Stack-{self.__stack_id} :: {len(failures)} tool(s) failed to initialize, rolling back')
+            await self.__destroy_tools(
+                tools={
+                    tool_properties.name: result
+                    for tool_properties, result in zip(self.__stack_properties.tools, results)
+                    if not isinstance(result, BaseException)
+                },
+                cleanup=self.__temporary_stack
             )
+            raise failures[0]
+
+        for tool_properties, tool in zip(self.__stack_properties.tools, results):
+            self.__tool_roles[tool_properties.name] = tool_properties.role
+            self.__tools[tool_properties.name] = tool
         LOG.debug(f'Stack-{self.__stack_id} :: Tools initialized')
 
+    async def __destroy_tools(self, tools: Dict[str, Tool], cleanup: bool = False):
+        """
+        Destroy tools concurrently, with bounded parallelism.
+
+        :param tools: Tool names mapped to the tools to destroy.
+        :param cleanup: Clean stored docs, preferably for temporary sessions.
+        """
+        semaphore = asyncio.Semaphore(self.__tool_concurrency)
+
+        async def destroy_tool(tool_name, tool):
+            async with semaphore:
+                try:
+                    LOG.debug(f'Stack-{self.__stack_id} :: Destroying tool: {tool_name}')
+                    await tool.destroy(cleanup)
+                except Exception as e:
+                    LOG.warning(f'Stack-{self.__stack_id} :: Error destroying tool {tool_name}: {str(e)}')
+
+        await asyncio.gather(*(destroy_tool(tool_name, tool) for tool_name, tool in tools.items()))
+
+    async def __initialize_router(self):
+        """
+        Initialize the semantic router by embedding tool roles, if enabled.
+        """
+        router_properties = self.__stack_properties.router
+        if router_properties and router_properties.enabled:
+            LOG.info(f'Stack-{self.__stack_id} :: Initializing semantic router')
+            self.__router = SemanticRouter(router_properties)
+            await self.__router.index(self.__decision_maker, self.__tool_roles)
+            LOG.debug(f'Stack-{self.__stack_id} :: Semantic router initialized')
+
+    def __initialize_classification_cache(self):
+        """
+        Initialize the classification cache and fingerprint the current tool set, if enabled.
+        """
+        self.__tool_set_fingerprint = hashlib.sha256('\n'.join(
+            f'{name}:{self.__tools[name].tool_kind()}:{role}' for name, role in sorted(self.__tool_roles.items())
+        ).encode('utf-8')).hexdigest()
+        cache_properties = self.__stack_properties.classification_cache
+        if cache_properties and cache_properties.enabled:
+            LOG.info(f'Stack-{self.__stack_id} :: Initializing classification cache, scope: {cache_properties.scope}')
+            self.__classification_cache = ClassificationCache.from_properties(cache_properties)
+
     async def initialize_stack(self):
         LOG.info(f'Stack-{self.__stack_id} :: Starting initialization')
         if not self.__initialized:
-            await self.__initialize_stack_properties()
-            self.__initialize_decision_maker()
-            await self.__initialize_tools()
+            try:
+                await self.__initialize_stack_properties()
+                self.__tool_concurrency = self.__stack_properties.tool_concurrency
+                self.__document_parser = DocumentParser.from_properties(self.__stack_properties.ingestion)
+                self.__ingestion_manifest = IngestionManifest.from_properties(
+                    self.__stack_properties.ingestion, self.__temporary_stack)
+                self.__initialize_decision_maker()
+                await self.__initialize_tools()
+                await self.__initialize_router()
+                self.__initialize_classification_cache()
+            except Exception:
+                LOG.error(f'Stack-{self.__stack_id} :: initialization failed, releasing resources')
+                await self.destroy_stack()
+                raise
             self.__initialized = True
             LOG.info(f'Stack-{self.__stack_id} :: initialization completed')
         else:
             LOG.warning(f'Stack-{self.__stack_id} :: has been already initialized')
 
+    def is_temporary(self) -> bool:
+        """
+        Whether the stack's documents are discarded with the stack.
+        """
+        return bool(self.__temporary_stack)
+
+    def tool_timings(self) -> Dict[str, float]:
+        """
+        Get the time taken to build each tool during initialization.
+
+        :returns: Tool names mapped to their build time in seconds.
+        """
+        return dict(self.__tool_timings)
+
+    def routing_stats(self) -> Dict[str, Any]:
+        """
+        Get the semantic router's decision counters per path (vector or LLM).
+
+        :returns: Routing stats, or an empty dictionary if the router is not enabled.
+        """
+        return self.__router.stats() if self.__router else {}
+
+    def speculation_stats(self) -> Dict[str, float]:
+        """
+        Get the speculative retrieval counters: speculated queries, cancelled retrievals, and the total and latest
+        wall-clock time saved by retrieving during classification, in seconds.
+
+        :returns: Speculative retrieval stats.
+        """
+        return dict(self.__speculation_stats)
+
+    def classification_cache_stats(self) -> Dict[str, int]:
+        """
+        Get the classification cache's hit and miss counters.
+
+        :returns: Cache stats, or an empty dictionary if the cache is not enabled.
+        """
+        return self.__classification_cache.stats() if self.__classification_cache else {}
+
+    def embedding_cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the embedding cache's hit and miss counters, its hit rate and sizes, per RAG tool. Tools sharing a
+        cache location report the same counters.
+
+        :returns: Tool names mapped to their cache stats, leaving out tools without an embedding cache.
+        """
+        return {
+            name: stats for name, tool in self.__tools.items() if (stats := tool.embedding_cache_stats())
+        }
+
+    @staticmethod
+    def __normalize_input(input_data: Union[str, Dict, List, BaseModel]) -> str:
+        """
+        Normalize a query of any supported format to text.
+        """
+        if isinstance(input_data, str):
+            return input_data
+        elif isinstance(input_data, dict):
+            return ' '.join(f'{k}: {v}' for k, v in input_data.items())
+        elif isinstance(input_data, list):
+            return ' '.join(str(item) for item in input_data)
+        elif hasattr(input_data, 'dict'):
+            return ' '.join(f'{k}: {v}' for k, v in input_data.dict().items())
+        else:
+            return str(input_data)
+
+    def __candidate_tool_roles(self, rag: bool) -> Dict[str, str]:
+        """
+        Get the roles of the tools a query can be classified into.
+
+        :param rag: If True, only consider RAG-type tools.
+        :raises ValueError: If no tools are available.
+        """
+        if rag:
+            filtered_tool_roles = {
+                name: role for name, role in self.__tool_roles.items()
+                if self.__tools[name].tool_kind() == ToolKind.RAG
+            }
+        else:
+            filtered_tool_roles = self.__tool_roles
+
+        if not filtered_tool_roles:
+            LOG.error(f'Stack-{self.__stack_id} :: No tools available after RAG filtering')
+            raise ValueError('No tools available for query classification')
+        return filtered_tool_roles
+
     async def classify_query(
             self,
             query: Union[str, Dict, List, BaseModel],
@@ -110,35 +309,63 @@ class Stack:
         LOG.debug(f'Stack-{self.__stack_id} :: Query: **** , Type: {classification_type}')
         self.__check_initialized()
 
-        def normalize_input(input_data):
-            if isinstance(input_data, str):
-                return input_data
-            elif isinstance(input_data, dict):
-                return ' '.join(f'{k}: {v}' for k, v in input_data.items())
-            elif isinstance(input_data, list):
-                return ' '.join(str(item) for item in input_data)
-            elif hasattr(input_data, 'dict'):
-                return ' '.join(f'{k}: {v}' for k, v in input_data.dict().items())
-            else:
-                return str(input_data)
-
-        normalized_query = normalize_input(query)
+        normalized_query = self.__normalize_input(query)
+        filtered_tool_roles = self.__candidate_tool_roles(rag)
+
+        cache = self.__classification_cache
+        tool_scope = 'rag' if rag else 'all'
+        cache_scope = f'{classification_type}:{tool_scope}'
+        if cache:
+            cached = cache.get(self.__tool_set_fingerprint, cache_scope, normalized_query)
+            if cached is not None:
+                LOG.debug(f'Stack-{self.__stack_id} :: Classification served from cache')
+                return cached
+
+        query_embedding = None
+        if (self.__router and classification_type == 'default') or (cache and cache.similarity_enabled()):
+            query_embedding = await self.__decision_maker.embed_text(normalized_query)
+        if cache and cache.similarity_enabled():
+            cached = cache.get_similar(self.__tool_set_fingerprint, cache_scope, query_embedding)
+            if cached is not None:
+                LOG.debug(f'Stack-{self.__stack_id} :: Similar classification served from cache')
+                return cached
+
+        result = await self.__classify(
+            query=query,
+            normalized_query=normalized_query,
+            rag=rag,
+            classification_type=classification_type,
+            tool_roles=filtered_tool_roles,
+            query_embedding=query_embedding
+        )
+        tool_name = result.tool_name if isinstance(result, QueryClassificationResponse) else result
+        if cache and tool_name in self.__tools:
+            cache.put(self.__tool_set_fingerprint, cache_scope, normalized_query, result, query_embedding)
+        return result
 
-        filtered_tool_roles = {}
-        if rag:
-            filtered_tool_roles = {
-                name: role for name, role in self.__tool_roles.items()
-                if self.__tools[name].tool_kind() == ToolKind.RAG
-            }
-        else:
-            filtered_tool_roles = self.__tool_roles
+    async def __classify(
+            self,
+            query: Union[str, Dict, List, BaseModel],
+            normalized_query: str,
+            rag: bool,
+            classification_type: str,
+            tool_roles: Dict[str, str],
+            query_embedding: Optional[np.ndarray] = None
+    ) -> Union[str, QueryClassificationResponse]:
+        """
+        Classify the normalized query with the semantic router or the decision maker.
 
-        if not filtered_tool_roles:
-            LOG.error(f'Stack-{self.__stack_id} :: No tools available after RAG filtering')
-            raise ValueError('No tools available for query classification')
+        :param query: The original input query, used for the default classification fallback.
+        :param normalized_query: The query normalized to text.
+        :param rag: If True, only RAG-type tools are being considered.
+        :param classification_type: Specifies the classification approach.
+        :param tool_roles: Candidate tool names mapped to their roles.
+        :param query_embedding: Embedding of the normalized query, required when the router is enabled.
 
+        :returns: Classified tool name or detailed classification response.
+        """
         role_definitions = '\n'.join(
-            [f'{name}: {role}' for name, role in filtered_tool_roles.items()]
+            [f'{name}: {role}' for name, role in tool_roles.items()]
         )
 
         if classification_type == 'detailed':
@@ -176,6 +403,13 @@ class Stack:
                 LOG.warning(f'Stack-{self.__stack_id} :: Default classification fallback')
                 return await self.classify_query(query, rag=rag, classification_type='default')
 
+        decision = None
+        if self.__router:
+            decision = self.__router.route(query_embedding, tool_roles.keys())
+            if decision.path == RoutingPath.VECTOR:
+                self.__router.record(decision)
+                return decision.tool_name
+
         prompt = f"""
            Classify the following input into one of the categories: {', '.join(self.__tool_roles.values())}.
 
@@ -189,48 +423,339 @@ class Stack:
         LOG.debug(f'Stack-{self.__stack_id} :: Classification prompt (default): ****')
         response = await self.__decision_maker.generate_answer(query=prompt)
         LOG.debug(f'Stack-{self.__stack_id} :: Classification result: ****')
+        if decision:
+            decision.tool_name = response
+            self.__router.record(decision)
         return response
 
-    async def process_query(self, query: str) -> ToolResponse:
+    async def classify_queries(
+            self,
+            queries: List[Union[str, Dict, List, BaseModel]],
+            rag: bool = False
+    ) -> List[Optional[str]]:
+        """
+        Classify many queries into tool names, with as few decision maker calls as possible.
+
+        Queries are served from the classification cache and the semantic router first, and the rest are
+        classified in bulk, up to `bulk_classification_size` distinct queries and `bulk_classification_tokens`
+        query tokens per decision maker call. A chunk whose bulk response cannot be parsed falls back to
+        classifying its queries one by one.
+
+        :param queries: Input queries to classify.
+        :param rag: If True, only consider RAG-type tools for classification.
+
+        :returns: The classified tool name of each query, in input order.
+        """
+        LOG.info(f'Stack-{self.__stack_id} :: Classifying {len(queries)} queries')
+        self.__check_initialized()
+
+        normalized_queries = [self.__normalize_input(query) for query in queries]
+        tool_roles = self.__candidate_tool_roles(rag)
+        tool_names: List[Optional[str]] = [None] * len(queries)
+        cache = self.__classification_cache
+        cache_scope = f'default:{"rag" if rag else "all"}'
+
+        pending = list(range(len(queries)))
+        if cache:
+            for index in pending:
+                tool_names[index] = cache.get(self.__tool_set_fingerprint, cache_scope, normalized_queries[index])
+            pending = [index for index in pending if tool_names[index] is None]
+
+        embeddings: Dict[int, np.ndarray] = {}
+        decisions: Dict[int, RoutingDecision] = {}
+        if pending and (self.__router or (cache and cache.similarity_enabled())):
+            matrix = await self.__decision_maker.embed_texts([normalized_queries[index] for index in pending])
+            embeddings = dict(zip(pending, matrix))
+            for index in pending:
+                if cache and cache.similarity_enabled():
+                    tool_names[index] = cache.get_similar(self.__tool_set_fingerprint, cache_scope, embeddings[index])
+                if tool_names[index] is None and self.__router:
+                    decision = self.__router.route(embeddings[index], tool_roles.keys())
+                    if decision.path == RoutingPath.VECTOR:
+                        self.__router.record(decision)
+                        tool_names[index] = decision.tool_name
+                    else:
+                        decisions[index] = decision
+            pending = [index for index in pending if tool_names[index] is None]
+
+        unique_queries = list(dict.fromkeys(normalized_queries[index] for index in pending))
+        chunks = self.__bulk_chunks(unique_queries)
+        results = await asyncio.gather(*(self.__classify_bulk(chunk, tool_roles, rag) for chunk in chunks))
+        classified = {query: tool_name for result, _ in results for query, tool_name in result.items()}
+        classified_singly = {query for result, fell_back in results if fell_back for query in result}
+
+        for index in pending:
+            tool_names[index] = classified.get(normalized_queries[index])
+            if normalized_queries[index] in classified_singly:
+                continue
+            if index in decisions:
+                decisions[index].tool_name = tool_names[index]
+                self.__router.record(decisions[index])
+            if cache and tool_names[index] in self.__tools:
+                cache.put(self.__tool_set_fingerprint, cache_scope, normalized_queries[index], tool_names[index],
+                          embeddings.get(index))
+        return tool_names
+
+    def __bulk_chunks(self, queries: List[str]) -> List[List[str]]:
+        """
+        Split queries into bulk classification chunks, bounded by query count and by query tokens.
+
+        A query longer than the token budget gets a chunk of its own.
+        """
+        max_size = self.__stack_properties.bulk_classification_size
+        token_budget = self.__stack_properties.bulk_classification_tokens
+        encoding = get_encoding()
+        chunks: List[List[str]] = []
+        chunk: List[str] = []
+        chunk_tokens = 0
+        for query in queries:
+            tokens = len(encoding.encode(query, disallowed_special=()))
+            if chunk and (len(chunk) >= max_size or chunk_tokens + tokens > token_budget):
+                chunks.append(chunk)
+                chunk, chunk_tokens = [], 0
+            chunk.append(query)
+            chunk_tokens += tokens
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def __classify_bulk(self, queries: List[str], tool_roles: Dict[str, str],
+                              rag: bool) -> Tuple[Dict[str, str], bool]:
+        """
+        Classify distinct normalized queries with a single decision maker call.
+
+        :param queries: The normalized queries.
+        :param tool_roles: Candidate tool names mapped to their roles.
+        :param rag: If True, only RAG-type tools are being considered.
+
+        :returns: Each normalized query mapped to its classified tool name, and whether the queries fell back to
+                  `classify_query`, which already recorded and cached their classification.
+        """
+        role_definitions = '\n'.join(
+            [f'{name}: {role}' for name, role in tool_roles.items()]
+        )
+        inputs = '\n'.join(f'{number}. {json.dumps(query)}' for number, query in enumerate(queries, start=1))
+        prompt = f"""
+           Classify each of the following inputs into one of the categories: {', '.join(self.__tool_roles.values())}.
+
+           Category definitions: 
+           {role_definitions}
+
+           Inputs:
+           {inputs}
+
+           Please return only a JSON array of exactly {len(queries)} category names, one per input and in the same
+           order, without any extra text or prefix.
+           """
+        LOG.debug(f'Stack-{self.__stack_id} :: Bulk classification prompt: ****')
+        response = await self.__decision_maker.generate_answer(query=prompt)
+        try:
+            tool_names = json.loads(response.strip().removeprefix('```json').strip('`').strip())
+            if not isinstance(tool_names, list) or len(tool_names) != len(queries):
+                raise ValueError('Unexpected number of classifications')
+            return {query: str(tool_name).strip() for query, tool_name in zip(queries, tool_names)}, False
+        except Exception as e:
+            LOG.warning(f'Stack-{self.__stack_id} :: Bulk classification fallback, {str(e)}')
+            tool_names = await asyncio.gather(*(self.classify_query(query, rag=rag) for query in queries))
+            return dict(zip(queries, tool_names)), True
+
+    async def process_queries(
+            self,
+            queries: List[Union[str, Dict, List]],
+            concurrency: int = 8
+    ) -> List[BatchAnswer]:
+        """
+        Process many queries, classifying them in bulk and generating their answers with bounded concurrency.
+
+        A query failing to be classified or answered is reported with its error without failing the others.
+
+        :param queries: User prompts or queries
+        :param concurrency: Maximum number of answers generated at a time.
+        :returns: The outcome of each query, in input order
+        """
+        LOG.info(f'Stack-{self.__stack_id} :: Processing {len(queries)} queries')
+        self.__check_initialized()
+
+        answers = [BatchAnswer(query=query) for query in queries]
+        try:
+            tool_names = await self.classify_queries(queries)
+        except Exception as e:
+            LOG.error(f'Stack-{self.__stack_id} :: Bulk classification failed: {str(e)}')
+            for answer in answers:
+                answer.error = str(e)
+            return answers
+
+        groups: Dict[str, List[int]] = {}
+        for index, tool_name in enumerate(tool_names):
+            answers[index].tool_name = tool_name
+            if tool_name not in self.__tools:
+                answers[index].error = f'No tool found for the classified role \'{tool_name}\'.'
+            else:
+                groups.setdefault(tool_name, []).append(index)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def answer_query(tool_name: str, index: int):
+            async with semaphore:
+                try:
+                    answers[index].response = await self.__tools[tool_name].process_query(query=queries[index])
+                except Exception as e:
+                    LOG.error(f'Stack-{self.__stack_id} :: Query {index} failed: {str(e)}')
+                    answers[index].error = str(e)
+
+        await asyncio.gather(*(
+            answer_query(tool_name, index) for tool_name, indexes in groups.items() for index in indexes
+        ))
+        LOG.debug(f'Stack-{self.__stack_id} :: Queries processed. Responses: ****')
+        return answers
+
+    async def __classify_and_retrieve(self, query: str,
+                                      where: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[dict]]:
+        """
+        Classify the query, speculatively retrieving from every RAG tool meanwhile if enabled.
+
+        The retrieval of the selected tool is kept and the others are cancelled. A tool with the query's response
+        already cached skips its retrieval. The time the retrieval overlapped with classification is recorded as
+        the wall-clock saving of the query.
+
+        :param query: User prompt or query
+        :param where: Optional metadata filter of the retrieved documents
+        :returns: The selected tool's name, and its retrieved documents if retrieved speculatively
+        """
+        retrievals: Dict[str, asyncio.Task] = {}
+        if self.__stack_properties.speculative_retrieval:
+            async def timed_retrieve(tool: Tool) -> Optional[Tuple[dict, float, float]]:
+                started_at = time.perf_counter()
+                if await tool.cached_response(query, where) is not None:
+                    return None
+                retrieved_docs = await tool.retrieve(query, where)
+                return retrieved_docs, started_at, time.perf_counter()
+
+            retrievals = {
+                name: asyncio.ensure_future(timed_retrieve(tool))
+                for name, tool in self.__tools.items() if tool.tool_kind() == ToolKind.RAG
+            }
+
+        try:
+            tool_name = await self.classify_query(query)
+            classified_at = time.perf_counter()
+            LOG.debug(f'Stack-{self.__stack_id} :: Classified tool: {tool_name}')
+            if tool_name not in self.__tools:
+                LOG.error(f'Stack-{self.__stack_id} :: No tool found for role: {tool_name}')
+                raise ValueError(f'No tool found for the classified role \'{tool_name}\'.')
+        except BaseException:
+            self.__speculation_stats['cancelled'] += await self.__cancel_tasks(list(retrievals.values()))
+            raise
+
+        selected = retrievals.pop(tool_name, None)
+        self.__speculation_stats['cancelled'] += await self.__cancel_tasks(list(retrievals.values()))
+        if not selected:
+            return tool_name, None
+
+        speculated = await selected
+        if speculated is None:
+            LOG.debug(f'Stack-{self.__stack_id} :: Response cached, speculative retrieval skipped')
+            return tool_name, None
+        retrieved_docs, started_at, finished_at = speculated
+        saved_seconds = (finished_at - started_at) - max(0.0, finished_at - classified_at)
+        self.__speculation_stats['queries'] += 1
+        self.__speculation_stats['saved_seconds'] += saved_seconds
+        self.__speculation_stats['last_saved_seconds'] = saved_seconds
+        LOG.debug(f'Stack-{self.__stack_id} :: Speculative retrieval saved {saved_seconds:.3f}s')
+        return tool_name, retrieved_docs
+
+    @staticmethod
+    async def __cancel_tasks(tasks: List[asyncio.Task]) -> int:
+        """
+        Cancel tasks and wait for them to finish.
+
+        :returns: The number of tasks cancelled, tasks already done being left as they are.
+        """
+        cancelled = sum(1 for task in tasks if task.cancel())
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return cancelled
+
+    @classmethod
+    async def __gather_or_cancel(cls, coroutines: List[Awaitable]) -> List[Any]:
+        """
+        Run coroutines concurrently, cancelling the others as soon as one of them raises or the caller is cancelled.
+        """
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            await cls.__cancel_tasks(tasks)
+            raise
+
+    async def process_query(self, query: str, where: Optional[Dict[str, Any]] = None) -> ToolResponse:
         """
         Process the input query, classify it, and use the appropriate tool.
 
         :param query: User prompt or query
+        :param where: Optional metadata filter of the retrieved documents, e.g. `{'file_name': 'report.pdf'}`
         :returns: Generated answer
         """
         LOG.info(f'Stack-{self.__stack_id} :: Processing query: ****')
         self.__check_initialized()
 
-        tool_name = await self.classify_query(query)
-        LOG.debug(f'Stack-{self.__stack_id} :: Classified tool: {tool_name}')
-        if tool_name not in self.__tools:
-            LOG.error(f'Stack-{self.__stack_id} :: No tool found for role: {tool_name}')
-            raise ValueError(f'No tool found for the classified role \'{tool_name}\'.')
-
-        response = await self.__tools[tool_name].process_query(query=query)
+        tool_name, retrieved_docs = await self.__classify_and_retrieve(query, where)
+        response = await self.__tools[tool_name].process_query(query=query, retrieved_docs=retrieved_docs, where=where)
         LOG.debug(f'Stack-{self.__stack_id} :: Query processed. Response: ****')
         return response
 
+    async def process_query_stream(self, query: str,
+                                   where: Optional[Dict[str, Any]] = None) -> AsyncIterator[StreamEvent]:
+        """
+        Process the input query, classify it, and stream the answer of the appropriate tool.
+
+        :param query: User prompt or query
+        :param where: Optional metadata filter of the retrieved documents, e.g. `{'file_name': 'report.pdf'}`
+        :returns: An async iterator of answer token events, followed by a final event with the complete response
+        """
+        LOG.info(f'Stack-{self.__stack_id} :: Streaming query: ****')
+        self.__check_initialized()
+
+        tool_name, retrieved_docs = await self.__classify_and_retrieve(query, where)
+        async for event in self.__tools[tool_name].process_query_stream(query=query, retrieved_docs=retrieved_docs,
+                                                                        where=where):
+            yield event
+        LOG.debug(f'Stack-{self.__stack_id} :: Query streamed. Response: ****')
+
     async def store_documents(
             self,
             files: List[str],
             metadata: Optional[Dict[str, Any]] = None,
             classify_document: bool = True
-    ) -> Dict[str, Union[List[str], str]]:
+    ) -> IngestionReport:
         """
         Store multiple documents in the appropriate vector database tool.
 
+        Files flow through a staged pipeline (parse, route, push), each stage running with its own bounded
+        concurrency and bounded queues in between, so a slow stage applies backpressure to the previous one.
+        Documents are chunked as a stream and stored in batches, the first batch being used for classification,
+        so only a batch of each in-flight file is held in memory when parsing in threads.
+        The rest of a file's batches are parsed as the push stage consumes them, `parse_concurrency` bounding the
+        batches being parsed at a time across both stages.
+        A file failing at any stage is reported under `errors` without aborting the rest of the batch, while an
+        unexpected error or a cancellation escaping a stage cancels the other stages.
+        Its AI calls are scheduled with bulk priority, yielding to live queries on rate limited API keys.
+
+        With incremental ingestion, files already stored with the same content and metadata are skipped before
+        parsing, a changed file has its outdated chunks deleted once its new chunks are stored, and a file failing
+        while being pushed has the chunks it already stored deleted, keeping its previously recorded ones.
+
         :param files: (List[str]): List of file paths to store
         :param metadata: (Optional[Dict[str, Any]]): Optional metadata to associate with documents
         :param classify_document: (bool): Whether to classify each document before storing
 
-        :returns Dict[str, Union[List[str], str]]: Dictionary containing stored document IDs and optional query response
+        :returns IngestionReport: The stored document IDs per tool, `errors` mapping each failed file to its error
+                 message, and the `skipped`, `added` and `replaced` file counts
         """
         LOG.info(f'Stack-{self.__stack_id} :: Storing documents')
         LOG.debug(f'Stack-{self.__stack_id} :: Files to store: {files}')
 
         self.__check_initialized()
-        stored_documents = {}
+        report = IngestionReport()
         rag_tool_names = [
             name for name in self.__tool_roles.keys()
             if self.__tools[name].tool_kind() == ToolKind.RAG
@@ -239,46 +764,197 @@ class Stack:
             LOG.error(f'Stack-{self.__stack_id} :: No tools available after RAG filtering')
             raise ValueError('No tools available for query classification')
 
+        ingestion = self.__stack_properties.ingestion
+        files = list(dict.fromkeys(files))
+        file_records: Dict[str, Tuple[IngestedFile, Optional[IngestedFile]]] = {}
+        metadata_hash = IngestionManifest.hash_metadata(metadata)
+        file_queue = asyncio.Queue()
         for file in files:
-            try:
-                LOG.debug(f'Stack-{self.__stack_id} :: Processing file: {file}')
-                chunks, metadata_list = await file_to_docs(file)
-
-                if metadata:
-                    metadata_list = [
-                        {**meta, **metadata} for meta in metadata_list
-                    ]
-
-                if classify_document and len(rag_tool_names) > 1:
-                    classify_input = ' '.join(chunks[:3]) if len(chunks) > 3 else ' '.join(chunks)
-                    if not classify_input:
-                        classify_input = os.path.basename(file)
-                    tool_name = await self.classify_query(classify_input, True)
-                    LOG.debug(f'Stack-{self.__stack_id} :: Classified tool for file: {tool_name}')
+            file_queue.put_nowait(file)
+        route_queue = asyncio.Queue(maxsize=ingestion.queue_size)
+        push_queue = asyncio.Queue(maxsize=ingestion.queue_size)
+        batch_size = ingestion.push_batch_size
+
+        def report_failure(file: str, error: Exception):
+            if asyncio.current_task().cancelling():
+                # Errors raised while the ingestion is being cancelled are not failures of the file.
+                raise asyncio.CancelledError() from error
+            LOG.error(f'Stack-{self.__stack_id} :: Error processing file {file}: {str(error)}')
+            report.errors[file] = str(error)
+
+        async def is_unchanged(file: str) -> bool:
+            if not ingestion.incremental or not os.path.exists(file):
+                return False
+            stat = await asyncio.to_thread(os.stat, file)
+            current = IngestedFile(file_path=file, size=stat.st_size, mtime=stat.st_mtime, metadata_hash=metadata_hash)
+            previous = await self.__ingestion_manifest.get(self.__stack_id, file)
+            file_records[file] = (current, previous)
+            if not previous or previous.metadata_hash != metadata_hash or previous.tool_name not in self.__tools:
+                return False
+            if previous.size == current.size and previous.mtime == current.mtime:
+                return True
+
+            current.content_hash = await asyncio.to_thread(IngestionManifest.hash_file, file)
+            if previous.content_hash != current.content_hash:
+                return False
+            current.tool_name = previous.tool_name
+            current.document_ids = previous.document_ids
+            await self.__ingestion_manifest.put(self.__stack_id, current)
+            return True
+
+        async def record_file(file: str, tool_name: str, document_ids: List[str]):
+            if file not in file_records:
+                report.added += 1
+                return
+            current, previous = file_records[file]
+            if previous and previous.tool_name in self.__tools:
+                if previous.tool_name == tool_name:
+                    stale_ids = list(set(previous.document_ids) - set(document_ids))
                 else:
-                    tool_name = rag_tool_names[0]
-
-                if not tool_name or tool_name not in self.__tools:
-                    LOG.error(f'Stack-{self.__stack_id} :: No tool found for document: {file}')
-                    raise ValueError(f'No tool found for document: {file}')
-
-                tool = self.__tools[tool_name]
-                document_ids = await tool.store_docs(
-                    documents=chunks,
-                    metadata_list=metadata_list
+                    stale_ids = previous.document_ids
+                if stale_ids:
+                    await self.__tools[previous.tool_name].delete_docs(stale_ids)
+            current.content_hash = current.content_hash or await asyncio.to_thread(IngestionManifest.hash_file, file)
+            current.tool_name = tool_name
+            current.document_ids = document_ids
+            await self.__ingestion_manifest.put(self.__stack_id, current)
+            if previous:
+                report.replaced += 1
+            else:
+                report.added += 1
+
+        async def discard_file(file: str, tool_name: str, pushed_ids: List[str]):
+            if file not in file_records:
+                return
+            _, previous = file_records[file]
+            kept_ids = set(previous.document_ids) if previous and previous.tool_name == tool_name else set()
+            partial_ids = list(set(pushed_ids) - kept_ids)
+            if partial_ids:
+                LOG.debug(f'Stack-{self.__stack_id} :: Discarding {len(partial_ids)} chunks stored for file: {file}')
+                await self.__tools[tool_name].delete_docs(partial_ids)
+
+        async def file_batches(file: str) -> AsyncIterator[Tuple[List[str], List[Dict[str, Any]]]]:
+            if self.__document_parser:
+                chunks, metadata_list = await file_to_docs(file, parser=self.__document_parser)
+                batches = (
+                    (chunks[i:i + batch_size], metadata_list[i:i + batch_size])
+                    for i in range(0, len(chunks), batch_size)
                 )
-                if tool_name not in stored_documents:
-                    stored_documents[tool_name] = []
-                stored_documents[tool_name].extend(document_ids)
-                LOG.debug(f'Stack-{self.__stack_id} :: Stored document IDs: ****')
+                for batch in batches:
+                    yield batch
+            else:
+                async for batch in file_to_doc_batches(file, batch_size=batch_size):
+                    yield batch
 
-            except Exception as e:
-                LOG.error(f'Stack-{self.__stack_id} :: Error processing file {file}')
-                raise e
+        parse_slots = asyncio.Semaphore(ingestion.parse_concurrency)
 
-        LOG.info(f'Stack-{self.__stack_id} :: Document storage completed')
+        async def parsed_batches(file: str) -> AsyncIterator[Tuple[List[str], List[Dict[str, Any]]]]:
+            batches = file_batches(file)
+            try:
+                while True:
+                    async with parse_slots:
+                        batch = await anext(batches, None)
+                    if batch is None:
+                        return
+                    yield batch
+            finally:
+                await batches.aclose()
+
+        async def parse_worker():
+            while not file_queue.empty():
+                file = file_queue.get_nowait()
+                try:
+                    if await is_unchanged(file):
+                        LOG.debug(f'Stack-{self.__stack_id} :: Skipping unchanged file: {file}')
+                        report.skipped += 1
+                        continue
+                except Exception as e:
+                    report_failure(file, e)
+                    continue
+                batches = parsed_batches(file)
+                try:
+                    LOG.debug(f'Stack-{self.__stack_id} :: Processing file: {file}')
+                    first_batch = await anext(batches, ([], []))
+                    await route_queue.put((file, first_batch, batches))
+                except Exception as e:
+                    await batches.aclose()
+                    report_failure(file, e)
+
+        async def route_worker():
+            while (item := await route_queue.get()) is not None:
+                file, first_batch, batches = item
+                try:
+                    if classify_document and len(rag_tool_names) > 1:
+                        chunks = first_batch[0]
+                        classify_input = ' '.join(chunks[:3]) if len(chunks) > 3 else ' '.join(chunks)
+                        if not classify_input:
+                            classify_input = os.path.basename(file)
+                        tool_name = await self.classify_query(classify_input, True)
+                        LOG.debug(f'Stack-{self.__stack_id} :: Classified tool for file: {tool_name}')
+                    else:
+                        tool_name = rag_tool_names[0]
+
+                    if not tool_name or tool_name not in self.__tools:
+                        LOG.error(f'Stack-{self.__stack_id} :: No tool found for document: {file}')
+                        raise ValueError(f'No tool found for document: {file}')
+                    await push_queue.put((file, tool_name, first_batch, batches))
+                except Exception as e:
+                    await batches.aclose()
+                    report_failure(file, e)
+
+        async def push_batch(tool_name: str, chunks: List[str], metadata_list: List[Dict[str, Any]],
+                             pushed_ids: List[str]):
+            if not chunks:
+                return
+            if metadata:
+                metadata_list = [
+                    {**meta, **metadata} for meta in metadata_list
+                ]
+            pushed_ids.extend(document_ids(chunks, metadata_list))
+            stored_ids = await self.__tools[tool_name].store_docs(
+                documents=chunks,
+                metadata_list=metadata_list
+            )
+            report.documents.setdefault(tool_name, []).extend(stored_ids)
+
+        async def push_worker():
+            while (item := await push_queue.get()) is not None:
+                file, tool_name, first_batch, batches = item
+                pushed_ids: List[str] = []
+                try:
+                    await push_batch(tool_name, *first_batch, pushed_ids)
+                    async for chunks, metadata_list in batches:
+                        await push_batch(tool_name, chunks, metadata_list, pushed_ids)
+                    await record_file(file, tool_name, pushed_ids)
+                    LOG.debug(f'Stack-{self.__stack_id} :: Stored document IDs: ****')
+                except Exception as e:
+                    report_failure(file, e)
+                    try:
+                        await discard_file(file, tool_name, pushed_ids)
+                    except Exception as discard_error:
+                        LOG.warning(f'Stack-{self.__stack_id} :: Error discarding chunks of file {file}: '
+                                    f'{str(discard_error)}')
+                finally:
+                    await batches.aclose()
+
+        async def run_stage(worker, concurrency: int, next_queue: Optional[asyncio.Queue], next_concurrency: int):
+            await self.__gather_or_cancel([worker() for _ in range(concurrency)])
+            for _ in range(next_concurrency):
+                await next_queue.put(None)
+
+        parse_concurrency = max(1, min(ingestion.parse_concurrency, len(files)))
+        with RequestScheduler.priority(RequestPriority.BULK):
+            await self.__gather_or_cancel([
+                run_stage(parse_worker, parse_concurrency, route_queue, ingestion.route_concurrency),
+                run_stage(route_worker, ingestion.route_concurrency, push_queue, ingestion.push_concurrency),
+                run_stage(push_worker, ingestion.push_concurrency, None, 0)
+            ])
+
+        LOG.info(
+            f'Stack-{self.__stack_id} :: Document storage completed, {report.added} added, '
+            f'{report.replaced} replaced, {report.skipped} skipped, {len(report.errors)} file(s) failed')
         LOG.debug(f'Stack-{self.__stack_id} :: Stored documents: ****')
-        return stored_documents
+        return report
 
     async def destroy_stack(self, cleanup: bool = False):
         """
@@ -288,12 +964,12 @@ class Stack:
         """
         LOG.info(f'Stack-{self.__stack_id} :: Starting destruction')
 
-        for tool_name, tool in self.__tools.items():
+        await self.__destroy_tools(tools=self.__tools, cleanup=cleanup)
+        if cleanup and self.__ingestion_manifest:
             try:
-                LOG.debug(f'Stack-{self.__stack_id} :: Destroying tool: {tool_name}')
-                await tool.destroy(cleanup)
+                await self.__ingestion_manifest.forget(self.__stack_id)
             except Exception as e:
-                LOG.warning(f'Stack-{self.__stack_id} :: Error destroying tool {tool_name}: {str(e)}')
+                LOG.warning(f'Stack-{self.__stack_id} :: Error occurred while clearing ingestion manifest: {str(e)}')
         if self.__decision_maker:
             try:
                 LOG.debug(f'Stack-{self.__stack_id} :: Destroying decision_maker')
@@ -302,8 +978,14 @@ class Stack:
                 LOG.warning(f'Stack-{self.__stack_id} :: Error occurred while destroying decision_maker: {str(e)}')
         self.__stack_properties = None
         self.__decision_maker = None
+        self.__router = None
+        self.__classification_cache = None
+        self.__tool_set_fingerprint = None
+        self.__document_parser = None
+        self.__ingestion_manifest = None
         self.__tool_roles.clear()
         self.__tools.clear()
+        self.__tool_timings.clear()
         self.__initialized = False
 
         LOG.info(f'Stack-{self.__stack_id} :: destruction completed')
@@ -0,0 +1,242 @@
+import asyncio
+import contextlib
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from kiss_ai_stack.core.stack.stack import Stack
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class StackRegistry:
+    """
+    Registry of the live stacks of the process, bounded in number and evicting idle stacks.
+
+    Stacks are kept in least recently used order. When more than `max_stacks` are registered, the least recently
+    used stacks not serving a call are evicted, and stacks idle for longer than `idle_ttl_seconds` are evicted by
+    a background sweep. Evicted stacks are removed from the registry at once and destroyed in the background:
+    temporary stacks are cleaned up along with their documents, while persistent stacks are only detached,
+    keeping their documents for the next bootstrap. A stack replaced by a new stack of the same Id is only
+    detached, since the new stack uses the same collections, once it no longer serves any call.
+    """
+
+    class __Entry:
+        def __init__(self, stack: Stack):
+            self.stack = stack
+            self.last_used = time.monotonic()
+            self.leases = 0
+            self.replaced = False
+
+    def __init__(self, max_stacks: Optional[int] = None, idle_ttl_seconds: Optional[float] = None,
+                 sweep_interval_seconds: float = 60.0):
+        """
+        Initialize an empty registry.
+
+        :param max_stacks: Maximum number of live stacks, unbounded if None.
+        :param idle_ttl_seconds: Seconds after which an unused stack is evicted, never if None.
+        :param sweep_interval_seconds: Seconds between idle sweeps. Defaults to 60.
+        """
+        self.__entries: OrderedDict[str, StackRegistry.__Entry] = OrderedDict()
+        self.__max_stacks = max_stacks
+        self.__idle_ttl_seconds = idle_ttl_seconds
+        self.__sweep_interval_seconds = sweep_interval_seconds
+        self.__sweeper: Optional[asyncio.Task] = None
+        self.__evictions: Set[asyncio.Task] = set()
+        self.__evicted = {'lru': 0, 'idle': 0, 'replaced': 0}
+
+    def configure(self, max_stacks: Optional[int] = None, idle_ttl_seconds: Optional[float] = None,
+                  sweep_interval_seconds: float = 60.0):
+        """
+        Change the registry's bounds, evicting stacks beyond them.
+
+        :param max_stacks: Maximum number of live stacks, unbounded if None.
+        :param idle_ttl_seconds: Seconds after which an unused stack is evicted, never if None.
+        :param sweep_interval_seconds: Seconds between idle sweeps. Defaults to 60.
+        """
+        self.__max_stacks = max_stacks
+        self.__idle_ttl_seconds = idle_ttl_seconds
+        self.__sweep_interval_seconds = sweep_interval_seconds
+        if self.__sweeper:
+            self.__sweeper.cancel()
+            self.__sweeper = None
+        if self.__entries:
+            self.__evict_over_capacity()
+            self.__start_sweeper()
+
+    def __contains__(self, stack_id: str) -> bool:
+        return stack_id in self.__entries
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, stack_id: str) -> Optional[Stack]:
+        """
+        Get a live stack, marking it as recently used.
+
+        :param stack_id: The identifier of the stack.
+        :returns: The stack, or None if it is not registered.
+        """
+        entry = self.__entries.get(stack_id)
+        if entry is None:
+            return None
+        self.__touch(stack_id, entry)
+        return entry.stack
+
+    def add(self, stack_id: str, stack: Stack):
+        """
+        Register a stack as the most recently used, evicting stacks beyond the bounds.
+
+        A stack previously registered with the same Id is detached, keeping the collections the new stack shares
+        with it, as soon as the calls it is serving complete.
+
+        :param stack_id: The identifier of the stack.
+        :param stack: The initialized stack.
+        """
+        previous = self.__entries.pop(stack_id, None)
+        if previous is not None and previous.stack is not stack:
+            if previous.leases:
+                previous.replaced = True
+            else:
+                self.__evict(stack_id, previous.stack, 'replaced')
+        self.__entries[stack_id] = StackRegistry.__Entry(stack)
+        self.__evict_over_capacity()
+        self.__start_sweeper()
+
+    def remove(self, stack_id: str) -> Optional[Stack]:
+        """
+        Unregister a stack without destroying it.
+
+        :param stack_id: The identifier of the stack.
+        :returns: The removed stack, or None if it was not registered.
+        """
+        entry = self.__entries.pop(stack_id, None)
+        return entry.stack if entry else None
+
+    @contextlib.asynccontextmanager
+    async def lease(self, stack_id: str) -> AsyncIterator[Stack]:
+        """
+        Use a live stack for the duration of the context, protecting it from eviction.
+
+        :param stack_id: The identifier of the stack.
+        :returns: The stack.
+        :raises KeyError: If the stack is not registered.
+        """
+        entry = self.__entries.get(stack_id)
+        if entry is None:
+            raise KeyError(f'StackRegistry :: Stack \'{stack_id}\' not found')
+        self.__touch(stack_id, entry)
+        entry.leases += 1
+        try:
+            yield entry.stack
+        finally:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if entry.replaced and entry.leases == 0:
+                entry.replaced = False
+                self.__evict(stack_id, entry.stack, 'replaced')
+            if self.__max_stacks is not None and len(self.__entries) > self.__max_stacks:
+                self.__evict_over_capacity()
+
+    def __touch(self, stack_id: str, entry: 'StackRegistry.__Entry'):
+        entry.last_used = time.monotonic()
+        if self.__entries.get(stack_id) is entry:
+            self.__entries.move_to_end(stack_id)
+
+    def __evict_over_capacity(self):
+        if self.__max_stacks is None:
+            return
+        for stack_id in list(self.__entries.keys()):
+            if len(self.__entries) <= self.__max_stacks:
+                return
+            entry = self.__entries[stack_id]
+            if entry.leases == 0:
+                del self.__entries[stack_id]
+                self.__evict(stack_id, entry.stack, 'lru')
+        if len(self.__entries) > self.__max_stacks:
+            LOG.warning(f'StackRegistry :: {len(self.__entries)} stacks in use, over the limit of '
+                        f'{self.__max_stacks}')
+
+    def evict_idle(self) -> int:
+        """
+        Evict the stacks unused for longer than the idle TTL.
+
+        :returns: The number of stacks evicted.
+        """
+        if self.__idle_ttl_seconds is None:
+            return 0
+        deadline = time.monotonic() - self.__idle_ttl_seconds
+        idle = [
+            stack_id for stack_id, entry in self.__entries.items()
+            if entry.leases == 0 and entry.last_used <= deadline
+        ]
+        for stack_id in idle:
+            self.__evict(stack_id, self.__entries.pop(stack_id).stack, 'idle')
+        return len(idle)
+
+    def __evict(self, stack_id: str, stack: Stack, reason: str):
+        self.__evicted[reason] += 1
+        cleanup = stack.is_temporary() and reason != 'replaced'
+        LOG.info(f'StackRegistry :: Evicting stack \'{stack_id}\' ({reason}), '
+                 f'{"cleaning up" if cleanup else "detaching"}')
+
+        async def destroy():
+            try:
+                await stack.destroy_stack(cleanup=cleanup)
+            except Exception as e:
+                LOG.error(f'StackRegistry :: Failed to destroy evicted stack \'{stack_id}\': {e}')
+
+        task = asyncio.ensure_future(destroy())
+        self.__evictions.add(task)
+        task.add_done_callback(self.__evictions.discard)
+
+    def __start_sweeper(self):
+        if self.__idle_ttl_seconds is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self.__sweeper and not self.__sweeper.done() and self.__sweeper.get_loop() is loop:
+            return
+        self.__sweeper = loop.create_task(self.__sweep())
+
+    async def __sweep(self):
+        while self.__entries:
+            await asyncio.sleep(self.__sweep_interval_seconds)
+            self.evict_idle()
+
+    async def drain(self):
+        """
+        Wait for the background destruction of evicted stacks to complete.
+        """
+        if self.__evictions:
+            await asyncio.gather(*list(self.__evictions), return_exceptions=True)
+
+    @staticmethod
+    def __rss_bytes() -> Optional[int]:
+        """
+        The resident memory of the process, its peak on platforms without /proc.
+        """
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            pass
+        try:
+            import resource
+        except ImportError:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gauges of live stacks, stacks serving calls, pending and past evictions, and process memory.
+        """
+        return {
+            'stacks': len(self.__entries),
+            'in_use': sum(1 for entry in self.__entries.values() if entry.leases),
+            'max_stacks': self.__max_stacks,
+            'evicting': len(self.__evictions),
+            'evicted': dict(self.__evicted),
+            'rss_bytes': self.__rss_bytes()
+        }
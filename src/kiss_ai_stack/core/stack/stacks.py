@@ -1,9 +1,16 @@
+import copy
 import functools
-from typing import Dict, List, Optional, Union, Callable, TypeVar, Any
+import json
+from typing import AsyncIterator, Dict, List, Optional, Union, Callable, TypeVar, Any
 
 from kiss_ai_stack.core.stack.stack import Stack
+from kiss_ai_stack.core.stack.stack_registry import StackRegistry
+from kiss_ai_stack.core.models.core.batch_answer import BatchAnswer
+from kiss_ai_stack.core.models.core.ingestion_report import IngestionReport
 from kiss_ai_stack.core.models.core.rag_response import ToolResponse
+from kiss_ai_stack.core.models.core.stream_event import StreamEvent
 from kiss_ai_stack.core.utilities.logger import LOG
+from kiss_ai_stack.core.utilities.single_flight import SingleFlight
 
 T = TypeVar('T')
 
@@ -21,11 +28,13 @@ class Stacks:
     Key Features:
     - Thread-safe stack management
     - Flexible stack initialization with temporary or persistent modes
+    - Bounded number of live stacks, with least recently used and idle stacks evicted, see `configure`
 
-    :param __stacks: A private dictionary storing active stack instances, keyed by their unique identifiers.
+    :param __stacks: A private registry of active stack instances, keyed by their unique identifiers.
     """
 
-    __stacks: Dict[str, Stack] = {}
+    __stacks = StackRegistry()
+    __single_flight = SingleFlight()
 
     @staticmethod
     def _require_stack(func: Callable[..., T]) -> Callable[..., T]:
@@ -50,6 +59,49 @@ class Stacks:
 
         return wrapper
 
+    @staticmethod
+    def __query_key(query: Union[str, Dict, List]) -> str:
+        """
+        Turn a query into a coalescing key, ignoring only its surrounding whitespace, since case may change the
+        answer.
+
+        :param query: A string query, or structured query parameters.
+        :returns: The query key.
+        """
+        if not isinstance(query, str):
+            query = json.dumps(query, sort_keys=True, default=str)
+        return query.strip()
+
+    @classmethod
+    def configure(cls, max_stacks: Optional[int] = None, idle_ttl_seconds: Optional[float] = None,
+                  sweep_interval_seconds: float = 60.0) -> None:
+        """
+        Bound the live stacks of the process.
+
+        Beyond `max_stacks`, the least recently used stacks not serving a call are evicted, and stacks unused for
+        `idle_ttl_seconds` are evicted by a background sweep. Evicted temporary stacks are cleaned up along with
+        their documents, while persistent stacks are only detached and can be bootstrapped again.
+
+        :param max_stacks: Maximum number of live stacks, unbounded if None.
+        :param idle_ttl_seconds: Seconds after which an unused stack is evicted, never if None.
+        :param sweep_interval_seconds: Seconds between idle sweeps. Defaults to 60.
+        """
+        cls.__stacks.configure(
+            max_stacks=max_stacks,
+            idle_ttl_seconds=idle_ttl_seconds,
+            sweep_interval_seconds=sweep_interval_seconds
+        )
+
+    @classmethod
+    def registry_stats(cls) -> Dict[str, Any]:
+        """
+        Get the number of live stacks and stacks serving calls, the pending and past evictions by reason, and the
+        process' resident memory in bytes.
+
+        :returns: Stack registry gauges.
+        """
+        return cls.__stacks.stats()
+
     @classmethod
     async def bootstrap_stack(cls, stack_id: str, temporary: Optional[bool] = True) -> None:
         """
@@ -67,8 +119,8 @@ class Stacks:
         """
         try:
             stack = Stack(stack_id=stack_id, temporary=temporary)
-            cls.__stacks[stack_id] = stack
-            await cls.__stacks[stack_id].initialize_stack()
+            await stack.initialize_stack()
+            cls.__stacks.add(stack_id, stack)
             LOG.info(f'Stacks :: Stack \'{stack_id}\' initialized successfully')
         except Exception as e:
             LOG.error(f'Stacks :: Stack initialization failed for stack \'{stack_id}\': {e}')
@@ -79,17 +131,21 @@ class Stacks:
     async def generate_answer(
             cls,
             stack_id: str,
-            query: Union[str, Dict, List]
+            query: Union[str, Dict, List],
+            where: Optional[Dict[str, Any]] = None
     ) -> Optional[ToolResponse]:
         """
         Process a query using a specific stack's capabilities.
 
         Supports flexible query formats and returns a structured tool response.
         Handles query processing, potential tool interactions, and result generation.
+        Concurrent identical queries to the same stack, with the same filter, share one in-flight execution, each
+        getting its own copy of the response.
 
         :param stack_id: The identifier of the stack to process the query.
         :param query: A string query, a dictionary with structured query parameters,
                       or a list of query components.
+        :param where: Optional metadata filter of the retrieved documents, e.g. `{'file_name': 'report.pdf'}`.
 
         :returns: A structured response containing:
             - Generated answer
@@ -98,14 +154,80 @@ class Stacks:
 
         :raises ValueError: If query processing encounters unrecoverable errors.
         """
+        async def process_query() -> ToolResponse:
+            # The shared execution outlives cancelled callers, so it holds a lease of its own.
+            async with cls.__stacks.lease(stack_id) as leased_stack:
+                return await leased_stack.process_query(query, where)
+
         try:
-            response = await cls.__stacks[stack_id].process_query(query)
+            async with cls.__stacks.lease(stack_id):
+                response = await cls.__single_flight.do(
+                    (stack_id, cls.__query_key(query), json.dumps(where, sort_keys=True, default=str)),
+                    process_query
+                )
             LOG.info(f'Stacks :: Query processed successfully for stack \'{stack_id}\'')
-            return response
+            return copy.deepcopy(response)
         except Exception as e:
             LOG.error(f'Stacks :: Query processing failed for stack \'{stack_id}\': {e}')
             raise
 
+    @classmethod
+    @_require_stack
+    async def generate_answers(
+            cls,
+            stack_id: str,
+            queries: List[Union[str, Dict, List]],
+            concurrency: int = 8
+    ) -> List[BatchAnswer]:
+        """
+        Process many queries using a specific stack's capabilities.
+
+        Queries are classified in bulk, with as few decision maker calls as possible, and answered with bounded
+        concurrency. A failing query does not fail the batch, its error is reported in its place instead.
+
+        :param stack_id: The identifier of the stack to process the queries.
+        :param queries: String queries, dictionaries with structured query parameters, or lists of query components.
+        :param concurrency: Maximum number of answers generated at a time. Defaults to 8.
+
+        :returns: The outcome of each query in input order, with its tool name, response and error if any.
+        """
+        async with cls.__stacks.lease(stack_id) as stack:
+            answers = await stack.process_queries(queries, concurrency=concurrency)
+        failed = sum(1 for answer in answers if answer.error)
+        LOG.info(f'Stacks :: {len(answers) - failed} of {len(answers)} queries processed for stack \'{stack_id}\'')
+        return answers
+
+    @classmethod
+    @_require_stack
+    async def stream_answer(
+            cls,
+            stack_id: str,
+            query: Union[str, Dict, List],
+            where: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Process a query using a specific stack's capabilities, streaming the answer as it is generated.
+
+        :param stack_id: The identifier of the stack to process the query.
+        :param query: A string query, a dictionary with structured query parameters,
+                      or a list of query components.
+        :param where: Optional metadata filter of the retrieved documents, e.g. `{'file_name': 'report.pdf'}`.
+
+        :returns: An async iterator of events:
+            - `token` events carrying the answer's text pieces as they are generated
+            - A final `final` event carrying the complete response, with supporting documents and metadata
+
+        :raises ValueError: If query processing encounters unrecoverable errors.
+        """
+        try:
+            async with cls.__stacks.lease(stack_id) as stack:
+                async for event in stack.process_query_stream(query, where):
+                    yield event
+            LOG.info(f'Stacks :: Query streamed successfully for stack \'{stack_id}\'')
+        except Exception as e:
+            LOG.error(f'Stacks :: Query streaming failed for stack \'{stack_id}\': {e}')
+            raise
+
     @classmethod
     @_require_stack
     async def store_data(
@@ -114,25 +236,29 @@ class Stacks:
             files: List[str],
             metadata: Optional[Dict[str, Any]] = None,
             classify_document: bool = True
-    ) -> Dict[str, List[str]]:
+    ) -> IngestionReport:
         """
         Store documents for a specific stack.
 
+        Files already stored unchanged are skipped, and changed files have their previous chunks replaced.
+
         :param stack_id: (str) Identifier of the stack to use
         :param files: (List[str]) List of file paths to store
         :param metadata: (Optional[Dict[str, Any]]) Optional metadata to associate with documents
         :param classify_document: (bool, optional) Whether to classify documents. Defaults to True.
 
-        :returns: Dict[str, List[str]]: Dictionary of stored document IDs per tool
+        :returns: IngestionReport: The stored document IDs per tool, `errors` mapping each failed file to its
+                  error message, and the `skipped`, `added` and `replaced` file counts
 
         :raises ValueError: If document storage fails
         """
         try:
-            stored_documents = await cls.__stacks[stack_id].store_documents(
-                files=files,
-                metadata=metadata,
-                classify_document=classify_document
-            )
+            async with cls.__stacks.lease(stack_id) as stack:
+                stored_documents = await stack.store_documents(
+                    files=files,
+                    metadata=metadata,
+                    classify_document=classify_document
+                )
             LOG.info(f'Stacks :: Documents stored successfully for stack \'{stack_id}\'')
             return stored_documents
         except Exception as e:
@@ -159,11 +285,20 @@ class Stacks:
         :param stack_id: Identifier of the stack to destroy.
         :param cleanup: Prompt to remove user data if RAG tools present.
         """
-        stack = cls.__stacks.get(stack_id)
+        stack = cls.__stacks.remove(stack_id)
         if stack:
             await stack.destroy_stack(cleanup)
-            del cls.__stacks[stack_id]
             LOG.info(f'Stacks :: Stack-\'{stack_id}\' closed successfully')
         else:
             LOG.warning(f'Stacks :: Stack-\'{stack_id}\' not found')
         return
+
+    @classmethod
+    def coalescing_stats(cls) -> Dict[str, int]:
+        """
+        Get how many `generate_answer` calls were made, how many actually ran, and how many were coalesced
+        into an identical in-flight call.
+
+        :returns: Query coalescing stats.
+        """
+        return cls.__single_flight.stats()
@@ -1,10 +1,15 @@
-from typing import Dict, List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
+from kiss_ai_stack.core.caches.response_cache_abc import ResponseCacheAbc
 from kiss_ai_stack.core.dbs.db_abc import VectorDBAbc
 from kiss_ai_stack.core.models.config.tool_props import ToolProperties
 from kiss_ai_stack.core.models.core.rag_response import ToolResponse
+from kiss_ai_stack.core.models.core.stream_event import StreamEvent
+from kiss_ai_stack.core.models.enums.stream_event_kind import StreamEventKind
 from kiss_ai_stack.core.models.enums.tool_kind import ToolKind
+from kiss_ai_stack.core.utilities.context_assembly import assemble_context
 from kiss_ai_stack.core.utilities.logger import LOG
 
 
@@ -21,7 +26,9 @@ class Tool:
             self,
             properties: ToolProperties,
             ai_client: AIClientAbc,
-            vector_db: Optional[VectorDBAbc] = None
+            vector_db: Optional[VectorDBAbc] = None,
+            response_cache: Optional[ResponseCacheAbc] = None,
+            cache_namespace: Optional[str] = None
     ):
         """
         Initialize a Tool instance.
@@ -29,10 +36,14 @@ class Tool:
         :param properties: Tool configurations object loaded from Yaml file.
         :param ai_client: The AI client instance used for query processing.
         :param vector_db: The optional vector database instance for storing documents. Defaults to None.
+        :param response_cache: The optional cache for generated responses. Defaults to None.
+        :param cache_namespace: The namespace of cached responses, e.g. the collection name. Defaults to the tool name.
         """
         self.__properties = properties
         self.__ai_client = ai_client
         self.__vector_db = vector_db
+        self.__response_cache = response_cache
+        self.__cache_namespace = cache_namespace or properties.name
         LOG.info(f'Tool initialized with kind: {self.tool_kind()}')
 
     def tool_kind(self) -> ToolKind:
@@ -43,6 +54,14 @@ class Tool:
         """
         return self.__properties.kind
 
+    def embedding_cache_stats(self) -> Dict[str, float]:
+        """
+        Get the hit and miss counters of the vector database's embedding cache.
+
+        :returns: Cache stats, or an empty dictionary without a vector database or embedding cache.
+        """
+        return self.__vector_db.embedding_cache_stats() if self.__vector_db else {}
+
     def depth(self) -> int:
         """
         Returns the dept of retrieved documents to be considered.(RAG only)
@@ -61,8 +80,11 @@ class Tool:
         if self.__vector_db:
             LOG.info(f'Pipeline tool :: Storing {len(documents)} documents in the vector database.')
             try:
+                version = self.__vector_db.version()
                 ids = await self.__vector_db.push(documents=documents, metadata_list=metadata_list)
                 LOG.info(f'Pipeline tool :: {len(ids)} documents successfully stored with generated IDs.')
+                if self.__response_cache and self.__vector_db.version() != version:
+                    await self.__response_cache.evict(self.__cache_namespace)
                 return ids
             except Exception as e:
                 LOG.error(f'Pipeline tool :: Failed to store documents: {str(e)}')
@@ -72,7 +94,84 @@ class Tool:
             LOG.error(error_message)
             raise IOError(error_message)
 
-    async def process_query(self, query: str) -> Optional[ToolResponse]:
+    async def delete_docs(self, ids: List[str]):
+        """
+        Delete documents from the vector database by their IDs.
+
+        :param ids: The IDs of the documents to be deleted.
+        :raises IOError: If the vector database is not initialized or an error occurs while deleting documents.
+        """
+        if self.__vector_db:
+            LOG.info(f'Pipeline tool :: Deleting {len(ids)} documents from the vector database.')
+            try:
+                await self.__vector_db.delete(ids)
+                if self.__response_cache:
+                    await self.__response_cache.evict(self.__cache_namespace)
+            except Exception as e:
+                LOG.error(f'Pipeline tool :: Failed to delete documents: {str(e)}')
+                raise IOError(f'Pipeline tool :: Error deleting documents: {str(e)}')
+        else:
+            error_message = 'Pipeline tool :: Vector database has not been initialized.'
+            LOG.error(error_message)
+            raise IOError(error_message)
+
+    def __cache_key(self, query: str, where: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Build the response cache key of a query and its metadata filter, or None if responses are not cached.
+        """
+        if not self.__response_cache:
+            return None
+        return ResponseCacheAbc.build_key(
+            query=f'{query}\n{json.dumps(where, sort_keys=True)}' if where else query,
+            tool_name=self.__properties.name,
+            model=self.__properties.ai_client.model,
+            temperature=self.__properties.temperature,
+            version=self.__vector_db.version() if self.__vector_db else 0,
+            namespace=self.__cache_namespace
+        )
+
+    async def cached_response(self, query: str, where: Optional[Dict[str, Any]] = None) -> Optional[ToolResponse]:
+        """
+        Get the cached response of a query, without generating it.
+
+        :param query: The query string.
+        :param where: Optional metadata filter of the retrieved documents.
+        :returns: The cached response, or None if not cached or if responses are not cached.
+        """
+        cache_key = self.__cache_key(query, where)
+        return await self.__response_cache.get(cache_key) if cache_key else None
+
+    async def retrieve(self, query: str, where: Optional[Dict[str, Any]] = None) -> Optional[dict]:
+        """
+        Retrieve the `depth` documents most relevant to the query from the vector database.
+
+        :param query: The query string to retrieve documents for.
+        :param where: Optional metadata filter of the documents, e.g. `{'file_name': 'report.pdf'}`.
+        :returns: The retrieved documents and their metadata, or None if the tool is not a RAG tool.
+        """
+        if self.tool_kind() != ToolKind.RAG:
+            return None
+        LOG.info('Pipeline tool :: Performing retrieval-augmented generation (RAG) for query processing.')
+        return await self.__vector_db.retrieve(query, k=self.depth(), where=where, include=['documents', 'metadatas'])
+
+    def __top_results(self, retrieved_docs: dict, field: str) -> Optional[List[List]]:
+        """
+        Keep the top `depth` results of a retrieved field, per query.
+        """
+        results = retrieved_docs.get(field)
+        return [query_results[:self.depth()] for query_results in results] if results is not None else None
+
+    def __context(self, top_docs: List[List[str]], top_metadata: Optional[List[List[Dict]]]) -> List[str]:
+        """
+        Assemble the prompt context of the top documents, merging overlapping chunks within the token budget.
+        """
+        documents = [document for query_docs in top_docs or [] for document in query_docs]
+        metadata_list = [metadata for query_metadata in top_metadata for metadata in query_metadata] \
+            if top_metadata else None
+        return assemble_context(documents, metadata_list, token_budget=self.__properties.context_token_budget)
+
+    async def process_query(self, query: str, retrieved_docs: Optional[dict] = None,
+                            where: Optional[Dict[str, Any]] = None) -> Optional[ToolResponse]:
         """
         Process a query using the AI client and optionally the vector database.
 
@@ -80,49 +179,119 @@ class Tool:
         documents from the vector database before passing them to the AI client to generate a response.
 
         :param query: The query string to be processed by the tool.
+        :param retrieved_docs: Documents already retrieved for the query with `retrieve`, retrieved if None.
+        :param where: Optional metadata filter of the retrieved documents, e.g. `{'file_name': 'report.pdf'}`.
         :returns: A response containing the generated answer, documents, metadata, and distances,
                   or None if no valid response is generated.
         :raises Exception: If an error occurs while processing the query, such as failure in retrieval or generation.
         """
         LOG.info(f'Pipeline tool :: Processing query with tool kind: {self.tool_kind()}')
         try:
-            retrieved_docs = None
+            cache_key = self.__cache_key(query, where)
+            if cache_key:
+                cached_response = await self.__response_cache.get(cache_key)
+                if cached_response:
+                    LOG.info('Pipeline tool :: Response served from cache.')
+                    return cached_response
 
-            if self.tool_kind() == ToolKind.RAG:
-                LOG.info('Pipeline tool :: Performing retrieval-augmented generation (RAG) for query processing.')
-                retrieved_docs = await self.__vector_db.retrieve(query)
+            if retrieved_docs is None:
+                retrieved_docs = await self.retrieve(query, where)
 
             if retrieved_docs:
-                top_docs = retrieved_docs['documents'][:self.depth()]
+                top_docs = self.__top_results(retrieved_docs, 'documents')
+                top_metadata = self.__top_results(retrieved_docs, 'metadatas')
                 LOG.debug('Pipeline tool :: Chunk metadata retrieved but content not logged for security reasons.')
-                answer = await self.__ai_client.generate_answer(query, top_docs)
+                answer = await self.__ai_client.generate_answer(
+                    query, self.__context(top_docs, top_metadata), temperature=self.__properties.temperature)
                 LOG.info('Pipeline tool :: Answer generated by AI client.')
 
-                return ToolResponse(
+                response = ToolResponse(
                     answer=answer,
                     docs=top_docs,
-                    metadata=retrieved_docs['metadatas']
+                    metadata=top_metadata
                 )
             else:
                 LOG.info('Pipeline tool :: Using direct prompt mode for query processing.')
-                answer = await self.__ai_client.generate_answer(query=query)
+                answer = await self.__ai_client.generate_answer(query=query, temperature=self.__properties.temperature)
                 LOG.info('Pipeline tool :: Answer generated by AI client (no documents).')
 
-                return ToolResponse(answer=answer)
+                response = ToolResponse(answer=answer)
+
+            if cache_key:
+                await self.__response_cache.put(cache_key, self.__cache_namespace, response)
+            return response
 
         except Exception as e:
             LOG.error(f'Pipeline tool :: Failed to process query: {str(e)}')
             raise e
 
+    async def process_query_stream(self, query: str, retrieved_docs: Optional[dict] = None,
+                                   where: Optional[Dict[str, Any]] = None) -> AsyncIterator[StreamEvent]:
+        """
+        Process a query like `process_query`, streaming the answer as it is generated.
+
+        Token events carry the answer's text pieces, and a final event carries the complete response, along with
+        its supporting documents and metadata. A cached response is streamed as a single token event.
+
+        :param query: The query string to be processed by the tool.
+        :param retrieved_docs: Documents already retrieved for the query with `retrieve`, retrieved if None.
+        :param where: Optional metadata filter of the retrieved documents, e.g. `{'file_name': 'report.pdf'}`.
+        :returns: An async iterator of token events, followed by one final event.
+        :raises Exception: If an error occurs while processing the query, such as failure in retrieval or generation.
+        """
+        LOG.info(f'Pipeline tool :: Streaming query with tool kind: {self.tool_kind()}')
+        try:
+            cache_key = self.__cache_key(query, where)
+            if cache_key:
+                cached_response = await self.__response_cache.get(cache_key)
+                if cached_response:
+                    LOG.info('Pipeline tool :: Response served from cache.')
+                    yield StreamEvent(kind=StreamEventKind.TOKEN, token=cached_response.answer)
+                    yield StreamEvent(kind=StreamEventKind.FINAL, response=cached_response)
+                    return
+
+            if retrieved_docs is None:
+                retrieved_docs = await self.retrieve(query, where)
+            top_docs = self.__top_results(retrieved_docs, 'documents') if retrieved_docs else None
+            top_metadata = self.__top_results(retrieved_docs, 'metadatas') if retrieved_docs else None
+            context = self.__context(top_docs, top_metadata) if top_docs is not None else None
+            tokens = []
+            async for token in self.__ai_client.generate_answer_stream(
+                    query, context, temperature=self.__properties.temperature):
+                tokens.append(token)
+                yield StreamEvent(kind=StreamEventKind.TOKEN, token=token)
+            LOG.info('Pipeline tool :: Answer streamed by AI client.')
+
+            if retrieved_docs:
+                response = ToolResponse(
+                    answer=''.join(tokens),
+                    docs=top_docs,
+                    metadata=top_metadata
+                )
+            else:
+                response = ToolResponse(answer=''.join(tokens))
+
+            if cache_key:
+                await self.__response_cache.put(cache_key, self.__cache_namespace, response)
+            yield StreamEvent(kind=StreamEventKind.FINAL, response=response)
+
+        except Exception as e:
+            LOG.error(f'Pipeline tool :: Failed to stream query: {str(e)}')
+            raise e
+
     async def destroy(self, cleanup: bool = False):
         """
         Close connections and optionally clean up resources.
 
-        :param cleanup: If True, cleans up the vector database collection (if initialized).
+        :param cleanup: If True, cleans up the vector database collection (if initialized) and its cached responses.
         """
         if cleanup and self.__vector_db is not None:
             LOG.info('Pipeline tool :: Cleaning up vector database collection.')
             await self.__vector_db.destroy()
+            if self.__response_cache:
+                await self.__response_cache.evict(self.__cache_namespace)
+        elif self.__vector_db is not None:
+            await self.__vector_db.close()
 
         LOG.info('Pipeline tool :: Destroying AI client connection.')
         await self.__ai_client.destroy()
@@ -1,6 +1,9 @@
 from typing import Optional
 
+from kiss_ai_stack.core.ai_clients.ai_client_abc import AIClientAbc
 from kiss_ai_stack.core.ai_clients.ai_client_factory import AIClientFactory
+from kiss_ai_stack.core.caches.response_cache_factory import ResponseCacheFactory
+from kiss_ai_stack.core.dbs.db_abc import VectorDBAbc
 from kiss_ai_stack.core.dbs.db_factory import VectorDBFactory
 from kiss_ai_stack.core.models.config.vdb_props import VectorDBProperties
 from kiss_ai_stack.core.models.config.tool_props import ToolProperties
@@ -40,16 +43,27 @@ class ToolBuilder:
 
         :raises Exception: If there is an error during tool creation, such as failure in client or vector DB initialization.
         """
+        ai_client = None
+        vector_db = None
         try:
             LOG.info(f'Tool Builder :: Building {tool_properties.name}, kind: {tool_properties.kind}')
-            ai_client = AIClientFactory.get_ai_client(tool_properties.ai_client, tool_properties.kind)
+            ai_client = AIClientFactory.get_ai_client(
+                tool_properties.ai_client,
+                tool_properties.kind,
+                embedding_model=tool_properties.embeddings
+            )
             ai_client.initialize()
+            response_cache = None
+            if tool_properties.cache:
+                response_cache = ResponseCacheFactory.get_response_cache(tool_properties.cache)
 
             if tool_properties.kind == ToolKind.RAG:
                 collection_name = f'{stack_id}_{tool_properties.name}_collection'
                 LOG.info(
                     f'Tool Builder :: Initializing Vector DB for the tool {tool_properties.name}, collection: {collection_name}')
 
+                if tool_properties.index:
+                    vector_db_properties = vector_db_properties.model_copy(update={'index': tool_properties.index})
                 vector_db = VectorDBFactory.get_vector_db(
                     collection_name=collection_name,
                     properties=vector_db_properties
@@ -58,21 +72,46 @@ class ToolBuilder:
                     embedding_api_key=tool_properties.ai_client.api_key,
                     embedding_model=tool_properties.embeddings,
                     ai_vendor=tool_properties.ai_client.provider,
-                    tenant=None if temporary_stack else stack_id
+                    tenant=None if temporary_stack else stack_id,
+                    ai_client_properties=tool_properties.ai_client
                 )
 
                 LOG.info(f'Tool Builder :: Tool {tool_properties.name} built successfully with RAG capabilities.')
                 return Tool(
                     properties=tool_properties,
                     ai_client=ai_client,
-                    vector_db=vector_db
+                    vector_db=vector_db,
+                    response_cache=response_cache,
+                    cache_namespace=collection_name
                 )
             else:
                 LOG.info(f'Tool Builder :: Tool {tool_properties.name} built successfully without RAG capabilities.')
                 return Tool(
                     properties=tool_properties,
-                    ai_client=ai_client
+                    ai_client=ai_client,
+                    response_cache=response_cache
                 )
         except Exception as e:
             LOG.error(f'Tool Builder :: Error occurred while building the tool {tool_properties.name}: {str(e)}')
+            await ToolBuilder.__release(tool_properties.name, ai_client, vector_db, temporary_stack)
             raise e
+
+    @staticmethod
+    async def __release(tool_name: str, ai_client: Optional[AIClientAbc], vector_db: Optional[VectorDBAbc],
+                        temporary_stack: bool):
+        """
+        Release what a failed build acquired, deleting the collection of a temporary stack only.
+        """
+        try:
+            if vector_db is not None:
+                if temporary_stack:
+                    await vector_db.destroy()
+                else:
+                    await vector_db.close()
+        except Exception as e:
+            LOG.warning(f'Tool Builder :: Error occurred while releasing the vector DB of {tool_name}: {str(e)}')
+        try:
+            if ai_client is not None:
+                await ai_client.destroy()
+        except Exception as e:
+            LOG.warning(f'Tool Builder :: Error occurred while releasing the AI client of {tool_name}: {str(e)}')
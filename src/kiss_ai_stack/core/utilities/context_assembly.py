@@ -0,0 +1,76 @@
+from typing import Any, Dict, List, Optional
+
+import tiktoken
+
+from kiss_ai_stack.core.utilities.document_utils import get_encoding
+
+
+def assemble_context(documents: List[str], metadata_list: Optional[List[Optional[Dict[str, Any]]]] = None,
+                     token_budget: Optional[int] = None,
+                     encoding: Optional[tiktoken.Encoding] = None) -> List[str]:
+    """
+    Assemble retrieved chunks into the context of a prompt, without repeating overlapping text.
+
+    Chunks of the same file whose `start_token`/`end_token` spans overlap or touch are merged into one passage,
+    in file order, dropping the overlapping tokens. Passages are ordered by the rank of their best retrieved
+    chunk, and trimmed to the token budget, the last passage that does not fit being cut short. Chunks without
+    span metadata, or without the file they come from, are kept as they are.
+
+    :param documents: The retrieved chunks, most relevant first.
+    :param metadata_list: The metadata of each chunk, as recorded by `file_to_docs`.
+    :param token_budget: The maximum number of context tokens, unlimited if None.
+    :param encoding: The tiktoken encoding the chunks were split with. Defaults to the cached "cl100k_base".
+    :returns: The context passages, most relevant first.
+    """
+    encoding = encoding or get_encoding()
+    metadata_list = metadata_list or [None] * len(documents)
+
+    files: Dict[str, List[tuple]] = {}
+    passages: List[List] = []
+    for rank, (document, metadata) in enumerate(zip(documents, metadata_list)):
+        metadata = metadata or {}
+        file = metadata.get('file_path') or metadata.get('file_name')
+        if file and 'start_token' in metadata and 'end_token' in metadata:
+            files.setdefault(file, []).append(
+                (int(metadata['start_token']), int(metadata['end_token']), rank, document)
+            )
+        else:
+            passages.append([rank, document])
+
+    for chunks in files.values():
+        chunks.sort()
+        passage = None
+        passage_end = 0
+        for start, end, rank, document in chunks:
+            if passage is not None and start <= passage_end:
+                if end <= passage_end:
+                    passage[0] = min(passage[0], rank)
+                    continue
+                tokens = encoding.encode(document)
+                overlap = passage_end - start
+                if passage[1].endswith(encoding.decode(tokens[:overlap])):
+                    passage[0] = min(passage[0], rank)
+                    passage[1] += encoding.decode(tokens[overlap:])
+                    passage_end = end
+                    continue
+            passage = [rank, document]
+            passage_end = end
+            passages.append(passage)
+
+    passages.sort(key=lambda ranked_passage: ranked_passage[0])
+    context = [document for _, document in passages]
+    if token_budget is None:
+        return context
+
+    budgeted = []
+    remaining = token_budget
+    for document in context:
+        tokens = encoding.encode(document)
+        if len(tokens) <= remaining:
+            budgeted.append(document)
+            remaining -= len(tokens)
+            continue
+        if remaining > 0:
+            budgeted.append(encoding.decode(tokens[:remaining]))
+        break
+    return budgeted
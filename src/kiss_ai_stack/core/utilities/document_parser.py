@@ -0,0 +1,119 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from kiss_ai_stack.core.models.config.ingestion_props import IngestionProperties
+from kiss_ai_stack.core.utilities.document_utils import parse_file_to_chunks
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+def _limit_worker_memory(max_memory_mb: Optional[int]):
+    """
+    Cap the address space of a parser worker process, where supported by the platform.
+
+    :param max_memory_mb: Maximum memory of the worker in megabytes, unlimited if None.
+    """
+    if not max_memory_mb:
+        return
+    try:
+        import resource
+
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+class DocumentParser:
+    """
+    Multi-core document parsing engine backed by a process pool.
+
+    Files are parsed and chunked in worker processes, which return compact chunk/span payloads, so CPU heavy
+    parsing scales with core count instead of being bound by the GIL. Workers are recycled after a number of
+    files and their memory can be capped; a worker dying (e.g. on the memory cap) only fails that file.
+    """
+
+    __shared: Dict[Tuple, 'DocumentParser'] = {}
+    __shared_lock = threading.Lock()
+
+    def __init__(self, max_workers: Optional[int] = None, max_tasks_per_worker: Optional[int] = 32,
+                 max_worker_memory_mb: Optional[int] = None):
+        """
+        Initialize the parser's process pool.
+
+        :param max_workers: Number of worker processes. Defaults to the CPU count.
+        :param max_tasks_per_worker: Number of files a worker parses before it is recycled. Defaults to 32.
+        :param max_worker_memory_mb: Optional memory cap of each worker in megabytes. Defaults to None.
+        """
+        self.__max_workers = max_workers or os.cpu_count()
+        self.__max_tasks_per_worker = max_tasks_per_worker
+        self.__max_worker_memory_mb = max_worker_memory_mb
+        self.__lock = threading.Lock()
+        self.__executor = self.__create_executor()
+        LOG.info(f'DocumentParser :: initialized with {self.__max_workers} worker processes')
+
+    @classmethod
+    def from_properties(cls, properties: IngestionProperties) -> Optional['DocumentParser']:
+        """
+        Get the process-wide parser for the configured pool settings.
+
+        :param properties: Ingestion configurations object loaded from Yaml file.
+        :returns: The shared parser, or None if parsing in processes is disabled.
+        """
+        if properties.parse_processes == 0:
+            return None
+        key = (properties.parse_processes, properties.parse_process_max_tasks, properties.parse_process_max_memory_mb)
+        with cls.__shared_lock:
+            if key not in cls.__shared:
+                cls.__shared[key] = cls(
+                    max_workers=properties.parse_processes,
+                    max_tasks_per_worker=properties.parse_process_max_tasks,
+                    max_worker_memory_mb=properties.parse_process_max_memory_mb
+                )
+            return cls.__shared[key]
+
+    def __create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.__max_workers,
+            max_tasks_per_child=self.__max_tasks_per_worker,
+            initializer=_limit_worker_memory,
+            initargs=(self.__max_worker_memory_mb,)
+        )
+
+    def __replace_broken_executor(self, broken_executor: ProcessPoolExecutor):
+        with self.__lock:
+            if self.__executor is broken_executor:
+                LOG.warning('DocumentParser :: Worker pool broken, replacing it')
+                self.__executor = self.__create_executor()
+        broken_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def parse(self, file_path: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> Tuple[
+        List[str], List[Tuple[int, int, int]]]:
+        """
+        Parse and chunk a file in a worker process.
+
+        :param file_path: The absolute path to the input file to be processed.
+        :param chunk_size: The maximum size of each chunk in tokens. Defaults to 1000.
+        :param chunk_overlap: The overlap size between consecutive chunks in tokens. Defaults to 200.
+
+        :returns: A tuple of the text chunks and their (start_token, end_token, total_tokens) spans.
+        :raises ValueError: If the file cannot be parsed, including when its worker process dies.
+        """
+        executor = self.__executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, parse_file_to_chunks, file_path, chunk_size, chunk_overlap
+            )
+        except BrokenProcessPool as e:
+            self.__replace_broken_executor(executor)
+            raise ValueError(f'DocumentParser :: Worker died while parsing \'{file_path}\': {str(e)}')
+
+    def shutdown(self):
+        """
+        Shut down the worker processes.
+        """
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+        LOG.info('DocumentParser :: Worker processes shut down')
@@ -1,35 +1,28 @@
 import asyncio
+import contextlib
+import functools
 import os
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, AsyncIterator, TYPE_CHECKING
 
 import pandas as pd
 import tiktoken
 from unstructured.partition.auto import partition
 from unstructured.staging.base import convert_to_text, elements_to_text
 
+if TYPE_CHECKING:
+    from kiss_ai_stack.core.utilities.document_parser import DocumentParser
 
-async def file_to_docs(file_path: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> Tuple[
-    List[str], List[Dict[str, str]]]:
+
+def validate_file(file_path: str, chunk_size: int, chunk_overlap: int):
     """
-    Convert a file into token-based chunks and associated metadata asynchronously.
+    Validate the input file and chunk parameters before parsing.
 
     :param file_path: The absolute path to the input file to be processed.
-    :param chunk_size: The maximum size of each chunk in tokens. Defaults to 1000.
-    :param chunk_overlap: The overlap size between consecutive chunks in tokens. Defaults to 200.
-
-    :returns:
-        A tuple containing:
-        - A list of document text chunks split based on the specified chunk size and overlap.
-        - A list of metadata dictionaries corresponding to each text chunk.
+    :param chunk_size: The maximum size of each chunk in tokens.
+    :param chunk_overlap: The overlap size between consecutive chunks in tokens.
 
     :raises FileNotFoundError: If the file does not exist at the specified path.
-    :raises ValueError: If chunk parameters are invalid or if the file cannot be parsed.
-
-    :example:
-        file_path = "example.xlsx"
-        chunks, metadata = await async_file_to_docs(file_path, chunk_size=500, chunk_overlap=100)
-        print(chunks[0])  # Displays the first chunk
-        print(metadata[0])  # Displays metadata for the first chunk
+    :raises ValueError: If chunk parameters are invalid.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"DocUtils :: File not found: {file_path}")
@@ -40,40 +33,272 @@ async def file_to_docs(file_path: str, chunk_size: int = 1000, chunk_overlap: in
             "Chunk size must be positive, and overlap must be non-negative and less than chunk size."
         )
 
+
+@functools.lru_cache(maxsize=None)
+def get_encoding(encoding_name: str = "cl100k_base") -> tiktoken.Encoding:
+    """
+    Get a tiktoken encoding, loaded once per process and reused for every file.
+
+    :param encoding_name: The name of the tiktoken encoding. Defaults to "cl100k_base".
+    :returns: The cached encoding.
+    """
+    return tiktoken.get_encoding(encoding_name)
+
+
+def iter_file_text(file_path: str) -> Iterator[str]:
+    """
+    Parse a file and yield its text piece by piece, one spreadsheet sheet or document element at a time.
+
+    :param file_path: The absolute path to the input file to be processed.
+    :returns: An iterator of text pieces, each but the first prefixed with its separator.
+    :raises ValueError: If the file cannot be parsed.
+    """
     try:
         if file_path.endswith(('.xlsx', '.xls', '.xlsm', '.xlsb')):
             dfs = pd.read_excel(file_path, sheet_name=None)
-            text_content = "\n\n".join(
+            separator = "\n\n"
+            pieces = (
                 f"Sheet: {sheet_name}\n{df.to_string(index=False)}"
                 for sheet_name, df in dfs.items()
             )
         else:
-            elements = await asyncio.to_thread(partition, filename=file_path)
-            text_content = "\n".join(
+            elements = partition(filename=file_path)
+            separator = "\n"
+            pieces = (
                 convert_to_text(element) if isinstance(element, list)
                 else elements_to_text([element])
                 for element in elements
             )
+        for index, piece in enumerate(pieces):
+            yield piece if index == 0 else f"{separator}{piece}"
     except Exception as e:
         raise ValueError(f"DocUtils :: Failed to parse file '{file_path}'. Error: {str(e)}")
 
-    encoding = tiktoken.get_encoding("cl100k_base")
-    tokens = encoding.encode(text_content)
-    chunks, metadata_list = [], []
+
+def split_text(text: str, max_chars: int) -> Iterator[str]:
+    """
+    Split a text into pieces of at most `max_chars` characters, preferably right before a run of whitespace,
+    where tokenizers start a new token anyway.
+
+    :param text: The text to split.
+    :param max_chars: The maximum number of characters of a piece.
+    :returns: An iterator of pieces which concatenate back into the text.
+    """
+    position = 0
+    while len(text) - position > max_chars:
+        end = position + max_chars
+        cut = max(text.rfind(' ', position, end), text.rfind('\n', position, end))
+        while cut > position and text[cut - 1].isspace():
+            cut -= 1
+        end = cut if cut > position else end
+        yield text[position:end]
+        position = end
+    yield text[position:]
+
+
+def iter_token_chunks(texts: Iterable[str], chunk_size: int = 1000, chunk_overlap: int = 200,
+                      encoding: Optional[tiktoken.Encoding] = None) -> Iterator[Tuple[str, int, int, int]]:
+    """
+    Split a stream of text into overlapping token-based chunks, emitting each chunk as soon as its window is full.
+
+    Only the current window of tokens is buffered, so peak memory is bounded by the chunk window rather than by
+    the document size: oversized text pieces are split before being encoded, and the window moves along the
+    buffer by offset, the consumed tokens being dropped once they make up half of it. Tokens are decoded once
+    each: the overlap of a window is carried over, already decoded, into the next one.
+
+    :param texts: Text pieces to chunk, in document order.
+    :param chunk_size: The maximum size of each chunk in tokens. Defaults to 1000.
+    :param chunk_overlap: The overlap size between consecutive chunks in tokens. Defaults to 200.
+    :param encoding: The tiktoken encoding to use. Defaults to the cached "cl100k_base" encoding.
+
+    :returns: An iterator of (chunk_text, start_token, end_token, total_tokens) tuples, skipping blank chunks.
+    """
+    encoding = encoding or get_encoding()
     step_size = chunk_size - chunk_overlap
+    max_piece_chars = chunk_size * 16
+    buffer: List[int] = []
+    offset = 0
+    start = 0
+    carry, carried = b'', 0
+
+    def window_bytes(size: int) -> bytes:
+        nonlocal carry, carried
+        if carried > step_size:
+            carry, carried = b'', 0
+            return encoding.decode_bytes(buffer[offset:offset + size])
+        middle = (
+            encoding.decode_bytes(buffer[offset + carried:offset + min(step_size, size)]) if size > carried else b''
+        )
+        tail = encoding.decode_bytes(buffer[offset + step_size:offset + size]) if size > step_size else b''
+        window = carry + middle + tail
+        carry, carried = tail, max(0, size - step_size)
+        return window
+
+    def emit(size: int) -> Optional[Tuple[str, int, int, int]]:
+        nonlocal offset, start
+        chunk_text = window_bytes(size).decode('utf-8', errors='replace')
+        chunk = (chunk_text, start, start + size, size) if chunk_text.strip() else None
+        offset += step_size
+        start += step_size
+        if offset * 2 >= len(buffer):
+            del buffer[:offset]
+            offset = 0
+        return chunk
+
+    for text in texts:
+        for piece in split_text(text, max_piece_chars):
+            buffer.extend(encoding.encode(piece))
+            while len(buffer) - offset >= chunk_size:
+                if chunk := emit(chunk_size):
+                    yield chunk
+
+    while len(buffer) > offset:
+        if chunk := emit(len(buffer) - offset):
+            yield chunk
+
+
+def parse_file_to_chunks(file_path: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> Tuple[
+    List[str], List[Tuple[int, int, int]]]:
+    """
+    Parse a file and split it into token-based chunks, synchronously.
+
+    This is the CPU heavy part of `file_to_docs`, kept at module level so it can run in a worker process.
+    Chunk metadata is returned as compact (start_token, end_token, total_tokens) spans.
+
+    :param file_path: The absolute path to the input file to be processed.
+    :param chunk_size: The maximum size of each chunk in tokens. Defaults to 1000.
+    :param chunk_overlap: The overlap size between consecutive chunks in tokens. Defaults to 200.
+
+    :returns: A tuple of the text chunks and their token spans.
+    :raises FileNotFoundError: If the file does not exist at the specified path.
+    :raises ValueError: If chunk parameters are invalid or if the file cannot be parsed.
+    """
+    validate_file(file_path, chunk_size, chunk_overlap)
+
+    chunks, spans = [], []
+    for chunk_text, start, end, total_tokens in iter_token_chunks(iter_file_text(file_path), chunk_size, chunk_overlap):
+        chunks.append(chunk_text)
+        spans.append((start, end, total_tokens))
 
-    for start in range(0, len(tokens), step_size):
-        end = min(start + chunk_size, len(tokens))
-        chunk_tokens = tokens[start:end]
-        chunk_text = encoding.decode(chunk_tokens)
-        if chunk_text.strip():
-            chunks.append(chunk_text)
-            metadata_list.append({
-                "file_name": os.path.basename(file_path),
-                "file_path": file_path,
-                "start_token": start,
-                "end_token": end,
-                "total_tokens": len(chunk_tokens),
-            })
-
-    return chunks, metadata_list
+    return chunks, spans
+
+
+def iter_file_docs(file_path: str, chunk_size: int = 1000, chunk_overlap: int = 200, batch_size: int = 64) -> Iterator[
+    Tuple[List[str], List[Dict[str, str]]]]:
+    """
+    Parse a file and yield its chunks and metadata in batches, as chunks are produced.
+
+    :param file_path: The absolute path to the input file to be processed.
+    :param chunk_size: The maximum size of each chunk in tokens. Defaults to 1000.
+    :param chunk_overlap: The overlap size between consecutive chunks in tokens. Defaults to 200.
+    :param batch_size: The maximum number of chunks per batch. Defaults to 64.
+
+    :returns: An iterator of (chunks, metadata_list) batches.
+    :raises FileNotFoundError: If the file does not exist at the specified path.
+    :raises ValueError: If chunk parameters are invalid or if the file cannot be parsed.
+    """
+    validate_file(file_path, chunk_size, chunk_overlap)
+
+    chunks, spans = [], []
+    for chunk_text, start, end, total_tokens in iter_token_chunks(iter_file_text(file_path), chunk_size, chunk_overlap):
+        chunks.append(chunk_text)
+        spans.append((start, end, total_tokens))
+        if len(chunks) >= batch_size:
+            yield chunks, spans_to_metadata(file_path, spans)
+            chunks, spans = [], []
+    if chunks:
+        yield chunks, spans_to_metadata(file_path, spans)
+
+
+def spans_to_metadata(file_path: str, spans: List[Tuple[int, int, int]]) -> List[Dict[str, str]]:
+    """
+    Expand compact chunk spans into per-chunk metadata dictionaries.
+
+    :param file_path: The absolute path to the source file.
+    :param spans: (start_token, end_token, total_tokens) spans of each chunk.
+    :returns: A list of metadata dictionaries corresponding to each chunk.
+    """
+    file_name = os.path.basename(file_path)
+    return [
+        {
+            "file_name": file_name,
+            "file_path": file_path,
+            "start_token": start,
+            "end_token": end,
+            "total_tokens": total_tokens,
+        }
+        for start, end, total_tokens in spans
+    ]
+
+
+async def file_to_docs(file_path: str, chunk_size: int = 1000, chunk_overlap: int = 200,
+                       parser: Optional['DocumentParser'] = None) -> Tuple[List[str], List[Dict[str, str]]]:
+    """
+    Convert a file into token-based chunks and associated metadata asynchronously.
+
+    Parsing never runs on the event loop; it runs in the given process pool parser, or in a worker thread otherwise.
+
+    :param file_path: The absolute path to the input file to be processed.
+    :param chunk_size: The maximum size of each chunk in tokens. Defaults to 1000.
+    :param chunk_overlap: The overlap size between consecutive chunks in tokens. Defaults to 200.
+    :param parser: Optional process pool parser to parse the file on. Defaults to None.
+
+    :returns:
+        A tuple containing:
+        - A list of document text chunks split based on the specified chunk size and overlap.
+        - A list of metadata dictionaries corresponding to each text chunk.
+
+    :raises FileNotFoundError: If the file does not exist at the specified path.
+    :raises ValueError: If chunk parameters are invalid or if the file cannot be parsed.
+
+    :example:
+        file_path = "example.xlsx"
+        chunks, metadata = await async_file_to_docs(file_path, chunk_size=500, chunk_overlap=100)
+        print(chunks[0])  # Displays the first chunk
+        print(metadata[0])  # Displays metadata for the first chunk
+    """
+    validate_file(file_path, chunk_size, chunk_overlap)
+
+    if parser:
+        chunks, spans = await parser.parse(file_path, chunk_size, chunk_overlap)
+    else:
+        chunks, spans = await asyncio.to_thread(parse_file_to_chunks, file_path, chunk_size, chunk_overlap)
+
+    return chunks, spans_to_metadata(file_path, spans)
+
+
+async def file_to_doc_batches(file_path: str, chunk_size: int = 1000, chunk_overlap: int = 200,
+                              batch_size: int = 64) -> AsyncIterator[Tuple[List[str], List[Dict[str, str]]]]:
+    """
+    Convert a file into batches of token-based chunks and metadata asynchronously, parsing in a worker thread.
+
+    Batches are produced on demand, so a consumer storing each batch (e.g. `Tool.store_docs`) keeps only one
+    batch of chunks in memory at a time.
+
+    :param file_path: The absolute path to the input file to be processed.
+    :param chunk_size: The maximum size of each chunk in tokens. Defaults to 1000.
+    :param chunk_overlap: The overlap size between consecutive chunks in tokens. Defaults to 200.
+    :param batch_size: The maximum number of chunks per batch. Defaults to 64.
+
+    :returns: An async iterator of (chunks, metadata_list) batches.
+    :raises FileNotFoundError: If the file does not exist at the specified path.
+    :raises ValueError: If chunk parameters are invalid or if the file cannot be parsed.
+    """
+    validate_file(file_path, chunk_size, chunk_overlap)
+
+    batches = iter_file_docs(file_path, chunk_size, chunk_overlap, batch_size)
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            pending = asyncio.ensure_future(asyncio.to_thread(next, batches, None))
+            batch = await asyncio.shield(pending)
+            pending = None
+            if batch is None:
+                return
+            yield batch
+    finally:
+        if pending is not None:
+            # The generator cannot be closed while the worker thread is still running it.
+            with contextlib.suppress(Exception):
+                await pending
+        batches.close()
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from kiss_ai_stack.core.utilities.logger import LOG
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight execution.
+
+    The first call for a key runs the work as its own task and later calls for the same key await that task
+    until it completes, all of them receiving the same result or exception. The work is shielded from the
+    cancellation of any single caller, so one client disconnecting does not fail the others.
+    """
+
+    def __init__(self):
+        self.__in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.__calls = 0
+        self.__executions = 0
+        self.__coalesced = 0
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run the work, or join the in-flight execution of the same key.
+
+        :param key: The coalescing key.
+        :param work: Factory of the awaitable to run, only called if no execution of the key is in flight.
+        :returns: The result of the shared execution.
+        """
+        self.__calls += 1
+        task = self.__in_flight.get(key)
+        if task is None:
+            self.__executions += 1
+            task = asyncio.ensure_future(work())
+            self.__in_flight[key] = task
+            task.add_done_callback(lambda done: self.__forget(key, done))
+        else:
+            self.__coalesced += 1
+            LOG.debug('SingleFlight :: Joined an in-flight execution')
+        return await asyncio.shield(task)
+
+    def __forget(self, key: Hashable, task: asyncio.Task):
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of calls, of executions actually run, and of calls coalesced into another call's execution.
+        """
+        return {
+            'calls': self.__calls,
+            'executions': self.__executions,
+            'coalesced': self.__coalesced,
+            'in_flight': len(self.__in_flight)
+        }